@@ -0,0 +1,277 @@
+"""
+Caché de Lecturas de Jugadores y Mercado (dos niveles)
+- Nivel 1: LRU en memoria del proceso (sin red ni serialización)
+- Nivel 2: backend compartido entre procesos/workers (CACHE_BACKEND):
+    "memory": sustituto en memoria para tests y desarrollo (un solo proceso)
+    "redis":  Redis compartido (dependencia opcional: pip install redis)
+
+Invalidación por "época" de precios: todas las claves llevan delante la época
+actual (players:epoch en el backend compartido). Los jobs que cambian precios
+u OVR publican "jugadores cambiados" tras su commit (publish_players_changed),
+lo que incrementa la época: las entradas anteriores dejan de leerse y caducan
+solas. Cada proceso de la API consulta la época como mucho cada
+CACHE_EPOCH_CHECK_SECONDS, así que el mercado solo llega a MySQL una vez por
+época (y por clave).
+
+⚠️ Con CACHE_BACKEND="memory" los jobs (otro proceso) no pueden avisar a la
+API: los cambios se ven al caducar las entradas (CACHE_TTL_SECONDS)
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+EPOCH_KEY = "players:epoch"
+KEY_PREFIX = "ufl:cache:"
+
+
+class LocalLRU:
+    """LRU con TTL del proceso (thread-safe)"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InMemoryBackend:
+    """
+    Sustituto en memoria del backend compartido (tests y desarrollo)
+    Misma interfaz que RedisBackend: valores JSON (str) con TTL y contadores
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[Optional[float], str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._values.get(key, (None, "0"))[1]) + 1
+            self._values[key] = (None, str(value))
+            return value
+
+
+class RedisBackend:
+    """Backend compartido en Redis (cliente síncrono: operaciones de <1 ms)"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requiere el paquete redis (pip install redis)")
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(KEY_PREFIX + key)
+
+    def set(self, key: str, value: str, ttl: float):
+        self._client.set(KEY_PREFIX + key, value, ex=max(1, int(ttl)))
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(KEY_PREFIX + key)
+
+
+def query_signature(name: str, **params) -> str:
+    """Clave de una consulta: nombre + parámetros ordenados (hash corto)"""
+    raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    return f"{name}:{hashlib.sha1(raw.encode()).hexdigest()[:16]}"
+
+
+class ReadCache:
+    """
+    Caché de dos niveles con invalidación por época
+
+    Uso (API):
+        page = await read_cache.get_or_load(
+            query_signature("players:list", sort="price", ...),
+            lambda: service.list_players(...)
+        )
+
+    Uso (jobs, tras el commit):
+        publish_players_changed(player_ids)
+
+    Los valores deben ser serializables a JSON y tratarse como de solo
+    lectura (el nivel local devuelve el mismo objeto a todas las requests)
+    """
+
+    def __init__(self, backend, enabled: bool = True, max_entries: int = 2048,
+                 ttl: float = 300, epoch_check_seconds: float = 5):
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl = ttl
+        self.epoch_check_seconds = epoch_check_seconds
+        self.local = LocalLRU(max_entries, ttl)
+        self._epoch = 0
+        self._epoch_checked_at = float("-inf")
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0}
+
+    def epoch(self) -> int:
+        """Época vigente (consulta el backend compartido como mucho cada epoch_check_seconds)"""
+        now = time.monotonic()
+        if now - self._epoch_checked_at >= self.epoch_check_seconds:
+            self._epoch_checked_at = now
+            self._set_epoch(int(self.backend.get(EPOCH_KEY) or 0))
+        return self._epoch
+
+    def _set_epoch(self, epoch: int):
+        if epoch != self._epoch:
+            # Las entradas locales de la época anterior ya no se leerán
+            self.local.clear()
+            self._epoch = epoch
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Valor cacheado de `key` o el resultado de `loader` (que se guarda)
+
+        Las requests simultáneas que fallan en la misma clave esperan a una
+        única carga. Los resultados None (p. ej. 404) no se cachean
+        """
+        if not self.enabled:
+            return await loader()
+
+        full_key = f"{self.epoch()}:{key}"
+
+        value = self.local.get(full_key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        raw = self.backend.get(full_key)
+        if raw is not None:
+            self.stats["shared_hits"] += 1
+            value = json.loads(raw)
+            self.local.set(full_key, value)
+            return value
+
+        pending = self._loading.get(full_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[full_key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita el aviso "exception was never retrieved" si nadie esperaba
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(full_key, None)
+
+        future.set_result(value)
+        if value is not None:
+            self.local.set(full_key, value)
+            self.backend.set(full_key, json.dumps(value), self.ttl)
+        return value
+
+    def invalidate_players(self) -> int:
+        """Nueva época: invalida todas las lecturas de jugadores y mercado"""
+        epoch = self.backend.incr(EPOCH_KEY)
+        self._set_epoch(epoch)
+        self._epoch_checked_at = time.monotonic()
+        self.stats["invalidations"] += 1
+        return epoch
+
+    def status(self) -> Dict:
+        """Estado para /health"""
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "epoch": self._epoch,
+            "local_entries": len(self.local),
+            **self.stats
+        }
+
+
+def _create_backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND == "memory":
+        return InMemoryBackend()
+    raise ValueError('CACHE_BACKEND debe ser "memory" o "redis"')
+
+
+# Instancia global (API y jobs del mismo proceso la comparten)
+read_cache = ReadCache(
+    _create_backend(),
+    enabled=settings.CACHE_ENABLED,
+    max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    epoch_check_seconds=settings.CACHE_EPOCH_CHECK_SECONDS
+)
+
+
+def publish_players_changed(player_ids: Optional[Iterable[int]] = None) -> Optional[int]:
+    """
+    Evento "jugadores cambiados": llamar SIEMPRE después del commit que cambia
+    precios, OVR o forma (si se publica antes, una request podría volver a
+    cachear los datos viejos en la nueva época)
+
+    Args:
+        player_ids: Jugadores afectados (None = todos). Si es una lista vacía
+                    no se invalida nada
+
+    Returns:
+        int | None: Nueva época (None si no había cambios o la caché está desactivada)
+    """
+    if player_ids is not None and not any(True for _ in player_ids):
+        return None
+    if not read_cache.enabled:
+        return None
+    try:
+        return read_cache.invalidate_players()
+    except Exception as e:
+        # El job ya ha hecho commit: un fallo del backend no debe tumbarlo
+        print(f"⚠️  No se pudo invalidar la caché de jugadores: {e}")
+        return None
@@ -2,19 +2,37 @@
 Configuración de la base de datos MySQL con SQLAlchemy
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.pool import pool_options, configure_pool_events
+from app.core.query_stats import query_instrumentation
 
 # Motor de base de datos
 # echo=True muestra las queries SQL en consola (útil para desarrollo)
+# Pool configurable desde Settings (DB_POOL_*), con métricas en /health
 engine = create_engine(
     settings.database_url,
     echo=settings.DEBUG,
-    pool_pre_ping=True,  # Verifica la conexión antes de usarla
-    pool_recycle=3600,   # Recicla conexiones cada hora
+    **pool_options(settings.database_url)
 )
+configure_pool_events(engine)
+
+# Motor async para la API (aiomysql): las consultas no bloquean el event loop
+# (no abre conexiones hasta el primer uso: los scripts síncronos no lo tocan)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=settings.DEBUG,
+    **pool_options(settings.async_database_url, is_async=True)
+)
+configure_pool_events(async_engine.sync_engine)
+
+# Agregados de consultas por job/request (opcional, ver query_stats)
+if settings.SQL_INSTRUMENTATION:
+    query_instrumentation.install(engine)
+    query_instrumentation.install(async_engine.sync_engine)
 
 # Sesión de base de datos
 SessionLocal = sessionmaker(
@@ -23,6 +41,14 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Sesión async (expire_on_commit=False: los objetos siguen siendo legibles
+# tras el commit sin lanzar otra consulta, que en async sería un error)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 # Base para los modelos
 Base = declarative_base()
 
@@ -42,6 +68,23 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency async para FastAPI - Una AsyncSession por request
+    Uso:
+        @router.get("/{player_id}")
+        async def get_player(player_id: int, db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Cierra las conexiones del pool async (al parar la API)"""
+    await async_engine.dispose()
+
+
 def init_db():
     """
     Inicializa la base de datos - Crea todas las tablas
@@ -57,7 +100,7 @@ def test_connection():
     """
     try:
         db = SessionLocal()
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db.close()
         print("✅ Conexión a MySQL exitosa")
         return True
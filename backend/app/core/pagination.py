@@ -0,0 +1,62 @@
+"""
+Paginación por Keyset (cursor)
+En lugar de OFFSET (que recorre y descarta todas las filas anteriores), cada
+página continúa desde la última fila de la anterior:
+
+    WHERE (columna, id) < (último_valor, último_id)
+    ORDER BY columna DESC, id DESC
+    LIMIT n
+
+Con un índice sobre la columna (InnoDB añade la PK a cada índice secundario,
+así que el índice de current_price ya es (current_price, id)) cada página
+cuesta lo mismo, sea la primera o la milésima.
+
+El cursor que ve el cliente es opaco: base64 de [ordenación, valor, id]
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """Cursor mal formado o de otra ordenación"""
+    pass
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    raw = json.dumps([sort, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Valor e id de la última fila de la página anterior
+
+    Raises:
+        InvalidCursorError: Si el cursor no se puede leer o es de otra ordenación
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError("Cursor no válido")
+
+    if cursor_sort != sort or not isinstance(row_id, int):
+        raise InvalidCursorError("El cursor no corresponde a esta ordenación")
+    return value, row_id
+
+
+def keyset_condition(column, id_column, value, row_id: int, descending: bool):
+    """
+    Filas posteriores a (value, row_id) en el orden (column, id_column)
+
+    Se expande a OR/AND en lugar de comparar tuplas: MySQL no siempre usa el
+    índice para comparaciones de tuplas
+    """
+    if descending:
+        return or_(column < value, and_(column == value, id_column < row_id))
+    return or_(column > value, and_(column == value, id_column > row_id))
@@ -0,0 +1,205 @@
+"""
+Pool de Conexiones Configurable y Métricas
+- Tamaño, overflow, timeout, recycle y estrategia de pre-ping desde Settings
+- Métricas por pool: espera al pedir conexión, uso del overflow, timeouts y
+  rotación de conexiones (creadas/cerradas/invalidadas), expuestas en /health
+
+Estrategias de pre-ping (DB_POOL_PRE_PING):
+- "always": SELECT 1 en cada checkout (pool_pre_ping de SQLAlchemy)
+- "idle": solo si la conexión lleva más de DB_POOL_PING_IDLE_SECONDS sin usarse
+- "never": sin ping; las conexiones caducadas las cubre pool_recycle
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+# Esperas que se consideran "haciendo cola" por una conexión
+SLOW_CHECKOUT_MS = 10.0
+
+# Muestras de espera que se guardan para el p95
+WAIT_SAMPLES = 1000
+
+
+class PoolMetrics:
+    """Contadores de un pool (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.overflow_peak = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.connections_invalidated = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def record_checkout(self, wait_ms: float, overflow: int):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._waits.append(wait_ms)
+            if wait_ms >= SLOW_CHECKOUT_MS:
+                self.slow_checkouts += 1
+            self.overflow_peak = max(self.overflow_peak, overflow)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def wait_p95_ms(self) -> float:
+        with self._lock:
+            ordered = sorted(self._waits)
+        return ordered[int(len(ordered) * 0.95)] if ordered else 0.0
+
+
+class _MetricsMixin:
+    """Mide la espera de _do_get (cola + creación de conexión si hace falta)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.increment("timeouts")
+            raise
+        self.metrics.record_checkout((time.perf_counter() - start) * 1000, max(0, self.overflow()))
+        return connection
+
+
+class MeasuredQueuePool(_MetricsMixin, QueuePool):
+    pass
+
+
+class MeasuredAsyncQueuePool(_MetricsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, is_async: bool = False) -> Dict:
+    """
+    Argumentos de create_engine/create_async_engine para el pool
+
+    SQLite en memoria usa su pool propio (una conexión): no admite tamaño
+    ni overflow
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+
+    if settings.DB_POOL_PRE_PING not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_POOL_PRE_PING debe ser uno de {PRE_PING_STRATEGIES}")
+
+    return {
+        "poolclass": MeasuredAsyncQueuePool if is_async else MeasuredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def configure_pool_events(engine: Engine):
+    """
+    Rotación de conexiones y pre-ping "idle" (engine síncrono o
+    async_engine.sync_engine)
+    """
+    # engine.pool se consulta en cada evento: dispose() crea un pool nuevo
+    # (con sus propias métricas) y conserva estos listeners
+    if not hasattr(engine.pool, "metrics"):
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        engine.pool.metrics.increment("connections_created")
+
+    @event.listens_for(engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        engine.pool.metrics.increment("connections_closed")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.metrics.increment("connections_invalidated")
+
+    if settings.DB_POOL_PRE_PING != "idle":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get("last_used")
+        if last_used is None or time.monotonic() - last_used < settings.DB_POOL_PING_IDLE_SECONDS:
+            return
+
+        # Conexión ociosa: comprobar antes de entregarla. DisconnectionError
+        # hace que el pool la descarte y reintente con una nueva
+        engine.pool.metrics.increment("pings")
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            engine.pool.metrics.increment("ping_failures")
+            raise exc.DisconnectionError() from e
+
+
+def pool_status(engine: Engine) -> Dict:
+    """
+    Estado y métricas del pool para /health
+
+    Returns:
+        dict: Ocupación actual (size, checked_out, overflow...) y acumulados
+              (esperas, timeouts, rotación de conexiones)
+    """
+    pool = engine.pool
+    metrics = getattr(pool, "metrics", None)
+    if metrics is None:
+        return {"class": type(pool).__name__, "measured": False}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return {
+        "class": type(pool).__name__,
+        "measured": True,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow_in_use": max(0, pool.overflow()),
+        "overflow_peak": metrics.overflow_peak,
+        "saturation": round(checked_out / capacity, 3) if capacity > 0 else None,
+        "checkouts": metrics.checkouts,
+        "wait_ms": {
+            "avg": round(metrics.total_wait_ms / metrics.checkouts, 3) if metrics.checkouts else 0.0,
+            "p95": round(metrics.wait_p95_ms(), 3),
+            "max": round(metrics.max_wait_ms, 3),
+        },
+        "slow_checkouts": metrics.slow_checkouts,
+        "timeouts": metrics.timeouts,
+        "connections_created": metrics.connections_created,
+        "connections_closed": metrics.connections_closed,
+        "connections_invalidated": metrics.connections_invalidated,
+        "pings": metrics.pings,
+        "ping_failures": metrics.ping_failures,
+    }
@@ -0,0 +1,247 @@
+"""
+Instrumentación de consultas SQL (opcional, SQL_INSTRUMENTATION=True)
+Engancha los eventos before/after_cursor_execute del engine y agrega por
+plantilla de sentencia: ejecuciones, latencia total y p95 y filas afectadas.
+
+Cada consulta se atribuye a la unidad de trabajo activa (un job o una request)
+y las plantillas SELECT repetidas más de SQL_N_PLUS_ONE_THRESHOLD veces en la
+misma unidad se marcan como posible N+1.
+
+Uso en un script:
+    with instrumented_job("update_daily"):
+        update_daily_prices()
+    -> resumen por consola + JSON en SQL_REPORT_DIR
+
+En la API, el middleware de app.main añade la cabecera X-SQL-Queries
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# Directorio base para rutas relativas de los informes (backend/)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Normalización de sentencias: listas IN expandidas, literales y espacios
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_template(statement: str) -> str:
+    """
+    Plantilla de una sentencia: mismas consultas con distintos parámetros
+    (o listas IN de distinto tamaño) comparten plantilla
+    """
+    template = _SPACES.sub(" ", statement).strip()
+    template = _STRING.sub("?", template)
+    template = _NUMBER.sub("?", template)
+    return _PARAM_LIST.sub("(…)", template)
+
+
+class TemplateStats:
+    """Agregado de una plantilla dentro de una unidad de trabajo"""
+
+    __slots__ = ("count", "total_ms", "latencies", "rows", "executemany")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.latencies: List[float] = []
+        self.rows = 0
+        self.executemany = False
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)] if ordered else 0.0
+
+
+class QueryReport:
+    """
+    Consultas de una unidad de trabajo (job o request)
+
+    Las filas son el rowcount del driver: PyMySQL lo informa también en los
+    SELECT; SQLite solo en INSERT/UPDATE/DELETE
+    """
+
+    def __init__(self, unit: str, n_plus_one_threshold: int):
+        self.unit = unit
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.started_at = datetime.now()
+        self.templates: Dict[str, TemplateStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed_ms: float, rows: int, executemany: bool):
+        template = statement_template(statement)
+        with self._lock:
+            stats = self.templates.get(template)
+            if stats is None:
+                stats = self.templates[template] = TemplateStats()
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.latencies.append(elapsed_ms)
+            stats.rows += max(rows, 0)
+            stats.executemany = stats.executemany or executemany
+
+    @property
+    def total_queries(self) -> int:
+        return sum(stats.count for stats in self.templates.values())
+
+    @property
+    def total_ms(self) -> float:
+        return sum(stats.total_ms for stats in self.templates.values())
+
+    def n_plus_one(self) -> List[str]:
+        """Plantillas SELECT ejecutadas más veces que el umbral"""
+        return [
+            template for template, stats in self.templates.items()
+            if stats.count > self.n_plus_one_threshold and template.upper().startswith("SELECT")
+        ]
+
+    def to_dict(self, top: Optional[int] = None) -> Dict:
+        """
+        Informe serializable
+
+        Args:
+            top: Solo las N plantillas con más tiempo acumulado (None = todas)
+        """
+        ranked = sorted(self.templates.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return {
+            "unit": self.unit,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "queries": self.total_queries,
+            "templates_count": len(self.templates),
+            "total_ms": round(self.total_ms, 2),
+            "n_plus_one": [
+                {"sql": template, "count": self.templates[template].count}
+                for template in self.n_plus_one()
+            ],
+            "templates": [
+                {
+                    "sql": template,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ms, 2),
+                    "p95_ms": round(stats.p95_ms, 2),
+                    "rows": stats.rows,
+                    "executemany": stats.executemany
+                }
+                for template, stats in ranked[:top]
+            ],
+        }
+
+    def header_value(self) -> str:
+        """Resumen compacto para la cabecera X-SQL-Queries"""
+        return (
+            f"count={self.total_queries};total_ms={self.total_ms:.1f};"
+            f"templates={len(self.templates)};n_plus_one={len(self.n_plus_one())}"
+        )
+
+    def dump_json(self, path: str) -> str:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def print_summary(self, top: int = 5):
+        print(f"\n🔎 SQL [{self.unit}]: {self.total_queries} consultas, "
+              f"{len(self.templates)} plantillas, {self.total_ms:.1f} ms")
+        for template in self.to_dict(top)["templates"]:
+            print(f"   {template['count']:>5}x {template['total_ms']:>9.1f} ms  {template['sql'][:100]}")
+        for item in self.to_dict()["n_plus_one"]:
+            print(f"   ⚠️  Posible N+1 ({item['count']}x): {item['sql'][:100]}")
+
+
+class QueryInstrumentation:
+    """
+    Listeners del engine + unidad de trabajo activa (ContextVar: válida
+    para scripts, hilos y requests async)
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 10):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._current: ContextVar[Optional[QueryReport]] = ContextVar("sql_query_report", default=None)
+        self._engines: List[Engine] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._engines)
+
+    def install(self, engine: Engine):
+        """Registra los listeners en el engine (idempotente)"""
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+
+    def uninstall(self, engine: Engine):
+        if engine not in self._engines:
+            return
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.remove(engine)
+
+    @contextmanager
+    def unit(self, name: str) -> Iterator[QueryReport]:
+        """Atribuye a `name` las consultas ejecutadas dentro del bloque"""
+        report = QueryReport(name, self.n_plus_one_threshold)
+        token = self._current.set(report)
+        try:
+            yield report
+        finally:
+            self._current.reset(token)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current.get() is not None:
+            conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        report = self._current.get()
+        starts = conn.info.get("query_stats_start")
+        if report is None or not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        report.record(statement, elapsed_ms, cursor.rowcount, executemany)
+
+
+# Instancia global (se instala en app.core.database si SQL_INSTRUMENTATION=True)
+query_instrumentation = QueryInstrumentation(settings.SQL_N_PLUS_ONE_THRESHOLD)
+
+
+@contextmanager
+def instrumented_job(name: str):
+    """
+    Unidad de trabajo de un script: al terminar imprime el resumen y guarda
+    el informe JSON en SQL_REPORT_DIR. Sin instrumentación activa no hace nada
+    """
+    if not query_instrumentation.enabled:
+        yield None
+        return
+
+    with query_instrumentation.unit(name) as report:
+        try:
+            yield report
+        finally:
+            directory = Path(settings.SQL_REPORT_DIR)
+            if not directory.is_absolute():
+                directory = BACKEND_DIR / directory
+            path = report.dump_json(
+                str(directory / f"{name}_{report.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+            )
+            report.print_summary()
+            print(f"   💾 Informe SQL: {path}")
@@ -2,18 +2,33 @@
 FastAPI Main Application Entry Point
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-# Importaremos los routers cuando los creemos
-# from app.routers import players, teams, market, auth
+from app.core.database import dispose_async_engine
+from app.core.query_stats import query_instrumentation
+from app.routers import health, players, teams, market, leaderboard
+
+# Importaremos el resto de routers cuando los creemos
+# from app.routers import auth
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranque/parada de la API: cierra el pool async al terminar"""
+    yield
+    await dispose_async_engine()
+
 
 app = FastAPI(
     title="Ultimate Fantasy Legends API",
     description="API para plataforma de Fantasy Football con mecánicas de FIFA y Pokémon",
     version="0.1.0",
     docs_url="/docs",  # Swagger UI
-    redoc_url="/redoc"  # ReDoc
+    redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan
 )
 
 # Configuración de CORS (para que React pueda conectarse)
@@ -26,6 +41,22 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def sql_query_stats(request: Request, call_next):
+    """
+    Consultas SQL de cada request en la cabecera X-SQL-Queries
+    (solo con SQL_INSTRUMENTATION=True)
+    """
+    if not query_instrumentation.enabled:
+        return await call_next(request)
+
+    with query_instrumentation.unit(f"{request.method} {request.url.path}") as report:
+        response = await call_next(request)
+
+    response.headers["X-SQL-Queries"] = report.header_value()
+    return response
+
+
 @app.get("/")
 async def root():
     """
@@ -39,22 +70,14 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health_check():
-    """
-    Health check endpoint - Útil para monitoreo
-    """
-    return {
-        "status": "healthy",
-        "database": "pending_connection"  # Lo actualizaremos cuando conectemos MySQL
-    }
-
+app.include_router(health.router, prefix="/health", tags=["Health"])
+app.include_router(players.router, prefix="/api/players", tags=["Jugadores"])
+app.include_router(teams.router, prefix="/api/teams", tags=["Equipos"])
+app.include_router(market.router, prefix="/api/market", tags=["Mercado"])
+app.include_router(leaderboard.router, prefix="/api/leaderboard", tags=["Clasificación"])
 
-# Cuando creemos los routers, los incluiremos así:
+# Cuando creemos el resto de routers, los incluiremos así:
 # app.include_router(auth.router, prefix="/api/auth", tags=["Autenticación"])
-# app.include_router(players.router, prefix="/api/players", tags=["Jugadores"])
-# app.include_router(teams.router, prefix="/api/teams", tags=["Equipos"])
-# app.include_router(market.router, prefix="/api/market", tags=["Mercado"])
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ Database Models - Esquema completo unificado
 Todos los modelos de la base de datos en un solo archivo
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Date, DateTime, Text, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -316,8 +316,8 @@ class Match(Base):
     id = Column(Integer, primary_key=True, index=True)
     sportmonks_id = Column(Integer, unique=True, nullable=False)
     
-    # Jornada
-    gameweek_id = Column(Integer, ForeignKey("gameweeks.id"), nullable=False)
+    # Jornada (indexada: las jornadas se cargan por Match.gameweek_id)
+    gameweek_id = Column(Integer, ForeignKey("gameweeks.id"), nullable=False, index=True)
     gameweek = relationship("Gameweek", back_populates="matches")
     
     # Equipos
@@ -355,6 +355,16 @@ class PlayerMatchStats(Base):
     Solo incluye campos disponibles en Sportmonks API (Free Plan)
     """
     __tablename__ = "player_match_stats"
+    __table_args__ = (
+        # Lecturas por partido/jornada (puntuación, correcciones, player_form).
+        # Cubre la agregación de forma: no necesita leer la fila completa
+        Index(
+            "ix_player_match_stats_match_minutes",
+            "match_id", "minutes_played", "player_id", "rating", "fantasy_points"
+        ),
+        # Historial de un jugador partido a partido (sustituye al índice simple de player_id)
+        Index("ix_player_match_stats_player_match", "player_id", "match_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -443,6 +453,175 @@ class PlayerMatchStats(Base):
         return f"<PlayerMatchStats Player:{self.player_id} Match:{self.match_id} Points:{self.fantasy_points}>"
 
 
+# ==========================================
+# MODELO: PLAYER_FORM (Forma reciente agregada)
+# ==========================================
+
+class PlayerForm(Base):
+    """
+    Forma reciente de cada jugador, precalculada
+    
+    Sumas y recuentos de las últimas N jornadas (ventana móvil por número de
+    jornada, no por fecha de inserción). Se actualiza de forma incremental al
+    cerrar cada jornada (ver PlayerFormService) para que precios y OVR lean
+    un único registro en lugar de recorrer player_match_stats.
+    """
+    __tablename__ = "player_form"
+    
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    
+    # Ventana: jornadas (last_gameweek - window_gameweeks, last_gameweek]
+    window_gameweeks = Column(Integer, nullable=False, default=4)
+    last_gameweek = Column(Integer, nullable=False, default=0)
+    
+    # Solo partidos con minutos jugados
+    matches_played = Column(Integer, default=0)
+    sum_rating = Column(Float, default=0.0)  # Notas nulas cuentan como 0
+    sum_fantasy_points = Column(Float, default=0.0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def average_rating(self) -> float:
+        """Nota media en la ventana"""
+        if not self.matches_played:
+            return 0.0
+        return self.sum_rating / self.matches_played
+    
+    @property
+    def average_fantasy_points(self) -> float:
+        """Puntos Fantasy medios en la ventana"""
+        if not self.matches_played:
+            return 0.0
+        return self.sum_fantasy_points / self.matches_played
+    
+    def __repr__(self):
+        return f"<PlayerForm Player:{self.player_id} J{self.last_gameweek} Partidos:{self.matches_played}>"
+
+
+# ==========================================
+# MODELO: PLAYER_PRICE_HISTORY (Histórico de precios)
+# ==========================================
+
+class PlayerPriceHistory(Base):
+    """
+    Precio de cada jugador al cierre de cada día (serie temporal)
+    
+    Una fila por jugador y día, escrita en bloque por la actualización diaria
+    (ver PriceHistoryService). La PK (player_id, day) agrupa físicamente la
+    serie de cada jugador (InnoDB): las gráficas son lecturas de rango sobre
+    la PK. El índice por día sirve para comparar todos los jugadores entre
+    dos fechas (mayores subidas/bajadas) sin leer la tabla.
+    """
+    __tablename__ = "player_price_history"
+    __table_args__ = (
+        Index("ix_player_price_history_day", "day", "player_id", "price"),
+    )
+    
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    price = Column(Float, nullable=False)
+    
+    def __repr__(self):
+        return f"<PlayerPriceHistory {self.player_id} {self.day}: {self.price}>"
+
+
+# ==========================================
+# MODELO: MARKET_SNAPSHOT (Foto diaria del mercado)
+# ==========================================
+
+class MarketSnapshot(Base):
+    """
+    Resumen del mercado que genera la actualización diaria de precios
+    
+    Una fila por día (si el job se repite, se sobrescribe). El contenido
+    (mayores subidas/bajadas por posición, precio medio por rareza...) se
+    guarda ya serializado en JSON: la API lo devuelve tal cual
+    """
+    __tablename__ = "market_snapshots"
+    
+    day = Column(Date, primary_key=True)
+    
+    players_count = Column(Integer, nullable=False, default=0)
+    total_market_cap = Column(Float, nullable=False, default=0.0)
+    payload = Column(Text, nullable=False)  # JSON (ver MarketSnapshotBuilder)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<MarketSnapshot {self.day}: €{self.total_market_cap:,.0f}>"
+
+
+# ==========================================
+# MODELO: LEADERBOARD_ENTRY (Clasificaciones)
+# ==========================================
+
+class LeaderboardEntry(Base):
+    """
+    Clasificación precalculada: puesto de cada usuario en cada ámbito
+    (scope 0 = temporada, scope N = jornada N)
+    
+    position es el orden único (puntos desc, user_id asc) y sirve para
+    paginar; rank es el puesto que se muestra (empates comparten puesto).
+    Se mantiene al confirmar puntos (ver LeaderboardService): "mi puesto" es
+    una lectura por PK y "la página alrededor de mí" un rango del índice
+    (scope, position), sin ORDER BY sobre todos los usuarios. El índice
+    (scope, points DESC, user_id) sigue el mismo orden y permite recolocar a
+    un usuario sin leer el ámbito completo.
+    """
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        # No único: los desplazamientos de puestos se escriben en bloque
+        Index("ix_leaderboard_entries_scope_position", "scope", "position"),
+        # Orden de la clasificación: puesto nuevo de un usuario por rango
+        Index("ix_leaderboard_entries_scope_points", "scope", text("points DESC"), "user_id"),
+    )
+    
+    scope = Column(Integer, primary_key=True)  # 0 = temporada, N = jornada N
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    
+    points = Column(Integer, nullable=False, default=0)
+    position = Column(Integer, nullable=False)
+    rank = Column(Integer, nullable=False)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<LeaderboardEntry scope={self.scope} user={self.user_id} #{self.rank} ({self.points} pts)>"
+
+
+# ==========================================
+# MODELO: TEAM_GAMEWEEK_POINTS (Puntos por jornada)
+# ==========================================
+
+class TeamGameweekPoints(Base):
+    """
+    Puntos de la alineación de cada equipo en cada jornada liquidada
+
+    Una fila por equipo y jornada, escrita en bloque al liquidar la jornada
+    (ver GameweekSettlementService). La PK (gameweek_id, team_id) agrupa las
+    filas de una jornada: re-liquidarla o leerla entera es una lectura de
+    rango. Team.total_fantasy_points y User.total_points acumulan estas
+    filas: una corrección de stats recalcula la fila del equipo y suma a los
+    totales la diferencia con la guardada.
+    """
+    __tablename__ = "team_gameweek_points"
+    __table_args__ = (
+        Index("ix_team_gameweek_points_team", "team_id", "gameweek_id"),
+    )
+    
+    gameweek_id = Column(Integer, ForeignKey("gameweeks.id"), primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+    # Copia de Team.user_id: la clasificación de la jornada no necesita el join
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    points = Column(Integer, nullable=False, default=0)
+    settled_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<TeamGameweekPoints gw={self.gameweek_id} team={self.team_id}: {self.points} pts>"
+
+
 # ==========================================
 # MODELO: ARENA_BATTLE (Batalla PvP)
 # ==========================================
@@ -472,3 +651,34 @@ class ArenaBattle(Base):
     
     def __repr__(self):
         return f"<ArenaBattle {self.team1_id} vs {self.team2_id}>"
+
+
+# ==========================================
+# MODELO: JOB_RUN (Ejecuciones de los jobs)
+# ==========================================
+
+class JobRun(Base):
+    """
+    Registro de cada ejecución de los jobs programados (update_daily,
+    update_weekend...). /health/ready lo usa para saber hace cuánto que
+    terminó bien la última actualización de precios y de puntos.
+    """
+    __tablename__ = "job_runs"
+    __table_args__ = (
+        # Última ejecución correcta de cada job
+        Index("ix_job_runs_job_status_finished", "job_name", "status", "finished_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="running")  # running | success | failed
+    
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    
+    # Resumen (filas procesadas...) o mensaje de error
+    details = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<JobRun {self.job_name} {self.status} {self.started_at}>"
@@ -0,0 +1,150 @@
+"""
+Router de Health Checks
+- /health/live: el proceso responde (sin tocar la BD). Para el liveness probe
+- /health/ready: la BD responde a tiempo (503 si no), saturación del pool y
+  frescura de los jobs de precios y puntos. Para el readiness probe
+- /health: lo mismo que ready con todas las métricas de los pools y de la
+  caché de lecturas
+
+Estados de ready:
+- "ok": todo correcto
+- "degraded" (200): la API puede servir, pero el pool está casi lleno o algún
+  job lleva demasiado tiempo sin terminar bien (precios/puntos desactualizados)
+- "unavailable" (503): la BD no responde o tarda más de HEALTH_DB_TIMEOUT
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.core.cache import read_cache
+from app.core.config import settings
+from app.core.database import engine, async_engine, AsyncSessionLocal
+from app.core.pool import pool_status
+from app.services.job_runs import last_success_query, DAILY_PRICES_JOB, WEEKEND_SCORING_JOB
+
+router = APIRouter()
+
+# Antigüedad máxima admitida de la última ejecución correcta de cada job
+JOB_MAX_AGE_HOURS = {
+    DAILY_PRICES_JOB: lambda: settings.HEALTH_DAILY_MAX_AGE_HOURS,
+    WEEKEND_SCORING_JOB: lambda: settings.HEALTH_WEEKEND_MAX_AGE_HOURS,
+}
+
+
+async def _probe_database() -> Dict:
+    """SELECT 1 + última ejecución correcta de cada job, con timeout"""
+    async def probe():
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await db.execute(text("SELECT 1"))
+            latency_ms = (time.perf_counter() - start) * 1000
+            try:
+                finished = dict((await db.execute(last_success_query(JOB_MAX_AGE_HOURS))).all())
+                jobs_error = None
+            except Exception as e:  # p. ej. tabla job_runs sin migrar
+                finished, jobs_error = {}, str(e)
+            return latency_ms, finished, jobs_error
+
+    start = time.perf_counter()
+    try:
+        latency_ms, finished, jobs_error = await asyncio.wait_for(probe(), settings.HEALTH_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"timeout ({settings.HEALTH_DB_TIMEOUT}s)"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+    return {
+        "ok": True,
+        "latency_ms": round(latency_ms, 2),
+        # Incluye la espera por una conexión del pool
+        "total_ms": round((time.perf_counter() - start) * 1000, 2),
+        "finished": finished,
+        "jobs_error": jobs_error,
+    }
+
+
+def _job_freshness(finished: Dict) -> Dict:
+    """Antigüedad de la última ejecución correcta de cada job frente a su máximo"""
+    now = datetime.utcnow()
+    jobs = {}
+    for name, max_age in JOB_MAX_AGE_HOURS.items():
+        last = finished.get(name)
+        age_hours = (now - last).total_seconds() / 3600 if last else None
+        jobs[name] = {
+            "last_success": last.isoformat(timespec="seconds") if last else None,
+            "age_hours": round(age_hours, 2) if age_hours is not None else None,
+            "max_age_hours": max_age(),
+            "stale": age_hours is None or age_hours > max_age(),
+        }
+    return jobs
+
+
+async def _readiness(full: bool) -> JSONResponse:
+    database = await _probe_database()
+    pools = {"sync": pool_status(engine), "async": pool_status(async_engine.sync_engine)}
+
+    if not database["ok"]:
+        body = {"status": "unavailable", "database": {"ok": False, "error": database["error"]}}
+        if full:
+            body["pool"] = pools
+        return JSONResponse(status_code=503, content=body)
+
+    warnings = []
+
+    jobs = _job_freshness(database["finished"])
+    if database["jobs_error"]:
+        warnings.append(f"job_runs: {database['jobs_error']}")
+    warnings += [f"{name} desactualizado" for name, job in jobs.items() if job["stale"]]
+
+    saturation = {name: pool.get("saturation") for name, pool in pools.items()}
+    warnings += [
+        f"pool {name} al {value:.0%}" for name, value in saturation.items()
+        if value is not None and value >= settings.HEALTH_POOL_SATURATION_WARN
+    ]
+
+    body = {
+        "status": "degraded" if warnings else "ok",
+        "warnings": warnings,
+        "database": {
+            "ok": True,
+            "latency_ms": database["latency_ms"],
+            "total_ms": database["total_ms"],
+        },
+        "pool": pools if full else {"saturation": saturation},
+        "jobs": jobs,
+    }
+    if full:
+        body["cache"] = read_cache.status()
+    return JSONResponse(status_code=200, content=body)
+
+
+@router.get("/live")
+async def liveness():
+    """El proceso está vivo (no consulta la BD)"""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Lista para recibir tráfico: 503 si la BD no responde a tiempo; "degraded"
+    si el pool está saturado o los jobs de precios/puntos van con retraso
+    """
+    return await _readiness(full=False)
+
+
+@router.get("")
+async def health_check():
+    """
+    Health check completo - Útil para monitoreo
+
+    Como /health/ready, con las métricas de los pools de conexiones: espera
+    al pedir una conexión (requests haciendo cola), uso del overflow y rotación
+    """
+    return await _readiness(full=True)
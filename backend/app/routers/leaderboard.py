@@ -0,0 +1,59 @@
+"""
+Router de Clasificaciones
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache, query_signature
+from app.core.database import get_async_db
+from app.schemas.leaderboard import LeaderboardPageResponse, UserStandingResponse
+from app.services.async_reads import AsyncReadService
+from app.services.leaderboard import SEASON_SCOPE
+
+router = APIRouter()
+
+
+def _scope(gameweek: Optional[int]) -> int:
+    return gameweek if gameweek is not None else SEASON_SCOPE
+
+
+@router.get("", response_model=LeaderboardPageResponse)
+async def get_leaderboard(
+    gameweek: Optional[int] = Query(None, ge=1),
+    from_position: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Clasificación general (o de la jornada `gameweek`) desde el puesto
+    `from_position`
+    """
+    scope = _scope(gameweek)
+    return await read_cache.get_or_load(
+        query_signature("leaderboard:page", scope=scope, from_position=from_position, limit=limit),
+        lambda: AsyncReadService(db).get_leaderboard_page(scope, from_position, limit)
+    )
+
+
+@router.get("/users/{user_id}", response_model=UserStandingResponse)
+async def get_user_standing(
+    user_id: int,
+    gameweek: Optional[int] = Query(None, ge=1),
+    radius: int = Query(0, ge=0, le=25),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Puesto de un usuario; con radius > 0 incluye los `radius` usuarios por
+    encima y por debajo ("la página alrededor de mí")
+    """
+    scope = _scope(gameweek)
+    standing = await read_cache.get_or_load(
+        query_signature(f"leaderboard:user:{user_id}", scope=scope, radius=radius),
+        lambda: AsyncReadService(db).get_user_standing(scope, user_id, radius)
+    )
+    if standing is None:
+        raise HTTPException(status_code=404, detail="Usuario sin puesto en esta clasificación")
+    return standing
@@ -0,0 +1,33 @@
+"""
+Router de Mercado
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache
+from app.core.database import get_async_db
+from app.schemas.market import MarketSnapshotResponse
+from app.services.async_reads import AsyncReadService
+
+router = APIRouter()
+
+
+@router.get("/snapshot", response_model=MarketSnapshotResponse)
+async def market_snapshot(day: Optional[date] = None, db: AsyncSession = Depends(get_async_db)):
+    """
+    Foto del mercado del día (o de `day`): mayores subidas/bajadas por
+    posición, precio medio por rareza y capitalización total
+
+    Precalculada por update_daily.py: se devuelve el JSON guardado tal cual
+    """
+    payload = await read_cache.get_or_load(
+        f"market:snapshot:{day.isoformat() if day else 'latest'}",
+        lambda: AsyncReadService(db).get_market_snapshot(day)
+    )
+    if payload is None:
+        raise HTTPException(status_code=404, detail="No hay foto del mercado para ese día")
+    return Response(content=payload, media_type="application/json")
@@ -0,0 +1,150 @@
+"""
+Router de Jugadores
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import read_cache, query_signature
+from app.core.database import get_async_db
+from app.core.pagination import InvalidCursorError
+from app.schemas.player import (
+    PlayerDetailResponse,
+    PlayerPageResponse,
+    PriceHistoryResponse,
+    PriceMoversResponse,
+    PositionEnum,
+    CardRarityEnum
+)
+from app.services.async_reads import AsyncReadService
+from app.services.price_history import default_range
+
+router = APIRouter()
+
+
+async def _player_page(db: AsyncSession, **filters) -> JSONResponse:
+    """
+    Página del catálogo (cacheada por firma de la consulta hasta que los
+    jobs cambien los precios) serializada directamente: los items ya son
+    dicts de tipos JSON, validarlos con Pydantic fila a fila solo añadiría
+    coste (response_model queda para la documentación)
+    """
+    try:
+        page = await read_cache.get_or_load(
+            query_signature("players:list", **filters),
+            lambda: AsyncReadService(db).list_players(**filters)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(content=page)
+
+
+@router.get("", response_model=PlayerPageResponse)
+async def list_players(
+    sort: str = Query("price", pattern="^(price|rating)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    position: Optional[PositionEnum] = None,
+    rarity: Optional[CardRarityEnum] = None,
+    team: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Catálogo de jugadores (vista de mercado)
+
+    Paginación por cursor: pasa el next_cursor de la respuesta para pedir la
+    página siguiente con la misma ordenación y filtros
+    """
+    return await _player_page(
+        db, sort=sort, descending=order == "desc", limit=limit, cursor=cursor,
+        position=position.value if position else None,
+        rarity=rarity.value if rarity else None,
+        team=team
+    )
+
+
+@router.get("/search", response_model=PlayerPageResponse)
+async def search_players(
+    q: str = Query(..., min_length=2, max_length=100),
+    sort: str = Query("price", pattern="^(price|rating)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    position: Optional[PositionEnum] = None,
+    rarity: Optional[CardRarityEnum] = None,
+    team: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Búsqueda de jugadores por nombre, con los mismos filtros y paginación
+    que el catálogo
+    """
+    return await _player_page(
+        db, sort=sort, descending=order == "desc", limit=limit, cursor=cursor,
+        position=position.value if position else None,
+        rarity=rarity.value if rarity else None,
+        team=team, search=q
+    )
+
+
+def _date_range(start: Optional[date], end: Optional[date]):
+    start, end = default_range(start, end)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start debe ser anterior o igual a end")
+    return start, end
+
+
+@router.get("/movers", response_model=PriceMoversResponse)
+async def price_movers(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Mayores subidas y bajadas de precio entre dos fechas (por defecto, los
+    últimos 30 días), leídas del histórico
+    """
+    start, end = _date_range(start, end)
+    return await read_cache.get_or_load(
+        query_signature("players:movers", start=start, end=end, limit=limit),
+        lambda: AsyncReadService(db).get_price_movers(start, end, limit)
+    )
+
+
+@router.get("/{player_id}/price-history", response_model=PriceHistoryResponse)
+async def price_history(
+    player_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    points: int = Query(60, ge=2, le=365),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Histórico de precios de un jugador para gráficas: como mucho `points`
+    tramos con mínimo, máximo y último precio, más los agregados del rango
+    """
+    start, end = _date_range(start, end)
+    return await read_cache.get_or_load(
+        query_signature(f"player:{player_id}:history", start=start, end=end, points=points),
+        lambda: AsyncReadService(db).get_price_history(player_id, start, end, points)
+    )
+
+
+@router.get("/{player_id}", response_model=PlayerDetailResponse)
+async def get_player(player_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Detalle de un jugador con su precio y forma reciente
+    """
+    player = await read_cache.get_or_load(
+        f"player:{player_id}",
+        lambda: AsyncReadService(db).get_player_detail(player_id)
+    )
+    if player is None:
+        raise HTTPException(status_code=404, detail="Jugador no encontrado")
+    return player
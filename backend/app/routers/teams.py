@@ -0,0 +1,23 @@
+"""
+Router de Equipos
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.schemas.team import TeamLineupResponse
+from app.services.async_reads import AsyncReadService
+
+router = APIRouter()
+
+
+@router.get("/{team_id}", response_model=TeamLineupResponse)
+async def get_team(team_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Equipo con sus cartas (alineación primero)
+    """
+    team = await AsyncReadService(db).get_team_lineup(team_id)
+    if team is None:
+        raise HTTPException(status_code=404, detail="Equipo no encontrado")
+    return team
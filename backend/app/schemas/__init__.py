@@ -9,7 +9,16 @@ from app.schemas.player import (
     PlayerUpdate,
     PlayerStats,
     PositionEnum,
-    CardRarityEnum
+    CardRarityEnum,
+    PlayerFormResponse,
+    PlayerDetailResponse,
+    PlayerListItem,
+    PlayerPageResponse,
+    PricePoint,
+    PriceSummary,
+    PriceHistoryResponse,
+    PriceMover,
+    PriceMoversResponse
 )
 
 from app.schemas.user import (
@@ -21,6 +30,23 @@ from app.schemas.user import (
     UserRoleEnum
 )
 
+from app.schemas.team import (
+    TeamCardResponse,
+    TeamLineupResponse
+)
+
+from app.schemas.leaderboard import (
+    LeaderboardEntryResponse,
+    LeaderboardPageResponse,
+    UserStandingResponse
+)
+
+from app.schemas.market import (
+    SnapshotMover,
+    PositionMovers,
+    MarketSnapshotResponse
+)
+
 __all__ = [
     # Player schemas
     "PlayerBase",
@@ -30,11 +56,31 @@ __all__ = [
     "PlayerStats",
     "PositionEnum",
     "CardRarityEnum",
+    "PlayerFormResponse",
+    "PlayerDetailResponse",
+    "PlayerListItem",
+    "PlayerPageResponse",
+    "PricePoint",
+    "PriceSummary",
+    "PriceHistoryResponse",
+    "PriceMover",
+    "PriceMoversResponse",
     # User schemas
     "UserBase",
     "UserCreate",
     "UserLogin",
     "UserResponse",
     "TokenResponse",
-    "UserRoleEnum"
+    "UserRoleEnum",
+    # Team schemas
+    "TeamCardResponse",
+    "TeamLineupResponse",
+    # Leaderboard schemas
+    "LeaderboardEntryResponse",
+    "LeaderboardPageResponse",
+    "UserStandingResponse",
+    # Market schemas
+    "SnapshotMover",
+    "PositionMovers",
+    "MarketSnapshotResponse"
 ]
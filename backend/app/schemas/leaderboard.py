@@ -0,0 +1,34 @@
+"""
+Pydantic Schemas para las Clasificaciones
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class LeaderboardEntryResponse(BaseModel):
+    """Usuario en la clasificación (rank: puesto con empates; position: orden único)"""
+    position: int
+    rank: int
+    user_id: int
+    username: str
+    points: int
+
+
+class LeaderboardPageResponse(BaseModel):
+    """Página de la clasificación; next_position pide la siguiente (None = última)"""
+    scope: int  # 0 = temporada, N = jornada N
+    total: int
+    entries: List[LeaderboardEntryResponse]
+    next_position: Optional[int]
+
+
+class UserStandingResponse(BaseModel):
+    """Puesto de un usuario y, si se pide, los usuarios de alrededor"""
+    scope: int
+    user_id: int
+    position: int
+    rank: int
+    points: int
+    total: int
+    around: List[LeaderboardEntryResponse]
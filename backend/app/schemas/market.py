@@ -0,0 +1,32 @@
+"""
+Pydantic Schemas para el Mercado
+"""
+
+from pydantic import BaseModel
+from typing import Dict, List
+from datetime import date, datetime
+
+
+class SnapshotMover(BaseModel):
+    """Jugador entre las mayores subidas/bajadas del día"""
+    player_id: int
+    name: str
+    old_price: float
+    new_price: float
+    movement_percentage: float
+
+
+class PositionMovers(BaseModel):
+    """Mayores subidas y bajadas de una posición"""
+    risers: List[SnapshotMover]
+    fallers: List[SnapshotMover]
+
+
+class MarketSnapshotResponse(BaseModel):
+    """Foto diaria del mercado (generada por update_daily.py)"""
+    day: date
+    generated_at: datetime
+    players: int
+    total_market_cap: float
+    average_price_by_rarity: Dict[str, float]
+    movers: Dict[str, PositionMovers]  # Por posición (GK, DEF, MID, FWD)
@@ -4,7 +4,8 @@ Validación de entrada/salida de datos
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
+from datetime import date
 from enum import Enum
 
 
@@ -116,3 +117,89 @@ class PlayerUpdate(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class PlayerFormResponse(BaseModel):
+    """Forma reciente (ventana de player_form)"""
+    last_gameweek: int
+    matches_played: int
+    average_rating: float
+    average_fantasy_points: float
+
+
+class PlayerDetailResponse(PlayerBase):
+    """Schema de detalle de jugador (precio actual y forma reciente)"""
+    id: int
+    stats: PlayerStats
+    is_legend: bool
+    base_rarity: CardRarityEnum
+    current_team: Optional[str]
+    image_url: Optional[str]
+    current_price: float
+    target_price: float
+    form: Optional[PlayerFormResponse]
+
+
+class PlayerListItem(BaseModel):
+    """Jugador en el listado del catálogo (proyección reducida)"""
+    id: int
+    name: str
+    position: PositionEnum
+    overall_rating: int
+    base_rarity: CardRarityEnum
+    is_legend: bool
+    current_team: Optional[str]
+    current_price: float
+    target_price: float
+    image_url: Optional[str]
+
+
+class PlayerPageResponse(BaseModel):
+    """Página del catálogo; next_cursor pide la siguiente (None = última)"""
+    items: List[PlayerListItem]
+    next_cursor: Optional[str]
+
+
+class PricePoint(BaseModel):
+    """Tramo de la serie de precios (mínimo, máximo y último precio)"""
+    day: date
+    min: float
+    max: float
+    last: float
+
+
+class PriceSummary(BaseModel):
+    """Agregados de un rango de fechas"""
+    days: int
+    min: Optional[float]
+    max: Optional[float]
+    first: Optional[float]
+    last: Optional[float]
+    change_percentage: Optional[float]
+
+
+class PriceHistoryResponse(BaseModel):
+    """Histórico de precios de un jugador"""
+    player_id: int
+    start: date
+    end: date
+    points: List[PricePoint]
+    summary: PriceSummary
+
+
+class PriceMover(BaseModel):
+    """Jugador con su variación de precio entre dos días"""
+    player_id: int
+    name: str
+    position: PositionEnum
+    start_price: float
+    end_price: float
+    change_percentage: float
+
+
+class PriceMoversResponse(BaseModel):
+    """Mayores subidas y bajadas (start/end: días comparados)"""
+    start: Optional[date]
+    end: Optional[date]
+    risers: List[PriceMover]
+    fallers: List[PriceMover]
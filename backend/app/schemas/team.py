@@ -0,0 +1,30 @@
+"""
+Pydantic Schemas para Equipos
+"""
+
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.player import PositionEnum
+
+
+class TeamCardResponse(BaseModel):
+    """Carta de un equipo con los datos básicos del jugador"""
+    card_id: int
+    player_id: int
+    name: str
+    position: PositionEnum
+    current_overall: int
+    current_price: float
+    is_in_lineup: bool
+
+
+class TeamLineupResponse(BaseModel):
+    """Schema de respuesta de equipo con sus cartas (alineación primero)"""
+    id: int
+    name: str
+    user_id: int
+    overall_rating: float
+    total_fantasy_points: int
+    active_formation: str
+    cards: List[TeamCardResponse]
@@ -9,22 +9,57 @@ from app.services.scoring_rules import (
     get_common_penalties
 )
 
+from app.services.scoring_plan import (
+    CompiledScoringPlan,
+    compile_scoring_plan
+)
+
 from app.services.calculator import (
     FantasyPointsCalculator,
     calculator
 )
 
+from app.services.batch_calculator import (
+    BatchPointsCalculator,
+    batch_calculator
+)
+
 from app.services.market_updater import MarketUpdater
 
 from app.services.economy import PriceInertiaSystem
 
+from app.services.player_form import PlayerFormService
+
+from app.services.incremental_scoring import IncrementalScoringService
+
+from app.services.job_runs import JobRunService
+
+from app.services.price_history import PriceHistoryService
+
+from app.services.market_snapshot import MarketSnapshotBuilder, MarketSnapshotService
+
+from app.services.leaderboard import LeaderboardService
+from app.services.gameweek_settlement import GameweekSettlementService
+
 __all__ = [
     "SCORING_RULES",
     "calcular_puntos_por_nota",
     "get_position_rules",
     "get_common_penalties",
+    "CompiledScoringPlan",
+    "compile_scoring_plan",
     "FantasyPointsCalculator",
     "calculator",
+    "BatchPointsCalculator",
+    "batch_calculator",
     "MarketUpdater",
-    "PriceInertiaSystem"
+    "PriceInertiaSystem",
+    "PlayerFormService",
+    "IncrementalScoringService",
+    "JobRunService",
+    "PriceHistoryService",
+    "MarketSnapshotBuilder",
+    "MarketSnapshotService",
+    "LeaderboardService",
+    "GameweekSettlementService"
 ]
@@ -0,0 +1,338 @@
+"""
+Lecturas Async para la API
+Versiones async (AsyncSession) de las consultas de solo lectura que sirve la
+API: no bloquean el event loop mientras esperan a MySQL, así un worker atiende
+otras requests durante la espera
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.pagination import encode_cursor, decode_cursor, keyset_condition
+from app.models.models import Player, PlayerForm, Team, UserCard, Gameweek, Position, CardRarity
+from app.services.leaderboard import entry_query, positions_query, size_query, entries_to_dicts
+from app.services.market_snapshot import snapshot_payload_query
+from app.services.price_history import (
+    series_query,
+    bounds_query,
+    movers_query,
+    downsample,
+    summarize,
+    movers_rows_to_dicts
+)
+
+# Ordenaciones del catálogo: columnas indexadas (+ id como desempate)
+CATALOGUE_SORTS = {
+    "price": Player.current_price,
+    "rating": Player.overall_rating,
+}
+
+# Proyección del listado: solo lo que pinta la vista de mercado
+CATALOGUE_COLUMNS = (
+    Player.id,
+    Player.name,
+    Player.position,
+    Player.overall_rating,
+    Player.base_rarity,
+    Player.is_legend,
+    Player.current_team,
+    Player.current_price,
+    Player.target_price,
+    Player.image_url,
+)
+
+
+class AsyncReadService:
+    """
+    Consultas de lectura sobre una AsyncSession (ver get_async_db)
+
+    Todas devuelven datos ya cargados (dicts o entidades con sus relaciones):
+    en async no hay lazy loading al acceder a un atributo
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_player(self, player_id: int) -> Optional[Player]:
+        return await self.db.get(Player, player_id)
+
+    async def get_player_detail(self, player_id: int) -> Optional[Dict]:
+        """
+        Jugador y su forma reciente (player_form) en una sola consulta
+
+        Returns:
+            dict | None: Campos del jugador + "form" (None si no tiene partidos en la ventana)
+        """
+        row = (await self.db.execute(
+            select(Player, PlayerForm)
+            .outerjoin(PlayerForm, PlayerForm.player_id == Player.id)
+            .where(Player.id == player_id)
+        )).first()
+
+        if row is None:
+            return None
+
+        player, form = row
+        return {
+            "id": player.id,
+            "name": player.name,
+            "age": player.age,
+            "position": player.position.value,
+            "nationality": player.nationality,
+            "overall_rating": player.overall_rating,
+            "potential": player.potential,
+            "stats": {
+                "pace": player.pace,
+                "shooting": player.shooting,
+                "passing": player.passing,
+                "dribbling": player.dribbling,
+                "defending": player.defending,
+                "physical": player.physical
+            },
+            "is_legend": player.is_legend,
+            "base_rarity": player.base_rarity.value,
+            "current_team": player.current_team,
+            "image_url": player.image_url,
+            "current_price": player.current_price,
+            "target_price": player.target_price,
+            "form": {
+                "last_gameweek": form.last_gameweek,
+                "matches_played": form.matches_played,
+                "average_rating": round(form.average_rating, 2),
+                "average_fantasy_points": round(form.average_fantasy_points, 2)
+            } if form and form.matches_played else None
+        }
+
+    async def list_players(
+        self,
+        sort: str = "price",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        position: Optional[str] = None,
+        rarity: Optional[str] = None,
+        team: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Dict:
+        """
+        Catálogo de jugadores paginado por keyset sobre (columna, id)
+
+        Args:
+            sort: "price" (current_price) o "rating" (overall_rating)
+            descending: Orden descendente (por defecto, los más caros/mejores primero)
+            limit: Jugadores por página
+            cursor: next_cursor de la página anterior (None = primera página)
+            position: Filtro por posición (GK, DEF, MID, FWD)
+            rarity: Filtro por rareza base (bronze, silver, gold, legend)
+            team: Filtro por equipo real (nombre exacto)
+            search: Texto contenido en el nombre
+
+        Returns:
+            dict: "items" (dicts construidos desde las tuplas de la proyección,
+                  sin entidades ORM) y "next_cursor" (None si no hay más)
+
+        Raises:
+            InvalidCursorError: Si el cursor no es válido para esta ordenación
+        """
+        column = CATALOGUE_SORTS[sort]
+        query = select(*CATALOGUE_COLUMNS)
+
+        if position:
+            query = query.where(Player.position == Position(position))
+        if rarity:
+            query = query.where(Player.base_rarity == CardRarity(rarity))
+        if team:
+            query = query.where(Player.current_team == team)
+        if search:
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query = query.where(Player.name.like(f"%{escaped}%", escape="\\"))
+
+        if cursor:
+            value, row_id = decode_cursor(cursor, sort)
+            query = query.where(keyset_condition(column, Player.id, value, row_id, descending))
+
+        order = (column.desc(), Player.id.desc()) if descending else (column.asc(), Player.id.asc())
+        # Una fila de más para saber si hay página siguiente
+        rows = (await self.db.execute(query.order_by(*order).limit(limit + 1))).all()
+
+        items = [
+            {
+                "id": player_id,
+                "name": name,
+                "position": player_position.value,
+                "overall_rating": overall_rating,
+                "base_rarity": base_rarity.value,
+                "is_legend": is_legend,
+                "current_team": current_team,
+                "current_price": current_price,
+                "target_price": target_price,
+                "image_url": image_url
+            }
+            for (player_id, name, player_position, overall_rating, base_rarity, is_legend,
+                 current_team, current_price, target_price, image_url) in rows[:limit]
+        ]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            sort_value = last["current_price"] if sort == "price" else last["overall_rating"]
+            next_cursor = encode_cursor(sort, sort_value, last["id"])
+
+        return {"items": items, "next_cursor": next_cursor}
+
+    async def get_price_history(self, player_id: int, start: date, end: date,
+                                max_points: int = 60) -> Dict:
+        """
+        Serie de precios de un jugador para gráficas
+
+        Una lectura de rango sobre la PK (player_id, day); la reducción a
+        max_points tramos (mín/máx/último) se hace sobre esas filas
+
+        Returns:
+            dict: "points" (serie reducida) y "summary" (mín/máx/primero/último del rango)
+        """
+        rows = (await self.db.execute(series_query(player_id, start, end))).all()
+        prices = [price for _, price in rows]
+        return {
+            "player_id": player_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "points": downsample(rows, max_points),
+            "summary": summarize(
+                prices[0] if prices else None,
+                prices[-1] if prices else None,
+                min(prices) if prices else None,
+                max(prices) if prices else None,
+                len(prices)
+            )
+        }
+
+    async def get_price_movers(self, start: date, end: date, limit: int = 10) -> Dict:
+        """
+        Mayores subidas y bajadas entre el primer y el último día con datos
+        del rango (ver PriceHistoryService.biggest_movers)
+        """
+        first_day, last_day = (await self.db.execute(bounds_query(start, end))).one()
+        if first_day is None or first_day == last_day:
+            return {"start": None, "end": None, "risers": [], "fallers": []}
+
+        risers = (await self.db.execute(movers_query(first_day, last_day, limit, True))).all()
+        fallers = (await self.db.execute(movers_query(first_day, last_day, limit, False))).all()
+        return {
+            "start": first_day.isoformat(),
+            "end": last_day.isoformat(),
+            "risers": movers_rows_to_dicts(risers),
+            "fallers": movers_rows_to_dicts(fallers)
+        }
+
+    async def get_market_snapshot(self, day: Optional[date] = None) -> Optional[str]:
+        """
+        Foto del mercado de un día (o la más reciente), como el JSON guardado
+        por update_daily.py: una lectura por PK, sin deserializar
+        """
+        return (await self.db.execute(snapshot_payload_query(day))).scalar_one_or_none()
+
+    async def get_leaderboard_page(self, scope: int, from_position: int = 1, limit: int = 50) -> Dict:
+        """
+        Página de la clasificación a partir de un puesto (rango del índice
+        (scope, position): igual de rápida en la primera página que en la última)
+        """
+        last_position = from_position + limit - 1
+        rows = (await self.db.execute(positions_query(scope, from_position, last_position))).all()
+        total = (await self.db.execute(size_query(scope))).scalar() or 0
+        return {
+            "scope": scope,
+            "total": total,
+            "entries": entries_to_dicts(rows),
+            "next_position": last_position + 1 if last_position < total else None
+        }
+
+    async def get_user_standing(self, scope: int, user_id: int, radius: int = 0) -> Optional[Dict]:
+        """
+        Puesto de un usuario (lectura por PK) y, con radius > 0, los `radius`
+        usuarios por encima y por debajo
+
+        Returns:
+            dict | None: None si el usuario no está en la clasificación
+        """
+        entry = (await self.db.execute(entry_query(scope, user_id))).first()
+        if entry is None:
+            return None
+
+        position, rank, points = entry
+        around = []
+        if radius:
+            rows = (await self.db.execute(
+                positions_query(scope, max(1, position - radius), position + radius)
+            )).all()
+            around = entries_to_dicts(rows)
+
+        return {
+            "scope": scope,
+            "user_id": user_id,
+            "position": position,
+            "rank": rank,
+            "points": points,
+            "total": (await self.db.execute(size_query(scope))).scalar() or 0,
+            "around": around
+        }
+
+    async def get_active_gameweek(self) -> Optional[Gameweek]:
+        """Jornada activa con sus partidos (carga anticipada)"""
+        return (await self.db.execute(
+            select(Gameweek)
+            .options(selectinload(Gameweek.matches))
+            .where(Gameweek.is_active == True)
+        )).scalars().first()
+
+    async def get_team_lineup(self, team_id: int) -> Optional[Dict]:
+        """
+        Equipo y sus cartas con los datos del jugador (2 consultas, sin N+1)
+
+        Returns:
+            dict | None: Datos del equipo + "cards" (alineación primero)
+        """
+        team = await self.db.get(Team, team_id)
+        if team is None:
+            return None
+
+        rows = (await self.db.execute(
+            select(
+                UserCard.id,
+                UserCard.player_id,
+                UserCard.current_overall,
+                UserCard.is_in_lineup,
+                Player.name,
+                Player.position,
+                Player.current_price
+            )
+            .join(Player, Player.id == UserCard.player_id)
+            .where(UserCard.team_id == team_id)
+            .order_by(UserCard.is_in_lineup.desc(), Player.position, UserCard.id)
+        )).all()
+
+        cards: List[Dict] = [
+            {
+                "card_id": row.id,
+                "player_id": row.player_id,
+                "name": row.name,
+                "position": row.position.value,
+                "current_overall": row.current_overall,
+                "current_price": row.current_price,
+                "is_in_lineup": row.is_in_lineup
+            }
+            for row in rows
+        ]
+
+        return {
+            "id": team.id,
+            "name": team.name,
+            "user_id": team.user_id,
+            "overall_rating": team.overall_rating,
+            "total_fantasy_points": team.total_fantasy_points,
+            "active_formation": team.active_formation,
+            "cards": cards
+        }
@@ -0,0 +1,177 @@
+"""
+Calculadora de Puntos Fantasy por lotes (vectorizada)
+Puntúa una jornada completa de estadísticas en una sola pasada con NumPy
+"""
+
+import numpy as np
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from app.services.scoring_rules import (
+    POSITION_RULE_COLUMNS,
+    COMMON_RULE_COLUMNS
+)
+from app.services.scoring_plan import CompiledScoringPlan, compile_scoring_plan
+from app.services.calculator import calculator
+from app.models.models import Position
+
+
+# Código numérico de cada posición (fila de la matriz de pesos)
+POSITION_CODES = {
+    Position.GK: 0,
+    Position.DEF: 1,
+    Position.MID: 2,
+    Position.FWD: 3,
+}
+
+# Columnas con peso lineal (orden de las columnas de la matriz de pesos)
+WEIGHT_COLUMNS = tuple(dict.fromkeys(
+    list(POSITION_RULE_COLUMNS.values()) + list(COMMON_RULE_COLUMNS.values())
+))
+
+# Columnas de PlayerMatchStats que necesita la calculadora
+STAT_COLUMNS = ("minutes_played", "rating") + WEIGHT_COLUMNS
+
+
+class BatchPointsCalculator:
+    """
+    Calculadora de puntos Fantasy para lotes de estadísticas
+
+    Vuelca un CompiledScoringPlan en arrays de NumPy:
+    - Una matriz de pesos (posición x columna)
+    - Una tabla de umbrales de minutos
+    - Una tabla de umbrales de nota
+
+    Da los mismos resultados que FantasyPointsCalculator.calculate_total_points
+
+    Con `source` (una FantasyPointsCalculator) sigue el plan de esa
+    calculadora: si sus reglas cambian (scoring_rules o reload_rules), los
+    arrays se reconstruyen en el siguiente cálculo
+    """
+
+    def __init__(self, rules: Optional[dict] = None, plan: Optional[CompiledScoringPlan] = None,
+                 source=None):
+        self.source = source
+        if source is not None:
+            plan = source.plan
+        self._load_plan(plan or compile_scoring_plan(rules))
+
+    def _load_plan(self, plan: CompiledScoringPlan):
+        self.plan = plan
+        self.weight_columns, self.weights = self._compile_weights(plan)
+        self.minutes_thresholds = np.array(plan.minutes_thresholds, dtype=np.float64)
+        self.minutes_points = np.array(plan.minutes_points, dtype=np.float64)
+        self.rating_thresholds = np.array(plan.rating_thresholds, dtype=np.float64)
+        self.rating_points = np.array(plan.rating_points, dtype=np.float64)
+
+    def _sync_with_source(self):
+        """Reconstruye los arrays si la calculadora de origen ha cambiado de plan"""
+        if self.source is not None and self.source.plan is not self.plan:
+            self._load_plan(self.source.plan)
+
+    @staticmethod
+    def _compile_weights(plan: CompiledScoringPlan):
+        """
+        Convierte los términos del plan en una matriz de pesos (4 posiciones x N columnas)
+
+        Returns:
+            tuple: (lista de columnas, matriz de pesos)
+        """
+        columns = list(WEIGHT_COLUMNS)
+        column_index = {column: i for i, column in enumerate(columns)}
+        weights = np.zeros((len(POSITION_CODES), len(columns)), dtype=np.float64)
+
+        for position, code in POSITION_CODES.items():
+            for column, weight in plan.total_terms[position]:
+                weights[code, column_index[column]] = weight
+
+        return columns, weights
+
+    def calculate_points(self, columns: Mapping[str, np.ndarray], position_codes: np.ndarray) -> np.ndarray:
+        """
+        Calcula los puntos Fantasy de todas las filas en una sola pasada
+
+        Args:
+            columns: Diccionario columna -> array con un valor por fila
+                     (ver STAT_COLUMNS; rating puede contener NaN si no hay nota)
+            position_codes: Array con el código de posición de cada fila (POSITION_CODES)
+
+        Returns:
+            np.ndarray: Puntos Fantasy de cada fila (nunca negativos)
+        """
+        self._sync_with_source()
+        position_codes = np.asarray(position_codes, dtype=np.intp)
+
+        # 1. Puntos por minutos jugados (umbral más alto alcanzado)
+        minutes = np.asarray(columns["minutes_played"], dtype=np.float64)
+        minutes_points = self.minutes_points[
+            np.searchsorted(self.minutes_thresholds, minutes, side="right")
+        ]
+
+        # 2. Puntos por nota (sin nota = 0 puntos)
+        ratings = np.nan_to_num(np.asarray(columns["rating"], dtype=np.float64), nan=0.0)
+        rating_points = self.rating_points[
+            np.searchsorted(self.rating_thresholds, ratings, side="right")
+        ]
+
+        # 3. Acciones de posición + penalizaciones: matriz x pesos
+        stats_matrix = np.column_stack([
+            np.asarray(columns[column], dtype=np.float64) for column in self.weight_columns
+        ])
+        points_by_position = stats_matrix @ self.weights.T
+        linear_points = np.take_along_axis(
+            points_by_position, position_codes[:, np.newaxis], axis=1
+        )[:, 0]
+
+        total = minutes_points + rating_points + linear_points
+
+        # Los puntos no pueden ser negativos
+        return np.maximum(total, 0.0)
+
+    def calculate_for_rows(self, rows: Iterable, positions: Iterable[Position]) -> np.ndarray:
+        """
+        Atajo para puntuar objetos PlayerMatchStats (o filas con los mismos atributos)
+
+        Args:
+            rows: Estadísticas de los jugadores
+            positions: Posición de cada fila, en el mismo orden
+
+        Returns:
+            np.ndarray: Puntos Fantasy de cada fila
+        """
+        rows = list(rows)
+        return self.calculate_points(stats_to_columns(rows), position_codes(positions))
+
+
+def stats_to_columns(rows: Sequence) -> Dict[str, np.ndarray]:
+    """
+    Convierte una lista de filas (ORM o Row de SQLAlchemy) en arrays por columna
+
+    Los valores None se tratan como 0, salvo rating que pasa a NaN (sin nota)
+    """
+    columns = {}
+    for column in STAT_COLUMNS:
+        values: List = [getattr(row, column) for row in rows]
+        if column == "rating":
+            columns[column] = np.array(
+                [value if value is not None else np.nan for value in values], dtype=np.float64
+            )
+        else:
+            columns[column] = np.array(
+                [value or 0 for value in values], dtype=np.float64
+            )
+    return columns
+
+
+def position_codes(positions: Iterable[Position]) -> np.ndarray:
+    """
+    Convierte posiciones (Enum Position o string "GK"/"DEF"/...) en códigos numéricos
+    """
+    return np.array(
+        [POSITION_CODES[p if isinstance(p, Position) else Position(p)] for p in positions],
+        dtype=np.intp
+    )
+
+
+# Instancia global de la calculadora por lotes: usa siempre las mismas reglas
+# que la calculadora escalar global (también tras reload_rules)
+batch_calculator = BatchPointsCalculator(source=calculator)
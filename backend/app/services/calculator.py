@@ -3,22 +3,41 @@ Calculadora de Puntos Fantasy
 Procesa las estadísticas de Sportmonks y calcula los puntos según las reglas
 """
 
-from app.services.scoring_rules import (
-    SCORING_RULES,
-    calcular_puntos_por_nota,
-    get_position_rules,
-    get_common_penalties
-)
+from app.services.scoring_rules import SCORING_RULES
+from app.services.scoring_plan import CompiledScoringPlan, compile_scoring_plan
 from app.models.models import PlayerMatchStats, Position
 
 
 class FantasyPointsCalculator:
     """
     Calculadora de puntos Fantasy basada en estadísticas reales
+    
+    Las reglas se compilan una vez en un CompiledScoringPlan; el plan
+    solo se reconstruye cuando cambian las reglas (asignando scoring_rules
+    o llamando a reload_rules tras modificarlas en el sitio)
     """
     
-    def __init__(self):
-        self.scoring_rules = SCORING_RULES
+    def __init__(self, rules: dict = None):
+        self.scoring_rules = rules or SCORING_RULES
+    
+    @property
+    def scoring_rules(self) -> dict:
+        return self._scoring_rules
+    
+    @scoring_rules.setter
+    def scoring_rules(self, rules: dict):
+        self._scoring_rules = rules
+        self.plan = compile_scoring_plan(rules)
+    
+    def reload_rules(self) -> CompiledScoringPlan:
+        """
+        Recompila el plan tras modificar el diccionario de reglas en el sitio
+        
+        Returns:
+            CompiledScoringPlan: Nuevo plan en uso
+        """
+        self.plan = compile_scoring_plan(self._scoring_rules)
+        return self.plan
     
     def calculate_minutes_points(self, minutes_played: int) -> float:
         """
@@ -30,10 +49,7 @@ class FantasyPointsCalculator:
         Returns:
             float: Puntos obtenidos por minutos
         """
-        for threshold, points in SCORING_RULES["MINUTES_PLAYED"]:
-            if minutes_played >= threshold:
-                return points
-        return 0
+        return self.plan.minutes_to_points(minutes_played)
     
     def calculate_common_penalties(self, stats: PlayerMatchStats) -> float:
         """
@@ -45,27 +61,7 @@ class FantasyPointsCalculator:
         Returns:
             float: Puntos negativos totales
         """
-        penalties = 0.0
-        
-        # Tarjetas amarillas
-        penalties += stats.yellow_cards * SCORING_RULES["YELLOWCARDS"]
-        
-        # Tarjetas rojas
-        penalties += stats.red_cards * SCORING_RULES["RED_CARD"]
-        
-        # Goles en propia puerta
-        penalties += stats.own_goals * SCORING_RULES["OWN_GOALS"]
-        
-        # Penaltis fallados
-        penalties += stats.penalties_missed * SCORING_RULES["PENALTIES_MISSED"]
-        
-        # Pérdidas de balón
-        penalties += stats.dispossessed * SCORING_RULES["DISPOSSESSED"]
-        
-        # Goles en contra (afecta poco a todos)
-        penalties += stats.goals_conceded * SCORING_RULES["GOALS_AGAINST"]
-        
-        return penalties
+        return self._apply_terms(stats, self.plan.penalty_terms)
     
     def calculate_position_points(self, stats: PlayerMatchStats, position: Position) -> float:
         """
@@ -78,60 +74,7 @@ class FantasyPointsCalculator:
         Returns:
             float: Puntos obtenidos por acciones específicas de la posición
         """
-        position_key = position.value  # Convierte Enum a string
-        rules = get_position_rules(position_key)
-        
-        points = 0.0
-        
-        # Goles
-        if "GOALS" in rules:
-            points += stats.goals * rules["GOALS"]
-        
-        # Asistencias
-        if "ASSISTS" in rules:
-            points += stats.assists * rules["ASSISTS"]
-        
-        # Portería a cero (Clean Sheet)
-        if "CLEAN_SHEET" in rules and stats.clean_sheet:
-            points += rules["CLEAN_SHEET"]
-        
-        # Paradas (solo porteros)
-        if "SAVES" in rules:
-            points += stats.saves * rules["SAVES"]
-        
-        # Penaltis parados
-        if "PENALTIES_SAVED" in rules:
-            points += stats.penalties_saved * rules["PENALTIES_SAVED"]
-        
-        # Despejes efectivos
-        if "EFFECTIVE_CLEARANCES" in rules:
-            points += stats.effective_clearances * rules["EFFECTIVE_CLEARANCES"]
-        
-        # Recuperaciones
-        if "BALL_RECOVERY" in rules:
-            points += stats.ball_recoveries * rules["BALL_RECOVERY"]
-        
-        # Penaltis provocados
-        if "PENALTIES_WON" in rules:
-            points += stats.penalties_won * rules["PENALTIES_WON"]
-        
-        # Tiros a puerta
-        if "SHOTS_ON_TARGET" in rules:
-            points += stats.shots_on_target * rules["SHOTS_ON_TARGET"]
-        
-        # Regates exitosos
-        if "SUCCESSFUL_DRIBBLES" in rules:
-            points += stats.successful_dribbles * rules["SUCCESSFUL_DRIBBLES"]
-        
-        # Centros precisos
-        if "ACCURATE_CROSSES" in rules:
-            points += stats.accurate_crosses * rules["ACCURATE_CROSSES"]
-        
-        # Penalización especial para porteros (goles en contra)
-        if position_key == "GK" and "GOALS_AGAINST" in rules:
-            points += stats.goals_conceded * rules["GOALS_AGAINST"]
-        
-        return points
+        return self._apply_terms(stats, self.plan.position_terms[position])
     
     def calculate_total_points(self, stats: PlayerMatchStats, position: Position) -> float:
         """
@@ -144,24 +87,28 @@ class FantasyPointsCalculator:
         Returns:
             float: Total de puntos Fantasy
         """
-        # 1. Puntos base por minutos jugados
-        minutes_points = self.calculate_minutes_points(stats.minutes_played)
+        plan = self.plan
         
+        # 1. Puntos base por minutos jugados
         # 2. Puntos por la nota del partido
-        rating_points = calcular_puntos_por_nota(stats.rating) if stats.rating else 0
-        
-        # 3. Puntos específicos de la posición
-        position_points = self.calculate_position_points(stats, position)
+        total = plan.minutes_to_points(stats.minutes_played) + plan.rating_to_points(stats.rating)
         
-        # 4. Penalizaciones comunes
-        penalty_points = self.calculate_common_penalties(stats)
-        
-        # Total
-        total = minutes_points + rating_points + position_points + penalty_points
+        # 3 + 4. Acciones de la posición y penalizaciones comunes (pesos ya fusionados)
+        total += self._apply_terms(stats, plan.total_terms[position])
         
         # Los puntos no pueden ser negativos
         return max(0, total)
     
+    @staticmethod
+    def _apply_terms(stats: PlayerMatchStats, terms) -> float:
+        """Suma atributo * peso para cada término del plan"""
+        points = 0.0
+        for attribute, weight in terms:
+            value = getattr(stats, attribute)
+            if value:
+                points += value * weight
+        return points
+    
     def get_points_breakdown(self, stats: PlayerMatchStats, position: Position) -> dict:
         """
         Devuelve un desglose detallado de los puntos
@@ -176,7 +123,7 @@ class FantasyPointsCalculator:
         """
         return {
             "minutes": self.calculate_minutes_points(stats.minutes_played),
-            "rating": calcular_puntos_por_nota(stats.rating) if stats.rating else 0,
+            "rating": self.plan.rating_to_points(stats.rating),
             "position_specific": self.calculate_position_points(stats, position),
             "penalties": self.calculate_common_penalties(stats),
             "total": self.calculate_total_points(stats, position)
@@ -3,12 +3,14 @@ Sistema de Economía con Inercia de Precios
 Gestiona la fluctuación gradual de precios basada en rendimiento
 """
 
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from typing import Dict, Optional
-from app.models.models import Player, PlayerMatchStats, UserCard
-from app.services.calculator import calculator
-from app.models.models import Position
+from typing import Dict, List, Optional
+from app.core.cache import publish_players_changed
+from app.models.models import Player, PlayerForm, Position
+from app.services.price_history import PriceHistoryService
+from app.services.market_snapshot import MarketSnapshotBuilder, MarketSnapshotService
 
 
 class PriceInertiaSystem:
@@ -19,6 +21,10 @@ class PriceInertiaSystem:
     - Los fines de semana (tras partidos): Se calcula un PRECIO OBJETIVO basado en rendimiento
     - Durante la semana: El precio actual se mueve GRADUALMENTE hacia el objetivo
     - Esto evita volatilidad extrema y crea un mercado más realista
+
+    Única definición del precio objetivo: _compose_target_price (OVR, forma,
+    posición y edad). Player.target_price guarda el último calculado, tanto
+    en el job de fin de semana como en cada paso de inercia
     """
     
     def __init__(self, db: Session):
@@ -28,7 +34,7 @@ class PriceInertiaSystem:
         self.MIN_PRICE = 50000.0  # Precio mínimo: 50k
         self.MAX_PRICE = 20000000.0  # Precio máximo: 20M
     
-    def calculate_target_price(self, player_id: int, weeks: int = 4) -> float:
+    def calculate_target_price(self, player_id: int) -> float:
         """
         Calcula el precio OBJETIVO basado en rendimiento reciente
         
@@ -36,7 +42,6 @@ class PriceInertiaSystem:
         
         Args:
             player_id: ID del jugador
-            weeks: Semanas de historial a considerar
             
         Returns:
             float: Precio objetivo calculado
@@ -45,19 +50,41 @@ class PriceInertiaSystem:
         
         if not player or player.is_legend:
             # Las leyendas tienen precio fijo
-            return player.base_market_value if player else self.MIN_PRICE
+            return player.current_price if player else self.MIN_PRICE
+        
+        # Factor de rendimiento (últimas jornadas)
+        performance_multiplier = self._calculate_performance_multiplier(player_id)
         
+        return self._compose_target_price(
+            player.overall_rating,
+            player.position,
+            player.age,
+            player.potential,
+            performance_multiplier
+        )
+    
+    def _compose_target_price(
+        self,
+        ovr: int,
+        position: Position,
+        age: int,
+        potential: int,
+        performance_multiplier: float
+    ) -> float:
+        """
+        Combina los factores del precio objetivo
+        (compartido por el cálculo individual y el masivo)
+        """
         # 1. Precio base según OVR
-        base_price = self._calculate_base_price_by_ovr(player.overall_rating)
+        base_price = self._calculate_base_price_by_ovr(ovr)
         
-        # 2. Factor de rendimiento (últimas semanas)
-        performance_multiplier = self._calculate_performance_multiplier(player_id, weeks)
+        # 2. Factor de rendimiento: performance_multiplier
         
         # 3. Factor de posición (algunas posiciones son más valiosas)
-        position_multiplier = self._get_position_multiplier(player.position)
+        position_multiplier = self._get_position_multiplier(position)
         
         # 4. Factor de edad (jóvenes con potencial son más caros)
-        age_multiplier = self._calculate_age_multiplier(player.age, player.potential)
+        age_multiplier = self._calculate_age_multiplier(age, potential)
         
         # Calcular precio target
         target_price = base_price * performance_multiplier * position_multiplier * age_multiplier
@@ -92,32 +119,32 @@ class PriceInertiaSystem:
         else:
             return 50000 + (ovr - 50) * 7500
     
-    def _calculate_performance_multiplier(self, player_id: int, weeks: int) -> float:
+    def _calculate_performance_multiplier(self, player_id: int) -> float:
         """
         Multiplicador basado en rendimiento reciente
         
-        Analiza los puntos Fantasy de las últimas semanas
+        Lee la media de puntos Fantasy de las últimas jornadas de player_form
+        (un registro por jugador, ver PlayerFormService)
         
         Returns:
             float: Multiplicador entre 0.5 (muy mal) y 2.0 (excelente)
         """
-        cutoff_date = datetime.utcnow() - timedelta(weeks=weeks)
-        
-        recent_stats = (
-            self.db.query(PlayerMatchStats)
-            .filter(
-                PlayerMatchStats.player_id == player_id,
-                PlayerMatchStats.created_at >= cutoff_date,
-                PlayerMatchStats.minutes_played > 0
-            )
-            .all()
-        )
+        form = self.db.get(PlayerForm, player_id)
         
-        if not recent_stats:
+        if not form or not form.matches_played:
             return 1.0  # Sin datos = neutral
         
-        # Calcular promedio de puntos Fantasy
-        avg_fantasy_points = sum(s.fantasy_points for s in recent_stats) / len(recent_stats)
+        return self._performance_multiplier_from_average(form.average_fantasy_points)
+    
+    def _performance_multiplier_from_average(self, avg_fantasy_points: Optional[float]) -> float:
+        """
+        Convierte la media de puntos Fantasy reciente en multiplicador
+        
+        Args:
+            avg_fantasy_points: Media de puntos (None = sin partidos recientes)
+        """
+        if avg_fantasy_points is None:
+            return 1.0  # Sin datos = neutral
         
         # Convertir puntos en multiplicador
         if avg_fantasy_points >= 10:
@@ -193,14 +220,32 @@ class PriceInertiaSystem:
         
         if not player or player.is_legend:
             return {
-                "old_price": player.base_market_value if player else 0,
-                "new_price": player.base_market_value if player else 0,
-                "target_price": player.base_market_value if player else 0
+                "old_price": player.current_price if player else 0,
+                "new_price": player.current_price if player else 0,
+                "target_price": player.current_price if player else 0
             }
         
-        old_price = player.base_market_value
+        old_price = player.current_price
         target_price = self.calculate_target_price(player_id)
         
+        new_price = self._move_towards_target(old_price, target_price)
+        
+        # Actualizar en BD
+        # (las cartas de usuarios leen el precio de Player.current_price; el
+        # target guardado es siempre el que persigue la inercia)
+        player.current_price = new_price
+        player.target_price = target_price
+        PriceHistoryService(self.db).record_day({player_id: new_price})
+        self.db.commit()
+        publish_players_changed([player_id])
+        
+        return self._movement(old_price, new_price, target_price)
+    
+    def _move_towards_target(self, old_price: float, target_price: float) -> float:
+        """
+        Un paso de inercia: el precio recorre DAILY_MOVEMENT_PERCENTAGE
+        de la distancia hasta el target
+        """
         # Calcular diferencia
         difference = target_price - old_price
         
@@ -210,15 +255,11 @@ class PriceInertiaSystem:
         
         # Asegurar límites
         new_price = max(self.MIN_PRICE, min(self.MAX_PRICE, new_price))
-        new_price = round(new_price, 2)
-        
-        # Actualizar en BD
-        player.base_market_value = new_price
-        self.db.commit()
-        
-        # También actualizar cartas de usuarios
-        self._update_user_cards_price(player_id, new_price)
-        
+        return round(new_price, 2)
+    
+    @staticmethod
+    def _movement(old_price: float, new_price: float, target_price: float) -> Dict[str, float]:
+        """Resumen del movimiento de precio de un jugador"""
         return {
             "old_price": old_price,
             "new_price": new_price,
@@ -227,6 +268,100 @@ class PriceInertiaSystem:
             "movement_percentage": ((new_price - old_price) / old_price * 100) if old_price > 0 else 0
         }
     
+    def apply_daily_inertia_all(self, dry_run: bool = False, chunk_size: int = 1000,
+                                snapshot: Optional[MarketSnapshotBuilder] = None) -> List[Dict]:
+        """
+        Aplica la inercia diaria a TODOS los jugadores (no leyendas) por conjuntos
+        
+        Mismo resultado que llamar a apply_daily_inertia jugador a jugador, pero con:
+        - 1 consulta con los datos de los jugadores y su forma (player_form)
+        - UPDATEs masivos de current_price (y del target_price que persigue)
+          en una sola transacción
+        
+        Args:
+            dry_run: Si es True calcula los movimientos pero no escribe nada
+            chunk_size: Filas por UPDATE masivo
+            snapshot: Si se indica, se alimenta con cada movimiento en la misma
+                      pasada y se guarda como foto del mercado del día
+            
+        Returns:
+            list: Un dict por jugador con player_id, name, position y el movimiento
+                  (old_price, new_price, target_price, movement, movement_percentage)
+        """
+        # 1. Solo las columnas necesarias de los jugadores activos + su forma reciente
+        players = self.db.execute(
+            select(
+                Player.id,
+                Player.name,
+                Player.position,
+                Player.overall_rating,
+                Player.age,
+                Player.potential,
+                Player.current_price,
+                Player.base_rarity,
+                PlayerForm.matches_played,
+                PlayerForm.sum_fantasy_points
+            )
+            .outerjoin(PlayerForm, PlayerForm.player_id == Player.id)
+            .where(Player.is_legend == False)
+            .order_by(Player.id)
+        ).all()
+        
+        # 2. Precio objetivo y nuevo precio en memoria
+        movements = []
+        for player in players:
+            avg_points = (
+                player.sum_fantasy_points / player.matches_played
+                if player.matches_played else None
+            )
+            target_price = self._compose_target_price(
+                player.overall_rating,
+                player.position,
+                player.age,
+                player.potential,
+                self._performance_multiplier_from_average(avg_points)
+            )
+            new_price = self._move_towards_target(player.current_price, target_price)
+            
+            movement = self._movement(player.current_price, new_price, target_price)
+            movement.update(
+                player_id=player.id,
+                name=player.name,
+                position=player.position.value
+            )
+            movements.append(movement)
+            
+            if snapshot is not None:
+                snapshot.add(movement, player.base_rarity.value)
+        
+        if snapshot is not None:
+            MarketSnapshotService(self.db).add_legends(snapshot)
+        
+        if dry_run:
+            return movements
+        
+        # 3. Escritura masiva (las cartas leen el precio de Player.current_price;
+        # el target guardado es siempre el que persigue la inercia)
+        for start in range(0, len(movements), chunk_size):
+            self.db.execute(
+                update(Player),
+                [
+                    {"id": m["player_id"], "current_price": m["new_price"], "target_price": m["target_price"]}
+                    for m in movements[start:start + chunk_size]
+                ]
+            )
+        
+        # 4. Foto del día en el histórico (misma transacción)
+        PriceHistoryService(self.db).record_day(
+            {m["player_id"]: m["new_price"] for m in movements}, chunk_size=chunk_size
+        )
+        if snapshot is not None:
+            MarketSnapshotService(self.db).save(snapshot)
+        self.db.commit()
+        publish_players_changed([m["player_id"] for m in movements])
+        
+        return movements
+    
     def set_target_price(self, player_id: int) -> Dict[str, float]:
         """
         Establece el precio target tras un partido
@@ -244,7 +379,7 @@ class PriceInertiaSystem:
         if not player:
             return {"old_target": 0, "new_target": 0}
         
-        old_target = player.base_market_value
+        old_target = player.target_price
         new_target = self.calculate_target_price(player_id)
         
         # Guardar el target (en este caso, lo guardamos directamente en base_market_value)
@@ -257,29 +392,80 @@ class PriceInertiaSystem:
             "change_percentage": ((new_target - old_target) / old_target * 100) if old_target > 0 else 0
         }
     
-    def _update_user_cards_price(self, player_id: int, new_price: float):
+    def set_target_prices(self, player_ids: List[int], chunk_size: int = 1000) -> List[Dict]:
         """
-        Actualiza el precio en todas las cartas de usuarios
+        Calcula y GUARDA el precio objetivo de varios jugadores (no leyendas)
+        por conjuntos: 1 consulta por lote con los jugadores y su forma
+        (player_form) y un UPDATE masivo de target_price por lote (sin
+        commit: va en la transacción del job de fin de semana)
         
         Args:
-            player_id: ID del jugador
-            new_price: Nuevo precio de mercado
+            player_ids: IDs de los jugadores
+            chunk_size: IDs por consulta IN
+            
+        Returns:
+            list: Un dict por jugador con player_id, name y el resultado de
+                  set_target_price (old_target, new_target, change, change_percentage)
         """
-        user_cards = (
-            self.db.query(UserCard)
-            .filter(UserCard.player_id == player_id)
-            .all()
-        )
-        
-        for card in user_cards:
-            card.current_market_value = new_price
-        
-        self.db.commit()
+        player_ids = list(player_ids)
+        results = []
+        for start in range(0, len(player_ids), chunk_size):
+            players = self.db.execute(
+                select(
+                    Player.id,
+                    Player.name,
+                    Player.position,
+                    Player.overall_rating,
+                    Player.age,
+                    Player.potential,
+                    Player.target_price,
+                    PlayerForm.matches_played,
+                    PlayerForm.sum_fantasy_points
+                )
+                .outerjoin(PlayerForm, PlayerForm.player_id == Player.id)
+                .where(Player.id.in_(player_ids[start:start + chunk_size]), Player.is_legend == False)
+                .order_by(Player.id)
+            ).all()
+            
+            chunk_results = []
+            for player in players:
+                avg_points = (
+                    player.sum_fantasy_points / player.matches_played
+                    if player.matches_played else None
+                )
+                old_target = player.target_price
+                new_target = self._compose_target_price(
+                    player.overall_rating,
+                    player.position,
+                    player.age,
+                    player.potential,
+                    self._performance_multiplier_from_average(avg_points)
+                )
+                chunk_results.append({
+                    "player_id": player.id,
+                    "name": player.name,
+                    "old_target": old_target,
+                    "new_target": new_target,
+                    "change": new_target - old_target,
+                    "change_percentage": ((new_target - old_target) / old_target * 100) if old_target > 0 else 0
+                })
+            
+            if chunk_results:
+                self.db.execute(
+                    update(Player),
+                    [{"id": r["player_id"], "target_price": r["new_target"]} for r in chunk_results]
+                )
+            results.extend(chunk_results)
+        
+        return results
     
     def get_price_trend(self, player_id: int, days: int = 7) -> Dict:
         """
         Analiza la tendencia de precio (útil para mostrar gráficas)
         
+        Compara el primer y el último precio del histórico en los últimos
+        `days` días (player_price_history)
+        
         Args:
             player_id: ID del jugador
             days: Días a analizar
@@ -287,33 +473,30 @@ class PriceInertiaSystem:
         Returns:
             dict: Información de tendencia
         """
-        player = self.db.query(Player).filter(Player.id == player_id).first()
+        end = date.today()
+        stats = PriceHistoryService(self.db).range_stats(player_id, end - timedelta(days=days), end)
         
-        if not player:
+        if stats["change_percentage"] is None or stats["days"] < 2:
             return {"trend": "unknown", "percentage": 0}
         
-        # Aquí podrías consultar un historial de precios si lo guardas
-        # Por ahora, calculamos basándonos en el objetivo vs actual
+        change_percentage = stats["change_percentage"]
         
-        current_price = player.base_market_value
-        target_price = self.calculate_target_price(player_id)
-        
-        difference_percentage = ((target_price - current_price) / current_price * 100) if current_price > 0 else 0
-        
-        if difference_percentage > 10:
+        if change_percentage > 10:
             trend = "rising_fast"
-        elif difference_percentage > 3:
+        elif change_percentage > 3:
             trend = "rising"
-        elif difference_percentage < -10:
+        elif change_percentage < -10:
             trend = "falling_fast"
-        elif difference_percentage < -3:
+        elif change_percentage < -3:
             trend = "falling"
         else:
             trend = "stable"
         
         return {
             "trend": trend,
-            "current_price": current_price,
-            "target_price": target_price,
-            "difference_percentage": round(difference_percentage, 2)
+            "percentage": change_percentage,
+            "start_price": stats["first"],
+            "current_price": stats["last"],
+            "min_price": stats["min"],
+            "max_price": stats["max"]
         }
@@ -0,0 +1,98 @@
+"""
+Recálculo de Puntos por Jornada
+Puntúa todas las estadísticas de una jornada con consultas por conjuntos:
+una SELECT con la posición del jugador y UPDATEs masivos por bloques
+"""
+
+import heapq
+from typing import Dict, List
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.models import Player, PlayerMatchStats, Match
+from app.services.batch_calculator import (
+    STAT_COLUMNS,
+    batch_calculator,
+    stats_to_columns,
+    position_codes
+)
+
+
+class GameweekScorer:
+    """
+    Recalcula PlayerMatchStats.fantasy_points de una jornada completa
+
+    En lugar de una consulta por jugador (N+1), carga todas las filas de la
+    jornada junto a Player.position de una vez, las puntúa con la
+    calculadora por lotes y escribe los puntos con UPDATEs masivos
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def load_gameweek_stats(self, gameweek_id: int) -> List:
+        """
+        Carga en una sola consulta las estadísticas de la jornada
+
+        Args:
+            gameweek_id: ID de la jornada
+
+        Returns:
+            list: Filas con id, player_id, nombre, posición y columnas de puntuación
+        """
+        query = (
+            select(
+                PlayerMatchStats.id,
+                PlayerMatchStats.player_id,
+                Player.name,
+                Player.position,
+                *[getattr(PlayerMatchStats, column) for column in STAT_COLUMNS]
+            )
+            .join(Player, Player.id == PlayerMatchStats.player_id)
+            .join(Match, Match.id == PlayerMatchStats.match_id)
+            .where(Match.gameweek_id == gameweek_id)
+            .order_by(PlayerMatchStats.id)
+        )
+        return self.db.execute(query).all()
+
+    def recompute_gameweek(self, gameweek_id: int) -> Dict:
+        """
+        Recalcula y guarda los puntos Fantasy de toda una jornada
+
+        Args:
+            gameweek_id: ID de la jornada
+
+        Returns:
+            dict: {"rows": int, "total_points": float, "top": [(nombre, posición, puntos), ...]}
+        """
+        rows = self.load_gameweek_stats(gameweek_id)
+
+        if not rows:
+            return {"rows": 0, "total_points": 0.0, "top": []}
+
+        points = batch_calculator.calculate_points(
+            stats_to_columns(rows),
+            position_codes(row.position for row in rows)
+        )
+
+        # UPDATE masivo por clave primaria (executemany) en bloques
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            self.db.execute(
+                update(PlayerMatchStats),
+                [
+                    {"id": row.id, "fantasy_points": float(value)}
+                    for row, value in zip(chunk, points[start:start + self.chunk_size])
+                ]
+            )
+
+        self.db.commit()
+
+        ranking = heapq.nlargest(10, zip(rows, points), key=lambda item: item[1])
+
+        return {
+            "rows": len(rows),
+            "total_points": float(points.sum()),
+            "top": [(row.name, row.position.value, float(value)) for row, value in ranking]
+        }
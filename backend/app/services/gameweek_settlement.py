@@ -0,0 +1,220 @@
+"""
+Liquidación de Jornada (team_gameweek_points)
+Pasa los puntos Fantasy de los jugadores a los equipos y usuarios al cerrar
+una jornada:
+- Lectura: una consulta por conjuntos para TODOS los equipos (cartas en la
+  alineación → stats de los partidos de la jornada, agrupado por equipo)
+- Escritura: una fila por equipo y jornada, y las diferencias a
+  Team.total_fantasy_points / User.total_points con UPDATE ... CASE por lotes
+
+El número de consultas depende del número de lotes, no de usuarios. Volver a
+liquidar una jornada es seguro: a los totales solo se suma la diferencia con
+la liquidación anterior. Las correcciones de stats re-liquidan solo los
+equipos afectados (apply_corrections) con la misma consulta
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import select, update, insert, delete, func, case
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    TeamGameweekPoints, Team, User, UserCard, PlayerMatchStats, Match, Gameweek
+)
+
+
+def lineup_points_query(gameweek_id: int, team_ids: Optional[Iterable[int]] = None):
+    """
+    (team_id, user_id, puntos) de los equipos en una jornada: suma de los
+    puntos Fantasy de las cartas de su alineación en los partidos de la
+    jornada (los equipos sin puntos salen con None)
+
+    Args:
+        gameweek_id: ID de la jornada
+        team_ids: Solo estos equipos (None = todos)
+    """
+    lineup = (
+        select(UserCard.team_id, func.sum(PlayerMatchStats.fantasy_points).label("points"))
+        .join(PlayerMatchStats, PlayerMatchStats.player_id == UserCard.player_id)
+        .join(Match, Match.id == PlayerMatchStats.match_id)
+        .where(Match.gameweek_id == gameweek_id, UserCard.is_in_lineup.is_(True))
+        .group_by(UserCard.team_id)
+    )
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        lineup = lineup.where(UserCard.team_id.in_(team_ids))
+    lineup = lineup.subquery()
+    query = (
+        select(Team.id, Team.user_id, lineup.c.points)
+        .outerjoin(lineup, lineup.c.team_id == Team.id)
+    )
+    if team_ids is not None:
+        query = query.where(Team.id.in_(team_ids))
+    return query
+
+
+class GameweekSettlementService:
+    """
+    Liquidación de puntos por jornada (sin commit: va en la transacción del
+    job de fin de semana)
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def team_points(self, gameweek_id: int, team_ids: Optional[Iterable[int]] = None) -> Dict[int, Tuple[int, int]]:
+        """{team_id: (user_id, puntos)} de la jornada (una consulta)"""
+        rows = self.db.execute(lineup_points_query(gameweek_id, team_ids)).all()
+        return {team_id: (user_id, round(points or 0)) for team_id, user_id, points in rows}
+
+    def settled_points(self, gameweek_id: int, team_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """{team_id: puntos} ya liquidados de la jornada (vacío si no se ha liquidado)"""
+        query = (
+            select(TeamGameweekPoints.team_id, TeamGameweekPoints.points)
+            .where(TeamGameweekPoints.gameweek_id == gameweek_id)
+        )
+        if team_ids is not None:
+            query = query.where(TeamGameweekPoints.team_id.in_(list(team_ids)))
+        return dict(self.db.execute(query).all())
+
+    def is_settled(self, gameweek_id: int) -> bool:
+        return self.db.scalar(
+            select(TeamGameweekPoints.team_id)
+            .where(TeamGameweekPoints.gameweek_id == gameweek_id)
+            .limit(1)
+        ) is not None
+
+    def settle(self, gameweek: Gameweek, update_totals: bool = True) -> Dict:
+        """
+        Liquida una jornada: guarda los puntos de cada equipo y suma a los
+        totales de equipos y usuarios la diferencia con la liquidación anterior
+
+        Args:
+            gameweek: Jornada a liquidar
+            update_totals: Si es False solo se guardan las filas de la jornada
+                           (p. ej. al registrar jornadas antiguas ya sumadas)
+
+        Returns:
+            dict: Resumen {"gameweek", "teams", "teams_changed", "total_points",
+                  "user_points" ({user_id: puntos de la jornada})}
+        """
+        points = self.team_points(gameweek.id)
+        team_deltas = self._team_deltas(points, self.settled_points(gameweek.id))
+        if update_totals:
+            self._add_team_and_user_totals(points, team_deltas)
+
+        self._replace_rows(gameweek.id, points)
+
+        return {
+            "gameweek": gameweek.number,
+            "teams": len(points),
+            "teams_changed": len(team_deltas),
+            "total_points": sum(team_points for _, team_points in points.values()),
+            "user_points": {user_id: team_points for user_id, team_points in points.values()}
+        }
+
+    def apply_corrections(self, gameweek_id: int,
+                          team_ids: Iterable[int]) -> Optional[Tuple[Dict[int, int], Dict[int, int]]]:
+        """
+        Re-liquida los equipos afectados por una corrección de stats en una
+        jornada ya liquidada: recalcula sus filas con lineup_points_query y
+        suma a los totales la diferencia entre la fila nueva y la guardada
+        (los totales siguen siendo la suma de las filas, sin errores de
+        redondeo acumulados corrección tras corrección)
+
+        Args:
+            gameweek_id: Jornada del partido corregido
+            team_ids: Equipos con alguno de los jugadores corregidos en la alineación
+
+        Returns:
+            tuple | None: ({team_id: delta}, {user_id: delta}) aplicados, o None
+                          si la jornada no está liquidada (la liquidación ya
+                          incluirá los puntos corregidos)
+        """
+        if not self.is_settled(gameweek_id):
+            return None
+
+        team_ids = list(dict.fromkeys(team_ids))
+        team_deltas: Dict[int, int] = {}
+        user_deltas: Dict[int, int] = {}
+        for start in range(0, len(team_ids), self.chunk_size):
+            chunk = team_ids[start:start + self.chunk_size]
+            points = self.team_points(gameweek_id, chunk)
+            previous = self.settled_points(gameweek_id, chunk)
+            deltas = self._team_deltas(points, previous)
+            if not deltas:
+                continue
+
+            user_deltas.update(self._add_team_and_user_totals(points, deltas))
+            team_deltas.update(deltas)
+
+            # Filas existentes: nuevo valor con un UPDATE ... CASE; equipos sin
+            # fila (creados tras la liquidación): INSERT
+            updated = {team_id: points[team_id][1] for team_id in deltas if team_id in previous}
+            if updated:
+                self.db.execute(
+                    update(TeamGameweekPoints)
+                    .where(
+                        TeamGameweekPoints.gameweek_id == gameweek_id,
+                        TeamGameweekPoints.team_id.in_(list(updated))
+                    )
+                    .values(points=case(updated, value=TeamGameweekPoints.team_id))
+                    .execution_options(synchronize_session=False)
+                )
+            added = [team_id for team_id in deltas if team_id not in previous]
+            if added:
+                self.db.execute(insert(TeamGameweekPoints), [
+                    {
+                        "gameweek_id": gameweek_id, "team_id": team_id, "user_id": points[team_id][0],
+                        "points": points[team_id][1], "settled_at": datetime.utcnow()
+                    }
+                    for team_id in added
+                ])
+
+        return team_deltas, user_deltas
+
+    @staticmethod
+    def _team_deltas(points: Mapping[int, Tuple[int, int]], previous: Mapping[int, int]) -> Dict[int, int]:
+        """{team_id: puntos nuevos - liquidados} de los equipos que cambian"""
+        return {
+            team_id: team_points - previous.get(team_id, 0)
+            for team_id, (_, team_points) in points.items()
+            if team_points != previous.get(team_id, 0)
+        }
+
+    def _add_team_and_user_totals(self, points: Mapping[int, Tuple[int, int]],
+                                  team_deltas: Mapping[int, int]) -> Dict[int, int]:
+        """Suma las diferencias a Team y User; devuelve {user_id: delta}"""
+        user_deltas = {points[team_id][0]: delta for team_id, delta in team_deltas.items()}
+        self._add_totals(Team, Team.total_fantasy_points, team_deltas)
+        self._add_totals(User, User.total_points, user_deltas)
+        return user_deltas
+
+    def _add_totals(self, model, column, deltas: Mapping[int, int]):
+        """column += delta por id, con un UPDATE ... CASE por lote"""
+        items = list(deltas.items())
+        for start in range(0, len(items), self.chunk_size):
+            chunk = dict(items[start:start + self.chunk_size])
+            self.db.execute(
+                update(model)
+                .where(model.id.in_(list(chunk)))
+                .values({column: func.coalesce(column, 0) + case(chunk, value=model.id, else_=0)})
+                .execution_options(synchronize_session=False)
+            )
+
+    def _replace_rows(self, gameweek_id: int, points: Mapping[int, Tuple[int, int]]):
+        """Sustituye las filas de la jornada (DELETE por rango de la PK + INSERT por lotes)"""
+        self.db.execute(delete(TeamGameweekPoints).where(TeamGameweekPoints.gameweek_id == gameweek_id))
+
+        settled_at = datetime.utcnow()
+        rows = [
+            {
+                "gameweek_id": gameweek_id, "team_id": team_id, "user_id": user_id,
+                "points": team_points, "settled_at": settled_at
+            }
+            for team_id, (user_id, team_points) in points.items()
+        ]
+        for start in range(0, len(rows), self.chunk_size):
+            self.db.execute(insert(TeamGameweekPoints), rows[start:start + self.chunk_size])
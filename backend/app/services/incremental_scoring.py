@@ -0,0 +1,297 @@
+"""
+Recálculo Incremental de Puntos
+Aplica correcciones de estadísticas de un partido sin reconstruir la jornada:
+compara las stats nuevas con las guardadas, recalcula solo las filas que
+cambian y propaga la diferencia de puntos a los acumulados de jugadores,
+equipos y usuarios
+"""
+
+import math
+from types import SimpleNamespace
+from typing import Any, Dict, List, Mapping, Tuple
+from sqlalchemy import select, update, insert, case
+from sqlalchemy.orm import Session
+
+from app.core.cache import publish_players_changed
+from app.models.models import Player, PlayerMatchStats, UserCard, Team, Match, Gameweek
+from app.services.batch_calculator import (
+    STAT_COLUMNS,
+    batch_calculator,
+    stats_to_columns,
+    position_codes
+)
+from app.services.player_form import PlayerFormService
+from app.services.leaderboard import LeaderboardService, SEASON_SCOPE
+from app.services.gameweek_settlement import GameweekSettlementService
+
+
+# Columnas de estadísticas que se comparan al aplicar una corrección
+TRACKED_COLUMNS = (
+    "minutes_played", "rating",
+    "goals", "assists", "chances_created",
+    "clean_sheet", "goals_conceded", "goals_conceded_team", "saves", "clearances",
+    "penalty_miss", "penalty_save", "penalty_won", "penalty_committed",
+    "yellow_cards", "red_cards",
+    "shots_on_target", "dribbles", "crosses",
+    "ball_recoveries",
+    "dispossessed", "possession_lost", "turnovers", "total_losses",
+    "shots_total", "accurate_passes", "total_passes",
+    "tackles", "interceptions", "duels_won", "fouls",
+)
+
+# Tolerancia para comparar notas (FLOAT de MySQL no devuelve el valor exacto)
+RATING_TOLERANCE = 1e-3
+
+
+class IncrementalScoringService:
+    """
+    Aplica correcciones del proveedor a las estadísticas ya guardadas
+
+    Una corrección de un gol reasignado cuesta unas pocas filas:
+    - UPDATE de las PlayerMatchStats que cambian (puntos recalculados)
+    - Player.sum_fantasy_points / sum_match_ratings / total_matches_played += diferencia
+    - Equipos con el jugador en la alineación (cartas con is_in_lineup): su
+      fila de team_gameweek_points se recalcula y Team.total_fantasy_points /
+      User.total_points reciben la diferencia (GameweekSettlementService).
+      Solo si la jornada ya está liquidada: si no, la liquidación de fin de
+      semana sumará los puntos ya corregidos
+    - player_form, si la jornada del partido está dentro de la ventana
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_match_corrections(
+        self,
+        match_id: int,
+        new_stats: Mapping[int, Mapping[str, Any]],
+        dry_run: bool = False
+    ) -> Dict:
+        """
+        Compara las stats nuevas de un partido con las guardadas y aplica las diferencias
+
+        Args:
+            match_id: ID del partido
+            new_stats: {player_id: {columna: valor}} con las stats recién obtenidas
+                       (solo se comparan las columnas presentes en TRACKED_COLUMNS)
+            dry_run: Si es True, calcula las diferencias sin escribir nada
+
+        Returns:
+            dict: Resumen con filas comparadas/cambiadas/nuevas, diferencia total de
+                  puntos y los cambios por jugador [(player_id, puntos antes, después)]
+        """
+        stored = {row.player_id: row for row in self._load_match_rows(match_id)}
+        positions = self._load_positions(set(new_stats) - set(stored))
+
+        changed = []   # (fila guardada, valores nuevos)
+        inserted = []  # (player_id, posición, valores nuevos)
+
+        for player_id, values in new_stats.items():
+            values = {column: value for column, value in values.items() if column in TRACKED_COLUMNS}
+
+            row = stored.get(player_id)
+            if row is None:
+                # Jugador nuevo en el partido (solo si disputó minutos)
+                if player_id in positions and values.get("minutes_played"):
+                    inserted.append((player_id, positions[player_id], values))
+                continue
+
+            diff = {
+                column: value for column, value in values.items()
+                if not self._same_value(column, getattr(row, column), value)
+            }
+            if diff:
+                changed.append((row, diff))
+
+        if not changed and not inserted:
+            return self._summary(len(new_stats), [], [], [])
+
+        # Recalcular solo las filas afectadas
+        merged = [
+            SimpleNamespace(**{**{c: getattr(row, c) for c in STAT_COLUMNS}, **diff})
+            for row, diff in changed
+        ] + [
+            SimpleNamespace(**{**{c: None for c in STAT_COLUMNS}, **values})
+            for _, _, values in inserted
+        ]
+        points = batch_calculator.calculate_points(
+            stats_to_columns(merged),
+            position_codes(
+                [row.position for row, _ in changed] + [position for _, position, _ in inserted]
+            )
+        )
+
+        changes = []
+        player_deltas: Dict[int, Dict[str, float]] = {}
+
+        for (row, diff), value in zip(changed, points[:len(changed)]):
+            new_points = float(value)
+            changes.append((row.player_id, row.fantasy_points or 0.0, new_points))
+            self._accumulate(
+                player_deltas, row.player_id,
+                points=new_points - (row.fantasy_points or 0.0),
+                rating=(diff.get("rating", row.rating) or 0.0) - (row.rating or 0.0),
+                played=self._played(diff.get("minutes_played", row.minutes_played)) - self._played(row.minutes_played)
+            )
+
+        for (player_id, _, values), value in zip(inserted, points[len(changed):]):
+            new_points = float(value)
+            changes.append((player_id, 0.0, new_points))
+            self._accumulate(
+                player_deltas, player_id,
+                points=new_points,
+                rating=values.get("rating") or 0.0,
+                played=self._played(values.get("minutes_played"))
+            )
+
+        teams = self._lineup_teams(player_deltas)
+        # Simulación: equipos y usuarios que se recalcularían
+        team_deltas, user_deltas = teams, set(teams.values())
+
+        if not dry_run:
+            self._write_rows(match_id, changed, inserted, points)
+            gameweek_id, gameweek_number = self._gameweek(match_id)
+            # Equipos y usuarios: la liquidación recalcula las filas de la
+            # jornada de los equipos afectados (nada si aún no está liquidada)
+            team_deltas, user_deltas = GameweekSettlementService(self.db).apply_corrections(
+                gameweek_id, teams
+            ) or ({}, {})
+            self._write_accumulators(player_deltas)
+            PlayerFormService(self.db).apply_corrections(gameweek_number, player_deltas)
+            leaderboard = LeaderboardService(self.db)
+            leaderboard.apply_deltas(SEASON_SCOPE, user_deltas)
+            leaderboard.apply_deltas(gameweek_number, user_deltas)
+            self.db.commit()
+            # La forma reciente se sirve en el detalle de jugador
+            publish_players_changed(player_deltas.keys())
+
+        return self._summary(len(new_stats), changes, team_deltas, user_deltas, len(inserted))
+
+    def _load_match_rows(self, match_id: int) -> List:
+        """Filas guardadas del partido con la posición del jugador (una consulta)"""
+        query = (
+            select(
+                PlayerMatchStats.id,
+                PlayerMatchStats.player_id,
+                PlayerMatchStats.fantasy_points,
+                Player.position,
+                *[getattr(PlayerMatchStats, column) for column in TRACKED_COLUMNS]
+            )
+            .join(Player, Player.id == PlayerMatchStats.player_id)
+            .where(PlayerMatchStats.match_id == match_id)
+        )
+        return self.db.execute(query).all()
+
+    def _gameweek(self, match_id: int) -> Tuple[int, int]:
+        """(id, número) de la jornada del partido"""
+        return self.db.execute(
+            select(Gameweek.id, Gameweek.number)
+            .join(Match, Match.gameweek_id == Gameweek.id)
+            .where(Match.id == match_id)
+        ).one()
+
+    def _load_positions(self, player_ids: set) -> Dict:
+        """Posición de los jugadores que aún no tienen fila en el partido"""
+        if not player_ids:
+            return {}
+        rows = self.db.execute(
+            select(Player.id, Player.position).where(Player.id.in_(player_ids))
+        ).all()
+        return {row.id: row.position for row in rows}
+
+    def _lineup_teams(self, player_deltas: Dict[int, Dict[str, float]]) -> Dict[int, int]:
+        """
+        Equipos que tienen en la alineación a algún jugador cuyos puntos cambian
+
+        No se reparten ni redondean diferencias por corrección: la liquidación
+        recalcula la fila de cada equipo afectado (así una suma de
+        correcciones pequeñas, p. ej. +0.2, cambia el redondeo cuando toca)
+
+        Returns:
+            dict: {team_id: user_id}
+        """
+        scored = [player_id for player_id, delta in player_deltas.items() if delta["points"]]
+        if not scored:
+            return {}
+
+        rows = self.db.execute(
+            select(UserCard.team_id, Team.user_id)
+            .join(Team, Team.id == UserCard.team_id)
+            .where(UserCard.player_id.in_(scored), UserCard.is_in_lineup.is_(True))
+            .distinct()
+        ).all()
+        return dict(rows)
+
+    def _write_rows(self, match_id: int, changed: List, inserted: List, points):
+        """UPDATE por clave primaria de las filas cambiadas e INSERT de las nuevas"""
+        if changed:
+            self.db.execute(
+                update(PlayerMatchStats),
+                [
+                    {"id": row.id, **diff, "fantasy_points": float(value)}
+                    for (row, diff), value in zip(changed, points[:len(changed)])
+                ]
+            )
+
+        if inserted:
+            self.db.execute(
+                insert(PlayerMatchStats),
+                [
+                    {"player_id": player_id, "match_id": match_id, **values, "fantasy_points": float(value)}
+                    for (player_id, _, values), value in zip(inserted, points[len(changed):])
+                ]
+            )
+
+    def _write_accumulators(self, player_deltas: Dict):
+        """Suma las diferencias a los acumulados de los jugadores con un UPDATE ... CASE"""
+        if player_deltas:
+            ids = list(player_deltas)
+            self.db.execute(
+                update(Player)
+                .where(Player.id.in_(ids))
+                .values(
+                    sum_fantasy_points=Player.sum_fantasy_points + case(
+                        {pid: d["points"] for pid, d in player_deltas.items()}, value=Player.id, else_=0.0
+                    ),
+                    sum_match_ratings=Player.sum_match_ratings + case(
+                        {pid: d["rating"] for pid, d in player_deltas.items()}, value=Player.id, else_=0.0
+                    ),
+                    total_matches_played=Player.total_matches_played + case(
+                        {pid: d["played"] for pid, d in player_deltas.items()}, value=Player.id, else_=0
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _same_value(column: str, old: Any, new: Any) -> bool:
+        """Compara un valor guardado con el nuevo (None = 0; notas con tolerancia)"""
+        if column == "rating":
+            return math.isclose(old or 0.0, new or 0.0, abs_tol=RATING_TOLERANCE)
+        if column == "clean_sheet":
+            return bool(old) == bool(new)
+        return (old or 0) == (new or 0)
+
+    @staticmethod
+    def _played(minutes_played) -> int:
+        """1 si el jugador disputó minutos (cuenta para total_matches_played)"""
+        return 1 if minutes_played else 0
+
+    @staticmethod
+    def _accumulate(deltas: Dict, player_id: int, points: float, rating: float, played: int):
+        delta = deltas.setdefault(player_id, {"points": 0.0, "rating": 0.0, "played": 0})
+        delta["points"] += points
+        delta["rating"] += rating
+        delta["played"] += played
+
+    @staticmethod
+    def _summary(checked: int, changes: List, team_deltas, user_deltas, inserted: int = 0) -> Dict:
+        return {
+            "rows_checked": checked,
+            "rows_changed": len(changes) - inserted,
+            "rows_inserted": inserted,
+            "points_delta": sum(new - old for _, old, new in changes),
+            "teams_updated": len(team_deltas),
+            "users_updated": len(user_deltas),
+            "changes": changes
+        }
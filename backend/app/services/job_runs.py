@@ -0,0 +1,70 @@
+"""
+Registro de Ejecuciones de Jobs
+Cada job programado apunta su inicio y su final (correcto o fallido) en la
+tabla job_runs; el health check lee de ahí la antigüedad de la última
+ejecución correcta
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models.models import JobRun
+
+# Jobs cuya frescura vigila /health/ready
+DAILY_PRICES_JOB = "update_daily"
+WEEKEND_SCORING_JOB = "update_weekend"
+
+
+class JobRunService:
+    """
+    Inicio/fin de las ejecuciones de un job
+
+    Uso (en el script, con su propia sesión):
+        runs = JobRunService(db)
+        run = runs.start("update_daily")
+        ...
+        runs.finish(run, details={"players": 512})
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def start(self, job_name: str) -> JobRun:
+        """Registra el inicio (commit inmediato: queda constancia aunque el job muera)"""
+        run = JobRun(job_name=job_name, status="running", started_at=datetime.utcnow())
+        self.db.add(run)
+        self.db.commit()
+        return run
+
+    def finish(self, run: JobRun, details: Optional[Dict] = None, error: Optional[Exception] = None):
+        """
+        Registra el final de la ejecución
+
+        Args:
+            run: Ejecución devuelta por start()
+            details: Resumen del job (se guarda como JSON)
+            error: Excepción si el job ha fallado
+        """
+        run.finished_at = datetime.utcnow()
+        run.duration_seconds = (run.finished_at - run.started_at).total_seconds()
+        run.status = "failed" if error else "success"
+        run.details = str(error)[:1000] if error else json.dumps(details or {}, ensure_ascii=False, default=str)
+        self.db.commit()
+
+    def last_success(self, job_names: Iterable[str]) -> Dict[str, Optional[datetime]]:
+        """Fecha de fin de la última ejecución correcta de cada job (None si nunca)"""
+        job_names = list(job_names)
+        finished = dict(self.db.execute(last_success_query(job_names)).all())
+        return {name: finished.get(name) for name in job_names}
+
+
+def last_success_query(job_names: Iterable[str]):
+    """SELECT job_name, MAX(finished_at) de las ejecuciones correctas (sync o async)"""
+    return (
+        select(JobRun.job_name, func.max(JobRun.finished_at))
+        .where(JobRun.job_name.in_(list(job_names)), JobRun.status == "success")
+        .group_by(JobRun.job_name)
+    )
@@ -0,0 +1,355 @@
+"""
+Clasificaciones (leaderboard_entries)
+Mantiene el puesto de cada usuario en la temporada y en cada jornada:
+- Escritura incremental (correcciones, set_points sin replace): por cada
+  usuario que cambia se buscan su puesto viejo (PK) y el nuevo (rango del
+  índice (scope, points DESC, user_id)) y se desplazan, con un solo UPDATE
+  en bloque, solo las filas que quedan entre los dos puestos. O(log n + filas
+  desplazadas) por usuario, sin leer el ámbito completo
+- Reconstrucción (cierre de jornada, general desde User.total_points): se
+  lee el ámbito completo y se reordena en memoria (O(n log n), una vez por
+  jornada); solo se escriben las filas que cambian
+- Lectura: "mi puesto" por PK (scope, user_id) y páginas por rango de
+  (scope, position), O(log n + página) con cualquier número de usuarios
+
+Las consultas de lectura se construyen aquí y las ejecuta AsyncReadService (API)
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select, update, insert, delete, func, case, and_, or_
+from sqlalchemy.orm import Session
+
+from app.models.models import LeaderboardEntry, User, Gameweek
+from app.services.gameweek_settlement import lineup_points_query
+
+# Ámbito de la clasificación general
+SEASON_SCOPE = 0
+
+
+def ranked(points: Mapping[int, int]) -> List[Tuple[int, int, int, int]]:
+    """
+    Ordena un ámbito: (user_id, puntos, position, rank)
+
+    position es único (empates por user_id); rank es de competición
+    (1, 2, 2, 4...)
+    """
+    ordered = sorted(points.items(), key=lambda item: (-item[1], item[0]))
+    result = []
+    rank = 0
+    previous = None
+    for position, (user_id, user_points) in enumerate(ordered, 1):
+        if user_points != previous:
+            rank, previous = position, user_points
+        result.append((user_id, user_points, position, rank))
+    return result
+
+
+def entry_query(scope: int, user_id: int):
+    return select(LeaderboardEntry.position, LeaderboardEntry.rank, LeaderboardEntry.points).where(
+        LeaderboardEntry.scope == scope, LeaderboardEntry.user_id == user_id
+    )
+
+
+def positions_query(scope: int, first_position: int, last_position: int):
+    """Filas de un rango de puestos con el nombre de usuario (índice (scope, position))"""
+    return (
+        select(
+            LeaderboardEntry.position,
+            LeaderboardEntry.rank,
+            LeaderboardEntry.user_id,
+            User.username,
+            LeaderboardEntry.points
+        )
+        .join(User, User.id == LeaderboardEntry.user_id)
+        .where(
+            LeaderboardEntry.scope == scope,
+            LeaderboardEntry.position.between(first_position, last_position)
+        )
+        .order_by(LeaderboardEntry.position)
+    )
+
+
+def size_query(scope: int):
+    """Usuarios del ámbito: el mayor puesto (lectura del extremo del índice)"""
+    return select(func.max(LeaderboardEntry.position)).where(LeaderboardEntry.scope == scope)
+
+
+def entries_to_dicts(rows) -> List[Dict]:
+    return [
+        {"position": position, "rank": rank, "user_id": user_id, "username": username, "points": points}
+        for position, rank, user_id, username, points in rows
+    ]
+
+
+class LeaderboardService:
+    """
+    Mantenimiento de las clasificaciones (sin commit: va en la transacción
+    del job que confirma los puntos)
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def _load(self, scope: int) -> Dict[int, Tuple[int, int, int]]:
+        """{user_id: (puntos, position, rank)} del ámbito"""
+        rows = self.db.execute(
+            select(
+                LeaderboardEntry.user_id,
+                LeaderboardEntry.points,
+                LeaderboardEntry.position,
+                LeaderboardEntry.rank
+            ).where(LeaderboardEntry.scope == scope)
+        ).all()
+        return {user_id: (points, position, rank) for user_id, points, position, rank in rows}
+
+    def set_points(self, scope: int, points: Mapping[int, int], replace: bool = False) -> Dict:
+        """
+        Actualiza los puntos de un ámbito y recoloca a los usuarios
+
+        Sin replace se recoloca usuario a usuario (_move): no se lee el
+        ámbito, solo se desplazan las filas entre el puesto viejo y el nuevo.
+        Con replace se reordena el ámbito completo (_rebuild)
+
+        Args:
+            scope: SEASON_SCOPE o número de jornada
+            points: {user_id: puntos} nuevos
+            replace: Si es True, `points` es el ámbito completo (se quitan los
+                     usuarios que no aparezcan)
+
+        Returns:
+            dict: Resumen {"users", "updated", "inserted", "deleted"}
+        """
+        if replace:
+            return self._rebuild(scope, points)
+
+        updated = inserted = 0
+        for user_id, user_points in points.items():
+            moved = self._move(scope, user_id, user_points)
+            if moved is None:
+                continue
+            shifted, is_new = moved
+            updated += shifted + (0 if is_new else 1)
+            inserted += 1 if is_new else 0
+
+        return {
+            "users": self.db.scalar(size_query(scope)) or 0,
+            "updated": updated, "inserted": inserted, "deleted": 0
+        }
+
+    def _move(self, scope: int, user_id: int, new_points: int) -> Optional[Tuple[int, bool]]:
+        """
+        Recoloca a un usuario con sus puntos nuevos (o lo añade)
+
+        - Puesto nuevo: el de la primera fila que queda detrás en el orden
+          (puntos desc, user_id asc), buscada por rango del índice
+          (scope, points DESC, user_id)
+        - Un UPDATE en bloque: position ± 1 en las filas entre el puesto viejo
+          y el nuevo, y rank ± 1 en las que tienen puntos entre los viejos y
+          los nuevos (rank = 1 + usuarios con más puntos)
+        - rank del usuario: el menor puesto de los que empatan con él
+
+        Returns:
+            tuple | None: (filas desplazadas, si es nuevo), o None si sus
+                          puntos no cambian
+        """
+        entry = LeaderboardEntry
+        old = self.db.execute(
+            select(entry.points, entry.position).where(entry.scope == scope, entry.user_id == user_id)
+        ).first()
+        if old is not None and old.points == new_points:
+            return None
+
+        size = self.db.scalar(size_query(scope)) or 0
+        if old is None:
+            # Un usuario nuevo entra desde detrás del último
+            old_position = size + 1
+        else:
+            old_position = old.position
+
+        # Primera fila (sin contar al usuario) detrás de la clave nueva
+        next_position = self.db.scalar(
+            select(entry.position)
+            .where(
+                entry.scope == scope,
+                entry.user_id != user_id,
+                or_(
+                    entry.points < new_points,
+                    and_(entry.points == new_points, entry.user_id > user_id)
+                )
+            )
+            .order_by(entry.points.desc(), entry.user_id)
+            .limit(1)
+        )
+        if next_position is None:
+            new_position = size if old is not None else size + 1
+        else:
+            new_position = next_position - (1 if old_position < next_position else 0)
+
+        # Filas entre el puesto viejo y el nuevo (solo uno de los dos rangos)
+        shifts = []
+        if new_position < old_position:
+            position_range = entry.position.between(new_position, old_position - 1)
+            shifts.append(position_range)
+            position_shift = case((position_range, 1), else_=0)
+        elif new_position > old_position:
+            position_range = entry.position.between(old_position + 1, new_position)
+            shifts.append(position_range)
+            position_shift = case((position_range, -1), else_=0)
+        else:
+            position_shift = 0
+
+        # Filas cuyo número de usuarios por delante cambia
+        if old is None:
+            points_range, rank_step = entry.points < new_points, 1
+        elif new_points > old.points:
+            points_range, rank_step = and_(entry.points >= old.points, entry.points < new_points), 1
+        else:
+            points_range, rank_step = and_(entry.points >= new_points, entry.points < old.points), -1
+        shifts.append(points_range)
+
+        shifted = self.db.execute(
+            update(entry)
+            .where(entry.scope == scope, entry.user_id != user_id, or_(*shifts))
+            .values(
+                position=entry.position + position_shift,
+                rank=entry.rank + case((points_range, rank_step), else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        tied_position = self.db.scalar(
+            select(entry.position)
+            .where(entry.scope == scope, entry.points == new_points, entry.user_id != user_id)
+            .order_by(entry.user_id)
+            .limit(1)
+        )
+        rank = new_position if tied_position is None else min(new_position, tied_position)
+
+        values = {"points": new_points, "position": new_position, "rank": rank}
+        if old is None:
+            self.db.execute(insert(entry), [{"scope": scope, "user_id": user_id, **values}])
+        else:
+            self.db.execute(
+                update(entry)
+                .where(entry.scope == scope, entry.user_id == user_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        return shifted, old is None
+
+    def _rebuild(self, scope: int, points: Mapping[int, int]) -> Dict:
+        """
+        Sustituye un ámbito completo: 1 lectura del ámbito + ordenación en
+        memoria (O(n log n)); las escrituras se limitan a las filas que cambian
+        """
+        current = self._load(scope)
+        board = dict(points)
+
+        updates, inserts = [], []
+        for user_id, user_points, position, rank in ranked(board):
+            old = current.get(user_id)
+            if old is None:
+                inserts.append({
+                    "scope": scope, "user_id": user_id,
+                    "points": user_points, "position": position, "rank": rank
+                })
+            elif old != (user_points, position, rank):
+                updates.append({
+                    "scope": scope, "user_id": user_id,
+                    "points": user_points, "position": position, "rank": rank
+                })
+
+        removed = [user_id for user_id in current if user_id not in board]
+
+        for start in range(0, len(removed), self.chunk_size):
+            self.db.execute(
+                delete(LeaderboardEntry).where(
+                    LeaderboardEntry.scope == scope,
+                    LeaderboardEntry.user_id.in_(removed[start:start + self.chunk_size])
+                )
+            )
+        for start in range(0, len(updates), self.chunk_size):
+            self.db.execute(update(LeaderboardEntry), updates[start:start + self.chunk_size])
+        for start in range(0, len(inserts), self.chunk_size):
+            self.db.execute(insert(LeaderboardEntry), inserts[start:start + self.chunk_size])
+
+        return {"users": len(board), "updated": len(updates), "inserted": len(inserts), "deleted": len(removed)}
+
+    def apply_deltas(self, scope: int, deltas: Mapping[int, int]) -> Optional[Dict]:
+        """
+        Suma diferencias de puntos (correcciones). Una clasificación de
+        jornada que aún no existe no se crea aquí: se crea al cerrar la jornada
+
+        Solo se leen por PK los usuarios corregidos y se recolocan de forma
+        incremental (set_points sin replace)
+
+        Returns:
+            dict | None: Resumen de set_points (None si no había nada que hacer)
+        """
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if not deltas:
+            return None
+
+        if scope != SEASON_SCOPE and self.db.scalar(
+            select(LeaderboardEntry.user_id).where(LeaderboardEntry.scope == scope).limit(1)
+        ) is None:
+            return None
+
+        user_ids = list(deltas)
+        current: Dict[int, int] = {}
+        for start in range(0, len(user_ids), self.chunk_size):
+            current.update(self.db.execute(
+                select(LeaderboardEntry.user_id, LeaderboardEntry.points).where(
+                    LeaderboardEntry.scope == scope,
+                    LeaderboardEntry.user_id.in_(user_ids[start:start + self.chunk_size])
+                )
+            ).all())
+
+        return self.set_points(scope, {
+            user_id: current.get(user_id, 0) + delta
+            for user_id, delta in deltas.items()
+        })
+
+    def refresh_season(self) -> Dict:
+        """
+        Clasificación general desde User.total_points: lee todos los usuarios
+        y reordena la temporada entera (O(n log n), una vez por jornada)
+        """
+        points = dict(self.db.execute(select(User.id, User.total_points)).all())
+        return self.set_points(SEASON_SCOPE, {user_id: total or 0 for user_id, total in points.items()}, replace=True)
+
+    def _with_all_users(self, points: Mapping[int, int]) -> Dict[int, int]:
+        """Completa un ámbito con todos los usuarios (los que no tienen puntos cuentan 0)"""
+        board = {user_id: 0 for user_id in self.db.scalars(select(User.id))}
+        board.update(points)
+        return board
+
+    def gameweek_user_points(self, gameweek_id: int) -> Dict[int, int]:
+        """
+        Puntos de cada usuario en una jornada: suma de los puntos Fantasy de
+        los jugadores de su alineación en los partidos de la jornada
+        (la consulta por conjuntos de la liquidación; sin puntos cuentan 0)
+        """
+        rows = self.db.execute(lineup_points_query(gameweek_id)).all()
+        return self._with_all_users({user_id: round(total or 0) for _, user_id, total in rows})
+
+    def commit_gameweek(self, gameweek: Gameweek, user_points: Optional[Mapping[int, int]] = None) -> Dict:
+        """
+        Clasificación de una jornada (completa) y de la temporada
+
+        Args:
+            gameweek: Jornada cerrada
+            user_points: {user_id: puntos de la jornada} (p. ej. los de la
+                         liquidación); si no se indica se calculan con
+                         gameweek_user_points
+        """
+        if user_points is None:
+            user_points = self.gameweek_user_points(gameweek.id)
+        else:
+            user_points = self._with_all_users(user_points)
+        return {
+            "gameweek": self.set_points(gameweek.number, user_points, replace=True),
+            "season": self.refresh_season()
+        }
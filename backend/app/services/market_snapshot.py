@@ -0,0 +1,155 @@
+"""
+Foto Diaria del Mercado (market_snapshots)
+Se construye DURANTE la pasada masiva de la inercia diaria (un add() por
+jugador) sin ordenar todos los movimientos:
+- Mayores subidas/bajadas por posición: montículos de tamaño K (heapq),
+  O(n log K) en tiempo y O(K) en memoria
+- Precio medio por rareza y capitalización total: sumas y recuentos
+
+La API sirve la foto guardada con una lectura por PK
+"""
+
+import heapq
+import json
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import MarketSnapshot, Player, Position
+
+
+class MarketSnapshotBuilder:
+    """
+    Acumulador de la foto del mercado
+
+    Uso:
+        builder = MarketSnapshotBuilder()
+        for movement in ...:
+            builder.add(movement, rarity)
+        builder.add_static(rarity, total_price, count)   # leyendas (no se mueven)
+        builder.to_dict()
+    """
+
+    def __init__(self, top_k: Optional[int] = None):
+        self.top_k = top_k or settings.MARKET_SNAPSHOT_TOP_K
+        # Montículos de mínimos de tamaño K: la raíz es el peor de los K mejores
+        self._risers: Dict[str, List] = defaultdict(list)
+        self._fallers: Dict[str, List] = defaultdict(list)
+        self._rarity_total: Dict[str, float] = defaultdict(float)
+        self._rarity_count: Dict[str, int] = defaultdict(int)
+        self.total_market_cap = 0.0
+        self.players = 0
+
+    def _push(self, heap: List, key: float, player_id: int, item: Dict):
+        # player_id desempata sin comparar los dicts
+        entry = (key, -player_id, item)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, movement: Dict, rarity: str):
+        """
+        Añade el movimiento de un jugador (dict de apply_daily_inertia_all)
+        """
+        new_price = movement["new_price"]
+        self.players += 1
+        self.total_market_cap += new_price
+        self._rarity_total[rarity] += new_price
+        self._rarity_count[rarity] += 1
+
+        percentage = movement["movement_percentage"]
+        if percentage == 0:
+            return
+
+        item = {
+            "player_id": movement["player_id"],
+            "name": movement["name"],
+            "old_price": movement["old_price"],
+            "new_price": new_price,
+            "movement_percentage": round(percentage, 2)
+        }
+        if percentage > 0:
+            self._push(self._risers[movement["position"]], percentage, movement["player_id"], item)
+        else:
+            self._push(self._fallers[movement["position"]], -percentage, movement["player_id"], item)
+
+    def add_static(self, rarity: str, total_price: float, count: int):
+        """Jugadores sin movimiento (leyendas): solo cuentan en medias y capitalización"""
+        self.players += count
+        self.total_market_cap += total_price
+        self._rarity_total[rarity] += total_price
+        self._rarity_count[rarity] += count
+
+    @staticmethod
+    def _ranked(heap: List) -> List[Dict]:
+        return [item for _, _, item in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def to_dict(self, day: Optional[date] = None) -> Dict:
+        day = day or date.today()
+        return {
+            "day": day.isoformat(),
+            "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "players": self.players,
+            "total_market_cap": round(self.total_market_cap, 2),
+            "average_price_by_rarity": {
+                rarity: round(self._rarity_total[rarity] / count, 2)
+                for rarity, count in sorted(self._rarity_count.items())
+            },
+            "movers": {
+                position.value: {
+                    "risers": self._ranked(self._risers[position.value]),
+                    "fallers": self._ranked(self._fallers[position.value])
+                }
+                for position in Position
+            }
+        }
+
+
+class MarketSnapshotService:
+    """
+    Guarda la foto del día (sin commit: va en la transacción del job)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_legends(self, builder: MarketSnapshotBuilder):
+        """Leyendas por rareza (1 agregado): no pasan por la inercia diaria"""
+        rows = self.db.execute(
+            select(Player.base_rarity, func.sum(Player.current_price), func.count())
+            .where(Player.is_legend == True)
+            .group_by(Player.base_rarity)
+        ).all()
+        for rarity, total_price, count in rows:
+            builder.add_static(rarity.value, total_price or 0.0, count)
+
+    def save(self, builder: MarketSnapshotBuilder, day: Optional[date] = None) -> Dict:
+        """
+        Guarda (o sustituye) la foto del día
+
+        Returns:
+            dict: Contenido guardado
+        """
+        day = day or date.today()
+        snapshot = builder.to_dict(day)
+        self.db.merge(MarketSnapshot(
+            day=day,
+            players_count=snapshot["players"],
+            total_market_cap=snapshot["total_market_cap"],
+            payload=json.dumps(snapshot, ensure_ascii=False),
+            created_at=datetime.utcnow()
+        ))
+        return snapshot
+
+
+def snapshot_payload_query(day: Optional[date] = None):
+    """JSON de la foto de un día (o la más reciente): lectura por PK"""
+    query = select(MarketSnapshot.payload)
+    if day is not None:
+        return query.where(MarketSnapshot.day == day)
+    return query.order_by(MarketSnapshot.day.desc()).limit(1)
@@ -1,62 +1,53 @@
 """
 Actualizador de Mercado
-Algoritmo de fluctuación de precios y medias (OVR) según rendimiento
+Algoritmo de fluctuación de las medias (OVR) según rendimiento
+
+Los precios no se tocan aquí: el precio objetivo (target_price) y el precio
+actual (current_price) los calcula y guarda PriceInertiaSystem (economy.py)
 """
 
-from datetime import datetime, timedelta
+from typing import Dict
+from sqlalchemy import select, update, case
 from sqlalchemy.orm import Session
-from app.models.models import Player, PlayerMatchStats, UserCard
+from app.core.cache import publish_players_changed
+from app.models.models import Player, PlayerForm, UserCard
 import random
 
 
 class MarketUpdater:
     """
-    Gestiona la fluctuación dinámica de:
-    - Medias (OVR) de jugadores
-    - Valores de mercado
+    Gestiona la fluctuación dinámica de las medias (OVR) de los jugadores y
+    la copia en sus cartas (user_cards). Los precios son de PriceInertiaSystem
     """
     
     def __init__(self, db: Session):
         self.db = db
     
-    def calculate_performance_score(self, player_id: int, weeks: int = 4) -> float:
+    def calculate_performance_score(self, player_id: int) -> float:
         """
-        Calcula el rendimiento promedio de un jugador en las últimas semanas
+        Calcula el rendimiento promedio de un jugador en las últimas jornadas
+        (lee su registro de player_form, ver PlayerFormService)
         
         Args:
             player_id: ID del jugador
-            weeks: Número de semanas a considerar
             
         Returns:
             float: Puntuación promedio de rendimiento
         """
-        # Fecha límite (últimas N semanas)
-        cutoff_date = datetime.utcnow() - timedelta(weeks=weeks)
-        
-        # Obtener estadísticas recientes
-        recent_stats = (
-            self.db.query(PlayerMatchStats)
-            .filter(
-                PlayerMatchStats.player_id == player_id,
-                PlayerMatchStats.created_at >= cutoff_date,
-                PlayerMatchStats.minutes_played > 0  # Solo partidos donde jugó
-            )
-            .all()
-        )
+        form = self.db.get(PlayerForm, player_id)
         
-        if not recent_stats:
+        if not form or not form.matches_played:
             return 0.0
         
         # Calcular promedio de:
         # - Nota del partido (rating)
         # - Puntos Fantasy
-        avg_rating = sum(s.rating for s in recent_stats if s.rating) / len(recent_stats)
-        avg_fantasy = sum(s.fantasy_points for s in recent_stats) / len(recent_stats)
-        
-        # Fórmula ponderada (70% nota, 30% puntos fantasy)
-        performance_score = (avg_rating * 0.7) + (avg_fantasy * 0.3)
-        
-        return performance_score
+        return self._performance_from_averages(form.average_rating, form.average_fantasy_points)
+    
+    @staticmethod
+    def _performance_from_averages(avg_rating: float, avg_fantasy: float) -> float:
+        """Fórmula ponderada (70% nota, 30% puntos fantasy)"""
+        return (avg_rating * 0.7) + (avg_fantasy * 0.3)
     
     def update_player_overall(self, player_id: int) -> int:
         """
@@ -85,7 +76,24 @@ class MarketUpdater:
             # Sin datos recientes, no actualizar
             return player.overall_rating
         
-        old_ovr = player.overall_rating
+        new_ovr = self._next_overall(player.overall_rating, performance)
+        
+        # Actualizar en la base de datos
+        player.overall_rating = new_ovr
+        self.db.commit()
+        
+        # También actualizar todas las cartas de este jugador en posesión de usuarios
+        self._update_user_cards_ovr(player_id, new_ovr)
+        publish_players_changed([player_id])
+        
+        return new_ovr
+    
+    @staticmethod
+    def _next_overall(old_ovr: int, performance: float) -> int:
+        """
+        Nueva media según el rendimiento
+        (>= 8.0 sube 1-2, < 5.0 baja 1-2, resto sin cambios)
+        """
         new_ovr = old_ovr
         
         # Determinar cambio según rendimiento
@@ -99,13 +107,6 @@ class MarketUpdater:
             change = random.randint(1, 2)
             new_ovr = max(50, old_ovr - change)  # Mínimo 50
         
-        # Actualizar en la base de datos
-        player.overall_rating = new_ovr
-        self.db.commit()
-        
-        # También actualizar todas las cartas de este jugador en posesión de usuarios
-        self._update_user_cards_ovr(player_id, new_ovr)
-        
         return new_ovr
     
     def _update_user_cards_ovr(self, player_id: int, new_ovr: int):
@@ -127,150 +128,108 @@ class MarketUpdater:
         
         self.db.commit()
     
-    def update_market_value(self, player_id: int) -> float:
+    def update_all_players(self, chunk_size: int = 1000) -> Dict[str, int]:
         """
-        Actualiza el valor de mercado de un jugador
+        Actualiza las medias de TODOS los jugadores activos
+        (Se ejecutaría semanalmente como tarea programada)
         
-        Factores:
-        - Rendimiento reciente
-        - Media (OVR) actual
-        - Demanda (cuántos usuarios lo tienen)
+        Versión por conjuntos: mismo algoritmo que update_player_overall, pero
+        con un número fijo de consultas:
+        - 1 lectura de la forma reciente precalculada (player_form)
+        - UPDATEs masivos de players y user_cards en un solo commit
+        
+        La nueva media se refleja en el precio a través de PriceInertiaSystem
+        (el precio objetivo depende del OVR)
         
         Args:
-            player_id: ID del jugador
+            chunk_size: Filas por UPDATE masivo
             
         Returns:
-            float: Nuevo valor de mercado
-        """
-        player = self.db.query(Player).filter(Player.id == player_id).first()
-        
-        if not player:
-            return 0.0
+            dict: Resumen {"players", "ovr_up", "ovr_down", "cards_updated"}
+        """
+        # 1. Rendimiento reciente de todos los jugadores
+        # (misma media que calculate_performance_score: las notas nulas cuentan como 0)
+        performance_rows = self.db.execute(
+            select(
+                PlayerForm.player_id,
+                PlayerForm.matches_played,
+                PlayerForm.sum_rating,
+                PlayerForm.sum_fantasy_points
+            )
+            .where(PlayerForm.matches_played > 0)
+        ).all()
+        performance_by_player = {
+            row.player_id: self._performance_from_averages(
+                row.sum_rating / row.matches_played,
+                row.sum_fantasy_points / row.matches_played
+            )
+            for row in performance_rows
+        }
         
-        # Valor base según OVR
-        base_value = self._calculate_base_value_by_ovr(player.overall_rating)
+        # 2. Jugadores activos (solo las columnas necesarias)
+        players = self.db.execute(
+            select(Player.id, Player.overall_rating)
+            .where(Player.is_legend == False)
+            .order_by(Player.id)
+        ).all()
         
-        # Factor de rendimiento (multiplicador)
-        performance = self.calculate_performance_score(player_id)
-        performance_multiplier = 1.0
+        changed_ovr: Dict[int, int] = {}
         
-        if performance >= 8.0:
-            performance_multiplier = 1.3  # +30%
-        elif performance >= 7.0:
-            performance_multiplier = 1.15  # +15%
-        elif performance < 5.0:
-            performance_multiplier = 0.8  # -20%
+        for player in players:
+            performance = performance_by_player.get(player.id, 0.0)
+            
+            # Sin datos recientes la media no cambia
+            if performance != 0.0:
+                new_ovr = self._next_overall(player.overall_rating, performance)
+                if new_ovr != player.overall_rating:
+                    changed_ovr[player.id] = new_ovr
         
-        # Factor de demanda (cuántos usuarios lo tienen)
-        demand_multiplier = self._calculate_demand_multiplier(player_id)
+        # 3. Escritura masiva (solo los jugadores que cambian) en un único commit
+        player_updates = [{"id": player_id, "overall_rating": ovr} for player_id, ovr in changed_ovr.items()]
+        for start in range(0, len(player_updates), chunk_size):
+            self.db.execute(update(Player), player_updates[start:start + chunk_size])
         
-        # Valor final
-        new_value = base_value * performance_multiplier * demand_multiplier
+        cards_updated = self._bulk_update_user_cards_ovr(changed_ovr, chunk_size)
         
-        # Actualizar en BD
-        player.base_market_value = new_value
         self.db.commit()
+        publish_players_changed(changed_ovr.keys())
         
-        # Actualizar todas las cartas de usuarios
-        self._update_user_cards_value(player_id, new_value)
+        ovr_up = sum(1 for p in players if changed_ovr.get(p.id, p.overall_rating) > p.overall_rating)
+        ovr_down = sum(1 for p in players if changed_ovr.get(p.id, p.overall_rating) < p.overall_rating)
         
-        return new_value
-    
-    def _calculate_base_value_by_ovr(self, ovr: int) -> float:
-        """
-        Calcula el valor base según la media (OVR)
-        
-        Escala:
-        - 90+ = 5M+
-        - 85-89 = 2-5M
-        - 80-84 = 1-2M
-        - 75-79 = 500k-1M
-        - 70-74 = 250k-500k
-        - < 70 = 100k-250k
-        """
-        if ovr >= 90:
-            return random.uniform(5000000, 10000000)
-        elif ovr >= 85:
-            return random.uniform(2000000, 5000000)
-        elif ovr >= 80:
-            return random.uniform(1000000, 2000000)
-        elif ovr >= 75:
-            return random.uniform(500000, 1000000)
-        elif ovr >= 70:
-            return random.uniform(250000, 500000)
-        else:
-            return random.uniform(100000, 250000)
-    
-    def _calculate_demand_multiplier(self, player_id: int) -> float:
-        """
-        Calcula multiplicador según la demanda (cuántos usuarios lo tienen)
+        print(f"📊 Total jugadores actualizados: {len(players)}")
+        print(f"   OVR ↗️ {ovr_up} | OVR ↘️ {ovr_down} | Sin cambios: {len(players) - ovr_up - ovr_down}")
+        print(f"   Cartas de usuarios actualizadas: {cards_updated}")
         
-        Args:
-            player_id: ID del jugador
-            
-        Returns:
-            float: Multiplicador de demanda (0.8 - 1.5)
-        """
-        # Contar cuántos usuarios tienen este jugador
-        count = (
-            self.db.query(UserCard)
-            .filter(UserCard.player_id == player_id)
-            .count()
-        )
-        
-        # A más demanda, más caro
-        if count > 100:
-            return 1.5  # +50%
-        elif count > 50:
-            return 1.3  # +30%
-        elif count > 20:
-            return 1.15  # +15%
-        elif count < 5:
-            return 0.9  # -10% (nadie lo quiere)
-        else:
-            return 1.0  # Neutral
+        return {
+            "players": len(players),
+            "ovr_up": ovr_up,
+            "ovr_down": ovr_down,
+            "cards_updated": cards_updated
+        }
     
-    def _update_user_cards_value(self, player_id: int, new_value: float):
+    def _bulk_update_user_cards_ovr(self, new_ovr_by_player: Dict[int, int], chunk_size: int) -> int:
         """
-        Actualiza el valor de mercado de todas las cartas de un jugador
+        Copia la nueva media a las cartas de usuarios con un UPDATE ... CASE por bloque
         
         Args:
-            player_id: ID del jugador
-            new_value: Nuevo valor de mercado
-        """
-        user_cards = (
-            self.db.query(UserCard)
-            .filter(UserCard.player_id == player_id)
-            .all()
-        )
-        
-        for card in user_cards:
-            card.current_market_value = new_value
-        
-        self.db.commit()
-    
-    def update_all_players(self):
-        """
-        Actualiza las medias y valores de TODOS los jugadores activos
-        (Se ejecutaría semanalmente como tarea programada)
-        """
-        # Obtener todos los jugadores que no son leyendas
-        active_players = (
-            self.db.query(Player)
-            .filter(Player.is_legend == False)
-            .all()
-        )
-        
-        updated_count = 0
-        
-        for player in active_players:
-            # Actualizar OVR
-            new_ovr = self.update_player_overall(player.id)
-            
-            # Actualizar valor de mercado
-            new_value = self.update_market_value(player.id)
+            new_ovr_by_player: {player_id: nueva media} (solo jugadores que cambian)
+            chunk_size: Jugadores por sentencia
             
-            updated_count += 1
-            print(f"✅ {player.name}: OVR {new_ovr} | Value: €{new_value:,.0f}")
+        Returns:
+            int: Número de cartas actualizadas
+        """
+        player_ids = list(new_ovr_by_player)
+        updated = 0
+        
+        for start in range(0, len(player_ids), chunk_size):
+            chunk = {pid: new_ovr_by_player[pid] for pid in player_ids[start:start + chunk_size]}
+            result = self.db.execute(
+                update(UserCard)
+                .where(UserCard.player_id.in_(chunk))
+                .values(current_overall=case(chunk, value=UserCard.player_id))
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
         
-        print(f"\n📊 Total jugadores actualizados: {updated_count}")
+        return updated
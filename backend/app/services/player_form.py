@@ -0,0 +1,216 @@
+"""
+Forma Reciente de los Jugadores
+Mantiene la tabla player_form (sumas y recuentos de nota y puntos Fantasy de
+las últimas N jornadas) de forma incremental al cerrar cada jornada
+"""
+
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, update, insert, delete, func, case
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import PlayerForm, PlayerMatchStats, Match, Gameweek
+
+# (partidos jugados, suma de notas, suma de puntos Fantasy)
+FormTotals = Tuple[int, float, float]
+
+
+class PlayerFormService:
+    """
+    Ventana móvil de forma por jugador
+
+    Al cerrar la jornada G solo se leen dos jornadas de estadísticas:
+    se suma G y se resta G - N (la que sale de la ventana). Los cálculos
+    de precio y OVR leen después un registro por jugador.
+    """
+
+    def __init__(self, db: Session, window: Optional[int] = None):
+        self.db = db
+        self.window = window or settings.PLAYER_FORM_GAMEWEEKS
+
+    def _gameweek_totals(self, first_gameweek: int, last_gameweek: int) -> Dict[int, FormTotals]:
+        """
+        Agregado por jugador de las jornadas [first, last] (solo partidos con minutos)
+        """
+        if last_gameweek < first_gameweek:
+            return {}
+
+        rows = self.db.execute(
+            select(
+                PlayerMatchStats.player_id,
+                func.count(PlayerMatchStats.id),
+                func.coalesce(func.sum(PlayerMatchStats.rating), 0),
+                func.coalesce(func.sum(PlayerMatchStats.fantasy_points), 0)
+            )
+            .join(Match, Match.id == PlayerMatchStats.match_id)
+            .join(Gameweek, Gameweek.id == Match.gameweek_id)
+            .where(
+                Gameweek.number.between(first_gameweek, last_gameweek),
+                PlayerMatchStats.minutes_played > 0
+            )
+            .group_by(PlayerMatchStats.player_id)
+        ).all()
+
+        return {
+            player_id: (int(matches), float(sum_rating), float(sum_points))
+            for player_id, matches, sum_rating, sum_points in rows
+        }
+
+    def commit_gameweek(self, gameweek_number: int) -> Dict:
+        """
+        Incorpora una jornada cerrada a la ventana
+
+        Si la tabla está al día hasta la jornada anterior se actualiza de forma
+        incremental; en cualquier otro caso (tabla vacía, jornada repetida,
+        huecos o ventana distinta) se reconstruye la ventana completa.
+
+        Args:
+            gameweek_number: Número de la jornada que se acaba de cerrar
+
+        Returns:
+            dict: {"mode": "incremental" | "rebuild", "players": int, "gameweek": int}
+        """
+        state = self.db.execute(
+            select(
+                func.max(PlayerForm.last_gameweek),
+                func.min(PlayerForm.last_gameweek),
+                func.max(PlayerForm.window_gameweeks),
+                func.min(PlayerForm.window_gameweeks)
+            )
+        ).one()
+
+        in_sync = (
+            state[0] == gameweek_number - 1
+            and state[1] == state[0]
+            and state[2] == state[3] == self.window
+        )
+        if not in_sync:
+            return self.rebuild(gameweek_number)
+
+        added = self._gameweek_totals(gameweek_number, gameweek_number)
+        removed = self._gameweek_totals(gameweek_number - self.window, gameweek_number - self.window)
+
+        current = {
+            row.player_id: (row.matches_played or 0, row.sum_rating or 0.0, row.sum_fantasy_points or 0.0)
+            for row in self.db.execute(
+                select(
+                    PlayerForm.player_id,
+                    PlayerForm.matches_played,
+                    PlayerForm.sum_rating,
+                    PlayerForm.sum_fantasy_points
+                )
+                .where(PlayerForm.player_id.in_(set(added) | set(removed)))
+            ).all()
+        }
+
+        updates, inserts = [], []
+        for player_id in set(added) | set(removed):
+            totals = self._combine(
+                current.get(player_id, (0, 0.0, 0.0)),
+                added.get(player_id, (0, 0.0, 0.0)),
+                removed.get(player_id, (0, 0.0, 0.0))
+            )
+            values = self._row_values(player_id, gameweek_number, totals)
+            (updates if player_id in current else inserts).append(values)
+
+        # Toda la tabla avanza de jornada; solo cambian las sumas de quien jugó G o G - N
+        self.db.execute(
+            update(PlayerForm)
+            .values(last_gameweek=gameweek_number)
+            .execution_options(synchronize_session=False)
+        )
+        if updates:
+            self.db.execute(update(PlayerForm), updates)
+        if inserts:
+            self.db.execute(insert(PlayerForm), inserts)
+        self.db.commit()
+
+        return {"mode": "incremental", "players": len(updates) + len(inserts), "gameweek": gameweek_number}
+
+    def rebuild(self, gameweek_number: int) -> Dict:
+        """
+        Recalcula la ventana completa que termina en la jornada indicada
+        """
+        totals = self._gameweek_totals(gameweek_number - self.window + 1, gameweek_number)
+
+        self.db.execute(delete(PlayerForm))
+        if totals:
+            self.db.execute(
+                insert(PlayerForm),
+                [self._row_values(player_id, gameweek_number, values) for player_id, values in totals.items()]
+            )
+        self.db.commit()
+
+        return {"mode": "rebuild", "players": len(totals), "gameweek": gameweek_number}
+
+    def apply_corrections(self, gameweek_number: int, player_deltas: Dict[int, Dict[str, float]]) -> int:
+        """
+        Suma correcciones de estadísticas de una jornada que ya está en la ventana
+        (ver IncrementalScoringService). No hace commit.
+
+        Args:
+            gameweek_number: Jornada del partido corregido
+            player_deltas: {player_id: {"points", "rating", "played"}}
+
+        Returns:
+            int: Filas de player_form actualizadas
+        """
+        if not player_deltas:
+            return 0
+
+        last_gameweek = self.db.scalar(select(func.max(PlayerForm.last_gameweek)))
+        if last_gameweek is None or not (last_gameweek - self.window < gameweek_number <= last_gameweek):
+            return 0  # Fuera de la ventana: no afecta a la forma
+
+        ids = list(player_deltas)
+        result = self.db.execute(
+            update(PlayerForm)
+            .where(PlayerForm.player_id.in_(ids))
+            .values(
+                matches_played=PlayerForm.matches_played + case(
+                    {pid: d["played"] for pid, d in player_deltas.items()}, value=PlayerForm.player_id, else_=0
+                ),
+                sum_rating=PlayerForm.sum_rating + case(
+                    {pid: d["rating"] for pid, d in player_deltas.items()}, value=PlayerForm.player_id, else_=0.0
+                ),
+                sum_fantasy_points=PlayerForm.sum_fantasy_points + case(
+                    {pid: d["points"] for pid, d in player_deltas.items()}, value=PlayerForm.player_id, else_=0.0
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # Jugadores que aún no tenían fila (primer partido dentro de la ventana)
+        existing = set(self.db.scalars(select(PlayerForm.player_id).where(PlayerForm.player_id.in_(ids))))
+        new_rows = [
+            self._row_values(pid, last_gameweek, (d["played"], d["rating"], d["points"]))
+            for pid, d in player_deltas.items()
+            if pid not in existing and d["played"] > 0
+        ]
+        if new_rows:
+            self.db.execute(insert(PlayerForm), new_rows)
+
+        return result.rowcount + len(new_rows)
+
+    def _row_values(self, player_id: int, gameweek_number: int, totals: FormTotals) -> Dict:
+        matches, sum_rating, sum_points = totals
+        return {
+            "player_id": player_id,
+            "window_gameweeks": self.window,
+            "last_gameweek": gameweek_number,
+            "matches_played": matches,
+            "sum_rating": sum_rating,
+            "sum_fantasy_points": sum_points
+        }
+
+    @staticmethod
+    def _combine(current: FormTotals, added: FormTotals, removed: FormTotals) -> FormTotals:
+        """current + added - removed (sin arrastrar residuos de coma flotante)"""
+        matches = current[0] + added[0] - removed[0]
+        if matches <= 0:
+            return 0, 0.0, 0.0
+        return (
+            matches,
+            current[1] + added[1] - removed[1],
+            current[2] + added[2] - removed[2]
+        )
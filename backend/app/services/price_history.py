@@ -0,0 +1,223 @@
+"""
+Histórico de Precios (player_price_history)
+- Escritura: una fila por jugador y día, en bloque, dentro de la transacción
+  del job que mueve los precios (update_daily, inercia diaria)
+- Lectura: series reducidas para gráficas, agregados (mín/máx/último) por
+  rango de fechas y mayores subidas/bajadas entre dos fechas
+
+Las consultas se construyen aquí y las ejecuta este servicio (jobs, sesión
+síncrona) o AsyncReadService (API)
+"""
+
+import math
+from datetime import date, timedelta
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import select, delete, insert, func, and_
+from sqlalchemy.orm import Session, aliased
+
+from app.models.models import Player, PlayerPriceHistory
+
+# Rango por defecto de las gráficas
+DEFAULT_RANGE_DAYS = 30
+
+
+def default_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """Rango [start, end] con valores por defecto (últimos DEFAULT_RANGE_DAYS días)"""
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS)
+    return start, end
+
+
+def series_query(player_id: int, start: date, end: date):
+    """Serie de un jugador: lectura de rango sobre la PK (player_id, day)"""
+    return (
+        select(PlayerPriceHistory.day, PlayerPriceHistory.price)
+        .where(
+            PlayerPriceHistory.player_id == player_id,
+            PlayerPriceHistory.day.between(start, end)
+        )
+        .order_by(PlayerPriceHistory.day)
+    )
+
+
+def range_stats_query(player_id: int, start: date, end: date):
+    """Mínimo, máximo, nº de días y primer/último día del rango (un solo agregado)"""
+    return (
+        select(
+            func.min(PlayerPriceHistory.price),
+            func.max(PlayerPriceHistory.price),
+            func.count(),
+            func.min(PlayerPriceHistory.day),
+            func.max(PlayerPriceHistory.day)
+        )
+        .where(
+            PlayerPriceHistory.player_id == player_id,
+            PlayerPriceHistory.day.between(start, end)
+        )
+    )
+
+
+def prices_on_days_query(player_id: int, days: Sequence[date]):
+    return select(PlayerPriceHistory.day, PlayerPriceHistory.price).where(
+        PlayerPriceHistory.player_id == player_id,
+        PlayerPriceHistory.day.in_(list(days))
+    )
+
+
+def bounds_query(start: date, end: date):
+    """Primer y último día con datos dentro del rango (índice por día)"""
+    return select(func.min(PlayerPriceHistory.day), func.max(PlayerPriceHistory.day)).where(
+        PlayerPriceHistory.day.between(start, end)
+    )
+
+
+def movers_query(first_day: date, last_day: date, limit: int, rising: bool):
+    """
+    Jugadores con mayor variación de precio entre dos días: join de las dos
+    "fotos" del mercado (índice por día, sin recalcular precios objetivo)
+    """
+    first = aliased(PlayerPriceHistory)
+    last = aliased(PlayerPriceHistory)
+    change = (last.price - first.price) / first.price * 100
+
+    return (
+        select(
+            Player.id,
+            Player.name,
+            Player.position,
+            first.price,
+            last.price,
+            change.label("change_percentage")
+        )
+        .select_from(last)
+        .join(first, and_(first.player_id == last.player_id, first.day == first_day))
+        .join(Player, Player.id == last.player_id)
+        .where(last.day == last_day, first.price > 0, change > 0 if rising else change < 0)
+        .order_by(change.desc() if rising else change.asc(), Player.id)
+        .limit(limit)
+    )
+
+
+def downsample(rows: Sequence[Tuple[date, float]], max_points: int) -> List[Dict]:
+    """
+    Reduce una serie a como mucho max_points tramos consecutivos; cada tramo
+    conserva mínimo, máximo y último precio (los picos no desaparecen)
+    """
+    size = max(1, math.ceil(len(rows) / max_points))
+    points = []
+    for start in range(0, len(rows), size):
+        chunk = rows[start:start + size]
+        prices = [price for _, price in chunk]
+        points.append({
+            "day": chunk[-1][0].isoformat(),
+            "min": min(prices),
+            "max": max(prices),
+            "last": prices[-1]
+        })
+    return points
+
+
+def summarize(first: Optional[float], last: Optional[float], minimum: Optional[float],
+              maximum: Optional[float], days: int) -> Dict:
+    """Agregados de un rango (None si no hay datos)"""
+    return {
+        "days": days,
+        "min": minimum,
+        "max": maximum,
+        "first": first,
+        "last": last,
+        "change_percentage": round((last - first) / first * 100, 2) if first else None
+    }
+
+
+def movers_rows_to_dicts(rows) -> List[Dict]:
+    return [
+        {
+            "player_id": player_id,
+            "name": name,
+            "position": position.value,
+            "start_price": start_price,
+            "end_price": end_price,
+            "change_percentage": round(change, 2)
+        }
+        for player_id, name, position, start_price, end_price, change in rows
+    ]
+
+
+class PriceHistoryService:
+    """
+    Histórico de precios sobre una sesión síncrona (jobs y scripts)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_day(self, prices: Mapping[int, float], day: Optional[date] = None,
+                   chunk_size: int = 1000) -> int:
+        """
+        Guarda el precio del día de cada jugador (sin commit: va en la
+        transacción del job que ha movido los precios)
+
+        Si el job se repite el mismo día, sus filas sustituyen a las anteriores
+
+        Args:
+            prices: {player_id: precio}
+            day: Día de la foto (por defecto, hoy)
+            chunk_size: Filas por DELETE/INSERT masivo
+
+        Returns:
+            int: Filas escritas
+        """
+        day = day or date.today()
+        items = list(prices.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            self.db.execute(
+                delete(PlayerPriceHistory).where(
+                    PlayerPriceHistory.day == day,
+                    PlayerPriceHistory.player_id.in_([player_id for player_id, _ in chunk])
+                )
+            )
+            self.db.execute(
+                insert(PlayerPriceHistory),
+                [{"player_id": player_id, "day": day, "price": price} for player_id, price in chunk]
+            )
+        return len(items)
+
+    def range_stats(self, player_id: int, start: Optional[date] = None,
+                    end: Optional[date] = None) -> Dict:
+        """
+        Mínimo, máximo, primer y último precio de un jugador en [start, end]
+        (2 consultas indexadas)
+        """
+        start, end = default_range(start, end)
+        minimum, maximum, days, first_day, last_day = self.db.execute(
+            range_stats_query(player_id, start, end)
+        ).one()
+        if not days:
+            return summarize(None, None, None, None, 0)
+
+        prices = dict(self.db.execute(prices_on_days_query(player_id, [first_day, last_day])).all())
+        return summarize(prices[first_day], prices[last_day], minimum, maximum, days)
+
+    def biggest_movers(self, start: Optional[date] = None, end: Optional[date] = None,
+                       limit: int = 10) -> Dict:
+        """
+        Mayores subidas y bajadas entre el primer y el último día con datos
+        del rango
+
+        Returns:
+            dict: "start", "end" (días comparados), "risers" y "fallers"
+        """
+        start, end = default_range(start, end)
+        first_day, last_day = self.db.execute(bounds_query(start, end)).one()
+        if first_day is None or first_day == last_day:
+            return {"start": None, "end": None, "risers": [], "fallers": []}
+
+        return {
+            "start": first_day.isoformat(),
+            "end": last_day.isoformat(),
+            "risers": movers_rows_to_dicts(self.db.execute(movers_query(first_day, last_day, limit, True)).all()),
+            "fallers": movers_rows_to_dicts(self.db.execute(movers_query(first_day, last_day, limit, False)).all())
+        }
@@ -0,0 +1,119 @@
+"""
+Plan de Puntuación Compilado
+Traduce SCORING_RULES una sola vez a tablas planas listas para usar,
+de forma que la calculadora no tenga que interpretar las reglas en cada llamada
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.services.scoring_rules import (
+    SCORING_RULES,
+    RATING_POINTS,
+    POSITION_RULE_COLUMNS,
+    COMMON_RULE_COLUMNS
+)
+from app.models.models import Position
+
+
+# Un término es (atributo de PlayerMatchStats, peso)
+Terms = Tuple[Tuple[str, float], ...]
+
+
+@dataclass(frozen=True)
+class CompiledScoringPlan:
+    """
+    Reglas de puntuación precompiladas
+
+    - position_terms: acciones específicas de cada posición
+    - penalty_terms: penalizaciones comunes a todas las posiciones
+    - total_terms: ambas cosas fusionadas (un peso por atributo) para el total
+    - minutes_* / rating_*: umbrales ordenados de menor a mayor para bisect
+    """
+
+    position_terms: Dict[Position, Terms]
+    penalty_terms: Terms
+    total_terms: Dict[Position, Terms]
+    minutes_thresholds: Tuple[float, ...]
+    minutes_points: Tuple[float, ...]
+    rating_thresholds: Tuple[float, ...]
+    rating_points: Tuple[float, ...]
+
+    def minutes_to_points(self, minutes_played: int) -> float:
+        """Puntos por minutos jugados (umbral más alto alcanzado)"""
+        return self.minutes_points[bisect_right(self.minutes_thresholds, minutes_played or 0)]
+
+    def rating_to_points(self, rating: Optional[float]) -> float:
+        """Puntos por la nota del partido (sin nota = 0)"""
+        if not rating:
+            return 0
+        return self.rating_points[bisect_right(self.rating_thresholds, rating)]
+
+
+def _threshold_table(table: Sequence) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Convierte [(umbral, puntos), ...] en (umbrales ascendentes, puntos)
+    con un 0 inicial para valores por debajo del umbral mínimo
+    """
+    ordered = sorted(table)
+    thresholds = tuple(threshold for threshold, _ in ordered)
+    points = (0,) + tuple(points for _, points in ordered)
+    return thresholds, points
+
+
+def _merge_terms(*term_groups: Terms) -> Terms:
+    """Suma los pesos de los términos que comparten atributo"""
+    merged: Dict[str, float] = {}
+    for terms in term_groups:
+        for attribute, weight in terms:
+            merged[attribute] = merged.get(attribute, 0) + weight
+    return tuple((attribute, weight) for attribute, weight in merged.items() if weight)
+
+
+def compile_scoring_plan(rules: Optional[dict] = None) -> CompiledScoringPlan:
+    """
+    Compila un diccionario de reglas con el formato de SCORING_RULES
+
+    Args:
+        rules: Reglas a compilar (por defecto SCORING_RULES)
+
+    Returns:
+        CompiledScoringPlan: Plan listo para la calculadora
+    """
+    rules = rules or SCORING_RULES
+
+    penalty_terms = tuple(
+        (column, rules[rule_key])
+        for rule_key, column in COMMON_RULE_COLUMNS.items()
+        if rule_key in rules
+    )
+
+    position_terms = {}
+    for position in Position:
+        position_rules = rules[position.value]
+        position_terms[position] = tuple(
+            (column, position_rules[rule_key])
+            for rule_key, column in POSITION_RULE_COLUMNS.items()
+            if rule_key in position_rules
+            # El castigo extra por goles en contra es exclusivo del portero
+            and (rule_key != "GOALS_AGAINST" or position == Position.GK)
+        )
+
+    total_terms = {
+        position: _merge_terms(terms, penalty_terms)
+        for position, terms in position_terms.items()
+    }
+
+    minutes_thresholds, minutes_points = _threshold_table(rules["MINUTES_PLAYED"])
+    rating_thresholds, rating_points = _threshold_table(RATING_POINTS)
+
+    return CompiledScoringPlan(
+        position_terms=position_terms,
+        penalty_terms=penalty_terms,
+        total_terms=total_terms,
+        minutes_thresholds=minutes_thresholds,
+        minutes_points=minutes_points,
+        rating_thresholds=rating_thresholds,
+        rating_points=rating_points
+    )
@@ -74,6 +74,15 @@ SCORING_RULES = {
 
 
 # --- 7. FACTOR DE NOTA (RATING) ---
+# (nota mínima, puntos) ordenados de mayor a menor
+RATING_POINTS = [
+    (8.0, 4),  # Partidazo
+    (7.0, 3),  # Muy bien
+    (6.0, 2),  # Bien
+    (5.0, 1),  # Aprobado raspado
+]
+
+
 def calcular_puntos_por_nota(rating_sportmonks: float) -> float:
     """
     Convierte la nota de Sportmonks (0-10) en puntos Fantasy.
@@ -92,16 +101,41 @@ def calcular_puntos_por_nota(rating_sportmonks: float) -> float:
         >>> calcular_puntos_por_nota(4.2)
         0
     """
-    if rating_sportmonks >= 8.0:
-        return 4  # Partidazo
-    elif rating_sportmonks >= 7.0:
-        return 3  # Muy bien
-    elif rating_sportmonks >= 6.0:
-        return 2  # Bien
-    elif rating_sportmonks >= 5.0:
-        return 1  # Aprobado raspado
-    else:
-        return 0  # Suspenso (< 5.0) -> 0 Puntos
+    for threshold, points in RATING_POINTS:
+        if rating_sportmonks >= threshold:
+            return points
+    return 0  # Suspenso (< 5.0) -> 0 Puntos
+
+
+# ==========================================
+# MAPEO REGLA -> COLUMNA DE PlayerMatchStats
+# ==========================================
+
+# Reglas específicas de posición que aplica la calculadora
+POSITION_RULE_COLUMNS = {
+    "GOALS": "goals",
+    "ASSISTS": "assists",
+    "CLEAN_SHEET": "clean_sheet",
+    "SAVES": "saves",
+    "PENALTIES_SAVED": "penalty_save",
+    "EFFECTIVE_CLEARANCES": "clearances",
+    "BALL_RECOVERY": "ball_recoveries",
+    "PENALTIES_WON": "penalty_won",
+    "SHOTS_ON_TARGET": "shots_on_target",
+    "SUCCESSFUL_DRIBBLES": "dribbles",
+    "ACCURATE_CROSSES": "crosses",
+    "GOALS_AGAINST": "goals_conceded",  # Solo porteros
+}
+
+# Penalizaciones comunes con columna en PlayerMatchStats
+# (OWN_GOALS no se guarda en la BD, por eso no aparece)
+COMMON_RULE_COLUMNS = {
+    "YELLOWCARDS": "yellow_cards",
+    "RED_CARD": "red_cards",
+    "PENALTIES_MISSED": "penalty_miss",
+    "DISPOSSESSED": "dispossessed",
+    "GOALS_AGAINST": "goals_conceded",
+}
 
 
 def get_position_rules(position: str) -> dict:
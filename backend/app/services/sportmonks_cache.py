@@ -0,0 +1,189 @@
+"""
+Caché en disco de respuestas de Sportmonks
+- Clave = URL + parámetros (sin el token), hash SHA-256
+- Valores = JSON comprimido con gzip
+- Los partidos terminados no caducan nunca; los en juego/programados tienen TTL corto
+- Soporta revalidación con ETag / Last-Modified (304 Not Modified)
+- Tamaño máximo con expulsión LRU (por fecha de último acceso)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+from urllib.parse import urlencode
+
+# Estados de Sportmonks v3 de un partido terminado (FT, AET, FT_PEN)
+FINISHED_STATE_IDS = {5, 7, 8}
+
+
+@dataclass
+class CacheEntry:
+    """Respuesta cacheada con sus metadatos"""
+
+    body: Any
+    stored_at: float
+    expires_at: Optional[float]  # None = no caduca
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at is None or time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Cabeceras para revalidar una entrada caducada"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SportmonksCache:
+    """
+    Caché de respuestas direccionada por contenido
+
+    Uso:
+        cache = SportmonksCache("data/sportmonks_cache")
+        key = cache.make_key(url, params)
+        entry = cache.get(key)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 500 * 1024 * 1024,
+                 live_ttl: float = 60, default_ttl: float = 3600):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.rglob("*.json.gz"))
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """
+        Clave estable para una petición: URL + parámetros ordenados, sin api_token
+        """
+        query = urlencode(sorted(
+            (name, value) for name, value in (params or {}).items() if name != "api_token"
+        ))
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Devuelve la entrada (aunque esté caducada, para poder revalidarla) o None
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                raw = json.load(f)
+            # Marcar como usada recientemente (LRU por mtime)
+            os.utime(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+        return CacheEntry(**raw)
+
+    def open_body(self, key: str) -> Optional[BinaryIO]:
+        """
+        Abre una entrada como stream binario ya descomprimido, sin cargar el
+        JSON, para lectores incrementales (ijson). La respuesta está bajo la
+        clave "body" del objeto guardado. No comprueba si está caducada: pensado
+        para partidos terminados, que no caducan
+
+        Returns:
+            BinaryIO | None: Fichero gzip abierto en modo "rb" (el llamador lo
+                             cierra), o None si no está en la caché
+        """
+        path = self._path(key)
+        try:
+            stream = gzip.open(path, "rb")
+            os.utime(path)
+        except (FileNotFoundError, OSError):
+            return None
+
+        return stream
+
+    def put(self, key: str, body: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CacheEntry:
+        """
+        Guarda una respuesta con el TTL que le corresponda según su contenido
+        """
+        ttl = self.ttl_for(body)
+        now = time.time()
+        entry = CacheEntry(
+            body=body,
+            stored_at=now,
+            expires_at=None if ttl is None else now + ttl,
+            etag=etag,
+            last_modified=last_modified
+        )
+        self._write(key, entry)
+        return entry
+
+    def refresh(self, key: str, entry: CacheEntry) -> CacheEntry:
+        """
+        Renueva el TTL de una entrada revalidada (304 Not Modified)
+        """
+        return self.put(key, entry.body, entry.etag, entry.last_modified)
+
+    def ttl_for(self, body: Any) -> Optional[float]:
+        """
+        TTL según el contenido de la respuesta
+
+        Returns:
+            float | None: Segundos de vida, None si no caduca nunca
+        """
+        data = body.get("data") if isinstance(body, dict) else None
+
+        if isinstance(data, dict) and "state_id" in data:
+            if data["state_id"] in FINISHED_STATE_IDS:
+                return None  # Partido terminado: los datos ya no cambian
+            return self.live_ttl
+
+        return self.default_ttl
+
+    def _write(self, key: str, entry: CacheEntry):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".tmp{threading.get_ident()}")
+
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry.__dict__, f, separators=(",", ":"))
+
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self._size += path.stat().st_size - old_size
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Borra las entradas menos usadas hasta quedar por debajo del 90% del máximo"""
+        files = sorted(self.directory.rglob("*.json.gz"), key=lambda p: p.stat().st_mtime)
+        target = self.max_bytes * 0.9
+
+        for path in files:
+            if self._size <= target:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            for path in self.directory.rglob("*.json.gz"):
+                path.unlink(missing_ok=True)
+            self._size = 0
@@ -0,0 +1,261 @@
+"""
+Cliente compartido de la API de Sportmonks
+- Conexiones reutilizadas (requests.Session con pool)
+- Peticiones concurrentes con límite configurable
+- Limitador token-bucket para respetar el rate limit del plan
+- Reintentos con backoff exponencial en 429 / 5xx
+- Caché en disco opcional (ver sportmonks_cache)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.services.sportmonks_cache import SportmonksCache
+
+logger = logging.getLogger(__name__)
+
+# Includes por defecto para obtener un partido con estadísticas completas
+FIXTURE_INCLUDES = "lineups.details.type;participants;scores"
+
+# Códigos HTTP que merecen reintento
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Directorio base para rutas relativas de la caché (backend/)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def default_cache() -> Optional[SportmonksCache]:
+    """Caché configurada en Settings (None si está desactivada)"""
+    if not settings.SPORTMONKS_CACHE_ENABLED:
+        return None
+
+    directory = Path(settings.SPORTMONKS_CACHE_DIR)
+    if not directory.is_absolute():
+        directory = BACKEND_DIR / directory
+
+    return SportmonksCache(
+        str(directory),
+        max_bytes=settings.SPORTMONKS_CACHE_MAX_MB * 1024 * 1024,
+        live_ttl=settings.SPORTMONKS_CACHE_LIVE_TTL,
+        default_ttl=settings.SPORTMONKS_CACHE_DEFAULT_TTL
+    )
+
+
+class TokenBucket:
+    """
+    Limitador token-bucket thread-safe
+
+    Se rellena a `rate` tokens por segundo hasta `capacity`;
+    cada petición consume un token y espera si no hay ninguno
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y lo consume"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class SportmonksClient:
+    """
+    Cliente HTTP para Sportmonks API v3 (football)
+
+    Uso:
+        with SportmonksClient() as client:
+            for fixture_id, data in client.fetch_fixtures([19428038, 19428039]):
+                ...
+    """
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        requests_per_hour: Optional[int] = None,
+        burst: Optional[int] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout: float = 30,
+        cache: Optional[SportmonksCache] = None,
+        use_cache: bool = True
+    ):
+        self.api_token = api_token or settings.SPORTMONKS_API_KEY
+        if not self.api_token:
+            raise ValueError("API token is required")
+
+        self.base_url = (base_url or f"{settings.SPORTMONKS_BASE_URL}/football").rstrip("/")
+        self.max_workers = max_workers or settings.SPORTMONKS_MAX_CONCURRENCY
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.cache = (cache or default_cache()) if use_cache else None
+
+        requests_per_hour = requests_per_hour or settings.SPORTMONKS_REQUESTS_PER_HOUR
+        self.rate_limiter = TokenBucket(
+            rate=requests_per_hour / 3600,
+            capacity=burst or settings.SPORTMONKS_BURST
+        )
+
+        # Una sola sesión: reutiliza conexiones TCP/TLS entre peticiones e hilos
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Cierra las conexiones del pool"""
+        self.session.close()
+
+    def get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """
+        GET con caché, rate limit y reintentos
+
+        Args:
+            path: Ruta relativa a base_url (ej: "fixtures/19428039")
+            params: Parámetros extra de la query (sin el token)
+
+        Returns:
+            dict: JSON de la respuesta
+
+        Raises:
+            requests.exceptions.RequestException: Si falla tras agotar los reintentos
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        params = params or {}
+
+        # 1. Caché: una entrada vigente evita la petición
+        cache_key = entry = None
+        if self.cache:
+            cache_key = self.cache.make_key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry and entry.is_fresh:
+                return entry.body
+
+        response = self._request(url, dict(params, api_token=self.api_token),
+                                 entry.validators() if entry else {}, path)
+
+        # 2. Revalidación: el servidor confirma que la entrada caducada sigue igual
+        if response.status_code == 304 and entry:
+            return self.cache.refresh(cache_key, entry).body
+
+        response.raise_for_status()
+        body = response.json()
+
+        if self.cache:
+            self.cache.put(
+                cache_key,
+                body,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+
+        return body
+
+    def _request(self, url: str, query: Dict, headers: Dict, path: str) -> requests.Response:
+        """Petición con rate limit y reintentos (429/5xx/errores de conexión)"""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+
+            try:
+                response = self.session.get(url, params=query, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                logger.warning(f"Sportmonks respondió {response.status_code} en {path}, reintentando...")
+                self._sleep_before_retry(attempt, response.headers.get("Retry-After"))
+                continue
+
+            return response
+
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[str] = None):
+        """Espera Retry-After si la API lo indica, si no backoff exponencial"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff_seconds * (2 ** attempt)
+        time.sleep(delay)
+
+    def get_fixture(self, fixture_id: int, include: str = FIXTURE_INCLUDES) -> Optional[Dict]:
+        """
+        Obtiene datos de un partido
+
+        Returns:
+            dict | None: Campo 'data' de la respuesta, o None si falla
+        """
+        try:
+            logger.info(f"Obteniendo fixture {fixture_id}...")
+            return self.get(f"fixtures/{fixture_id}", {"include": include}).get("data")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error al obtener fixture {fixture_id}: {e}")
+            return None
+
+    def open_cached_fixture(self, fixture_id: int, include: str = FIXTURE_INCLUDES) -> Optional[BinaryIO]:
+        """
+        Respuesta de un partido ya guardada en la caché en disco, como stream
+        descomprimido (ver SportmonksCache.open_body); no hace peticiones
+
+        Returns:
+            BinaryIO | None: Stream del JSON cacheado, o None sin caché o sin entrada
+        """
+        if not self.cache:
+            return None
+        url = f"{self.base_url}/fixtures/{fixture_id}"
+        return self.cache.open_body(self.cache.make_key(url, {"include": include}))
+
+    def fetch_fixtures(
+        self,
+        fixture_ids: Iterable[int],
+        include: str = FIXTURE_INCLUDES
+    ) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """
+        Descarga varios partidos en paralelo y los devuelve según van llegando
+
+        Args:
+            fixture_ids: IDs de Sportmonks de los partidos
+            include: Includes de la petición
+
+        Yields:
+            tuple: (fixture_id, datos o None si falló), en orden de llegada
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.get_fixture, fixture_id, include): fixture_id
+                for fixture_id in fixture_ids
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
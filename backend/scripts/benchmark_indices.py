@@ -0,0 +1,297 @@
+"""
+Benchmark de Índices de player_match_stats
+Compara el plan (EXPLAIN) y el tiempo de las consultas calientes con el
+esquema original (claves simples player_id / match_id) y con los índices
+compuestos de migration_add_stats_indexes.py
+
+Función:
+1. Crea el esquema en una BD de pruebas y la rellena con datos sintéticos
+   (solo si está vacía)
+2. Fase "antes": solo claves simples -> EXPLAIN + tiempos
+3. Fase "después": índices compuestos -> EXPLAIN + tiempos
+
+⚠️ Modifica los índices de la BD indicada: usar una BD local de pruebas,
+nunca la de producción
+
+Uso:
+    python scripts/benchmark_indices.py [--url <database_url>] [--players N]
+                                        [--gameweeks N] [--repeat N]
+
+    Por defecto: sqlite:///benchmark_indices.db, 600 jugadores, 38 jornadas
+    MySQL: --url mysql+pymysql://root:@localhost:3306/fantasy_benchmark
+"""
+
+import sys
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, event, select, insert, func, text, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.models import Player, PlayerMatchStats, Match, Gameweek, Position
+from app.services.gameweek_scoring import GameweekScorer
+from app.services.incremental_scoring import IncrementalScoringService
+from app.services.player_form import PlayerFormService
+
+# Claves simples del esquema original (ultimate_fantasy_legends.sql)
+BASELINE_INDEXES = {
+    "bench_player_match_stats_player_id": "player_id",
+    "bench_player_match_stats_match_id": "match_id",
+}
+
+# Índices compuestos que se comparan con las claves simples
+COMPOSITE_INDEXES = [
+    index for index in PlayerMatchStats.__table__.indexes
+    if index.name in ("ix_player_match_stats_match_minutes", "ix_player_match_stats_player_match")
+]
+
+MATCHES_PER_GAMEWEEK = 10
+
+
+def get_arg(name: str, default):
+    """Valor de un argumento --name valor (o el valor por defecto)"""
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+# ==========================================
+# DATOS SINTÉTICOS
+# ==========================================
+
+def seed(Session, n_players: int, n_gameweeks: int):
+    """Jugadores, jornadas, partidos y una fila de stats por jugador y jornada"""
+    random.seed(42)
+    now = datetime.utcnow()
+    db = Session()
+    try:
+        positions = list(Position)
+        db.execute(insert(Player), [
+            {
+                "name": f"Jugador {i}", "age": random.randint(18, 35),
+                "position": random.choice(positions), "nationality": "Benchmark",
+                "overall_rating": random.randint(55, 90), "potential": random.randint(60, 95)
+            }
+            for i in range(n_players)
+        ])
+        player_ids = list(db.scalars(select(Player.id)))
+
+        for number in range(1, n_gameweeks + 1):
+            gameweek = Gameweek(number=number, start_date=now, end_date=now, is_finished=True)
+            db.add(gameweek)
+            db.flush()
+
+            db.execute(insert(Match), [
+                {
+                    "sportmonks_id": number * 1000 + k, "gameweek_id": gameweek.id,
+                    "home_team": "Local", "away_team": "Visitante", "kickoff_time": now
+                }
+                for k in range(MATCHES_PER_GAMEWEEK)
+            ])
+            match_ids = list(db.scalars(select(Match.id).where(Match.gameweek_id == gameweek.id)))
+
+            db.execute(insert(PlayerMatchStats), [
+                {
+                    "player_id": player_id,
+                    "match_id": random.choice(match_ids),
+                    "minutes_played": random.choice((0, 0, 25, 60, 90, 90)),
+                    "rating": round(random.uniform(5.0, 9.0), 1),
+                    "goals": random.randint(0, 1),
+                    "assists": random.randint(0, 1),
+                    "fantasy_points": round(random.uniform(-2, 15), 1)
+                }
+                for player_id in player_ids
+            ])
+
+        db.commit()
+    finally:
+        db.close()
+
+
+# ==========================================
+# FASES (ÍNDICES)
+# ==========================================
+
+def drop_index(conn, name: str, table: str):
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"DROP INDEX `{name}` ON {table}"))
+    else:
+        conn.execute(text(f"DROP INDEX {name}"))
+
+
+def existing_indexes(conn, table: str) -> set:
+    return {index["name"] for index in inspect(conn).get_indexes(table)}
+
+
+def use_baseline(engine):
+    """Solo claves simples (las compuestas se quitan después: MySQL las necesita para las FK)"""
+    with engine.begin() as conn:
+        existing = existing_indexes(conn, "player_match_stats")
+        for name, column in BASELINE_INDEXES.items():
+            if name not in existing:
+                conn.execute(text(f"CREATE INDEX {name} ON player_match_stats ({column})"))
+        for index in COMPOSITE_INDEXES:
+            if index.name in existing:
+                index.drop(conn)
+        analyze(conn)
+
+
+def use_composite(engine):
+    """Índices compuestos de los modelos, sin las claves simples"""
+    with engine.begin() as conn:
+        existing = existing_indexes(conn, "player_match_stats")
+        for index in COMPOSITE_INDEXES:
+            if index.name not in existing:
+                index.create(conn)
+        for name in BASELINE_INDEXES:
+            if name in existing:
+                drop_index(conn, name, "player_match_stats")
+        analyze(conn)
+
+
+def analyze(conn):
+    """Actualiza las estadísticas del optimizador tras cambiar los índices"""
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("ANALYZE"))
+    else:
+        conn.execute(text("ANALYZE TABLE player_match_stats"))
+
+
+# ==========================================
+# CONSULTAS
+# ==========================================
+
+def build_cases(db, window: int):
+    """Consultas calientes de los servicios (se ejecutan tal cual las lanzan)"""
+    last = db.scalar(select(func.max(Gameweek.number)))
+    gameweek_id = db.scalar(select(Gameweek.id).where(Gameweek.number == last))
+    match_id = db.scalar(select(func.min(Match.id)).where(Match.gameweek_id == gameweek_id))
+    player_id, player_match = db.execute(
+        select(PlayerMatchStats.player_id, PlayerMatchStats.match_id)
+        .where(PlayerMatchStats.match_id == match_id)
+        .limit(1)
+    ).one()
+
+    return {
+        f"player_form: ventana de {window} jornadas": lambda: PlayerFormService(db, window)._gameweek_totals(last - window + 1, last),
+        "GameweekScorer: stats de la jornada": lambda: GameweekScorer(db).load_gameweek_stats(gameweek_id),
+        "Correcciones: filas de un partido": lambda: IncrementalScoringService(db)._load_match_rows(match_id),
+        "Importación: fila (jugador, partido)": lambda: db.query(PlayerMatchStats.id).filter(
+            PlayerMatchStats.player_id == player_id,
+            PlayerMatchStats.match_id == player_match
+        ).first(),
+    }
+
+
+def capture_statement(engine, run):
+    """Ejecuta la consulta y devuelve (sentencia, parámetros) del último SELECT lanzado"""
+    captured = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return captured[-1]
+
+
+def explain(engine, statement: str, parameters) -> list:
+    """Plan de ejecución resumido (una línea por paso)"""
+    with engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            return [row[-1] for row in rows]
+
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        return [
+            f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row['Extra'] or ''}".strip()
+            for row in rows
+        ]
+
+
+def measure(engine, Session, window: int, repeat: int) -> dict:
+    """{caso: (mediana ms, plan)}"""
+    db = Session()
+    try:
+        results = {}
+        for name, run in build_cases(db, window).items():
+            statement, parameters = capture_statement(engine, run)
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - start) * 1000)
+                db.expire_all()
+
+            results[name] = (statistics.median(timings), explain(engine, statement, parameters))
+        return results
+    finally:
+        db.close()
+
+
+def print_phase(title: str, results: dict):
+    print(f"\n{title}")
+    print("-" * 60)
+    for name, (ms, plan) in results.items():
+        print(f"   {name}: {ms:.2f} ms")
+        for step in plan:
+            print(f"      · {step}")
+
+
+def run_benchmark(url: str, n_players: int, n_gameweeks: int, repeat: int):
+    print("📐 BENCHMARK DE ÍNDICES: player_match_stats")
+    print("=" * 60)
+
+    if url == settings.database_url:
+        print("❌ No se ejecuta contra la BD configurada en .env (usa --url con una BD de pruebas)")
+        return
+
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine)
+    Base.metadata.create_all(engine)
+
+    with Session() as db:
+        rows = db.scalar(select(func.count(PlayerMatchStats.id)))
+    if not rows:
+        print(f"🌱 Generando datos: {n_players} jugadores x {n_gameweeks} jornadas...")
+        seed(Session, n_players, n_gameweeks)
+        with Session() as db:
+            rows = db.scalar(select(func.count(PlayerMatchStats.id)))
+    print(f"BD: {engine.url.render_as_string(hide_password=True)} ({rows} filas de stats)")
+
+    window = settings.PLAYER_FORM_GAMEWEEKS
+
+    use_baseline(engine)
+    before = measure(engine, Session, window, repeat)
+    print_phase("🐢 ANTES (claves simples player_id / match_id)", before)
+
+    use_composite(engine)
+    after = measure(engine, Session, window, repeat)
+    print_phase("🚀 DESPUÉS (índices compuestos)", after)
+
+    print("\n📊 RESUMEN")
+    print("-" * 60)
+    for name in before:
+        old_ms, new_ms = before[name][0], after[name][0]
+        print(f"   {name}: {old_ms:.2f} → {new_ms:.2f} ms (x{old_ms / new_ms if new_ms else 0:.1f})")
+
+
+if __name__ == "__main__":
+    run_benchmark(
+        get_arg("--url", "sqlite:///benchmark_indices.db"),
+        n_players=get_arg("--players", 600),
+        n_gameweeks=get_arg("--gameweeks", 38),
+        repeat=get_arg("--repeat", 20)
+    )
@@ -0,0 +1,219 @@
+"""
+Benchmark de los Jobs del Backend
+Mide update_daily.py, MarketUpdater.update_all_players y update_weekend.py
+sobre una BD de pruebas con datos sintéticos a escala de temporada
+
+Función:
+1. Genera los datos (ver generar_datos_sinteticos.py) salvo con --no-generate
+2. Ejecuta cada job y mide tiempo, consultas SQL (por plantilla, con posibles
+   N+1; ver app/core/query_stats.py) y pico de memoria (tracemalloc; con
+   --no-memory se desactiva y los tiempos no llevan su coste)
+3. Guarda los resultados en JSON para comparar entre commits (--compare)
+
+Los jobs se ejecutan tal cual (mismas funciones que los scripts): la app se
+apunta a la BD de pruebas con la variable DATABASE_URL
+
+⚠️ Con generación de datos, borra y recrea todas las tablas de la BD indicada
+
+Uso:
+    python scripts/benchmark_jobs.py [--url <database_url>] [--players N] [--users N]
+                                     [--cards N] [--gameweeks N] [--output fichero.json]
+                                     [--compare base.json] [--no-generate] [--no-memory] [--verbose]
+
+    Por defecto: sqlite:///benchmark_jobs.db, 600 jugadores, 1000 usuarios x 25 cartas, 38 jornadas
+    MySQL: --url mysql+pymysql://root:@localhost:3306/fantasy_benchmark
+"""
+
+import sys
+import os
+import contextlib
+import gc
+import io
+import json
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def get_arg(name: str, default):
+    """Valor de un argumento --name valor (o el valor por defecto)"""
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+# La app (SessionLocal, test_connection...) debe apuntar a la BD de benchmark
+# ANTES de importar la configuración
+BENCHMARK_URL = get_arg("--url", "sqlite:///benchmark_jobs.db")
+os.environ["DATABASE_URL"] = BENCHMARK_URL
+os.environ["DEBUG"] = "False"  # Sin echo de SQL: distorsiona los tiempos
+
+from app.core.config import Settings
+from app.core.database import engine, SessionLocal
+from app.core.query_stats import query_instrumentation
+from app.services.market_updater import MarketUpdater
+
+from scripts.generar_datos_sinteticos import generate_dataset
+from scripts.update_daily import update_daily_prices
+from scripts.update_weekend import update_weekend_stats
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = BACKEND_DIR / "benchmark_results"
+
+
+def market_update_all_players():
+    """Recálculo semanal de OVR y valor de mercado (sin script propio)"""
+    db = SessionLocal()
+    try:
+        MarketUpdater(db).update_all_players()
+    finally:
+        db.close()
+
+
+# En este orden: update_weekend cierra la jornada activa, va el último
+JOBS = {
+    "update_daily": update_daily_prices,
+    "market_update_all_players": market_update_all_players,
+    "update_weekend": update_weekend_stats,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_job(name: str, job, trace_memory: bool, verbose: bool) -> dict:
+    """
+    Ejecuta un job y mide tiempo, consultas y pico de memoria
+
+    Los scripts capturan sus propias excepciones y las imprimen con "❌":
+    se detectan en la salida para marcar el job como fallido
+    """
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with query_instrumentation.unit(name) as report, contextlib.redirect_stdout(output):
+            job()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    if verbose:
+        print(output.getvalue())
+
+    errors = [line.strip() for line in output.getvalue().splitlines() if "❌" in line]
+    return {
+        "ok": not errors,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "queries": report.total_queries,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2) if peak is not None else None,
+        "sql": report.to_dict(top=10),
+    }
+
+
+def print_comparison(results: dict, baseline_path: str):
+    """Diferencias de tiempo y consultas con otro fichero de resultados"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\n🔍 COMPARACIÓN CON {baseline.get('commit', '?')} ({baseline_path})")
+    print("-" * 60)
+    for name, job in results["jobs"].items():
+        base = baseline.get("jobs", {}).get(name)
+        if not base:
+            print(f"   {name}: sin datos en la referencia")
+            continue
+        ratio = base["seconds"] / job["seconds"] if job["seconds"] else 0
+        print(f"   {name}: {base['seconds']:.3f}s → {job['seconds']:.3f}s (x{ratio:.2f}) | "
+              f"consultas {base['queries']} → {job['queries']}")
+
+
+def run_benchmark():
+    print("⏱️  BENCHMARK DE JOBS DEL BACKEND")
+    print("=" * 60)
+
+    if BENCHMARK_URL == Settings(DATABASE_URL=None).database_url:
+        print("❌ No se ejecuta contra la BD configurada en .env (usa --url con una BD de pruebas)")
+        return
+
+    dataset = {
+        "players": get_arg("--players", 600),
+        "users": get_arg("--users", 1000),
+        "cards_per_user": get_arg("--cards", 25),
+        "gameweeks": get_arg("--gameweeks", 38),
+    }
+    print(f"BD: {engine.url.render_as_string(hide_password=True)}")
+
+    generated = None
+    if "--no-generate" not in sys.argv:
+        print(f"🌱 Generando datos: {dataset}")
+        start = time.perf_counter()
+        generated = generate_dataset(
+            engine,
+            n_players=dataset["players"],
+            n_users=dataset["users"],
+            cards_per_user=dataset["cards_per_user"],
+            n_gameweeks=dataset["gameweeks"]
+        )
+        print(f"   {generated} ({time.perf_counter() - start:.1f}s)")
+
+    query_instrumentation.install(engine)
+    trace_memory = "--no-memory" not in sys.argv
+    verbose = "--verbose" in sys.argv
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "database": engine.dialect.name,
+        "dataset": dataset if generated is not None else None,
+        "rows": generated,
+        "memory_traced": trace_memory,
+        "jobs": {},
+    }
+
+    print("\n📊 RESULTADOS")
+    print("-" * 60)
+    for name, job in JOBS.items():
+        result = run_job(name, job, trace_memory, verbose)
+        results["jobs"][name] = result
+
+        memory = f" | pico {result['peak_memory_mb']} MB" if trace_memory else ""
+        status = "✅" if result["ok"] else "❌"
+        print(f"   {status} {name}: {result['seconds']:.3f}s | {result['queries']} consultas{memory}")
+        for error in result["errors"]:
+            print(f"      {error}")
+        for item in result["sql"]["n_plus_one"]:
+            print(f"      ⚠️  Posible N+1 ({item['count']}x): {item['sql'][:90]}")
+
+    output_path = get_arg(
+        "--output",
+        str(RESULTS_DIR / f"jobs_{results['commit']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    )
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados guardados en {output_path}")
+
+    if "--compare" in sys.argv:
+        print_comparison(results, get_arg("--compare", ""))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,144 @@
+"""
+Script de Corrección de Estadísticas
+Se ejecuta cuando el proveedor corrige datos a mitad de semana (gol reasignado,
+tarjeta anulada...)
+
+Función:
+Vuelve a descargar los partidos indicados, compara las stats con las guardadas y
+actualiza SOLO las filas que cambian, propagando la diferencia de puntos a
+jugadores, equipos y usuarios (sin borrar ni recargar la jornada).
+
+Uso:
+    python scripts/corregir_estadisticas.py <match_id> [<match_id> ...] [--dry-run]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import select
+from app.core.database import SessionLocal, test_connection
+from app.core.query_stats import instrumented_job
+from app.models.models import Match, Player
+from app.services.incremental_scoring import IncrementalScoringService, TRACKED_COLUMNS
+
+from scripts.sistema_puntos_oficial import (
+    SportmonksAPIClient,
+    StatsExtractor,
+    API_TOKEN
+)
+
+
+def extract_match_stats(fixture_data: dict, match: Match) -> dict:
+    """
+    Extrae las stats de un fixture como {sportmonks_player_id: {columna: valor}}
+    """
+    participants = fixture_data.get('participants', [])
+    home_team = next((p for p in participants if p.get('meta', {}).get('location') == 'home'), {})
+    away_team = next((p for p in participants if p.get('meta', {}).get('location') == 'away'), {})
+
+    match_stats = {}
+    for player_entry in fixture_data.get('lineups', []):
+        if not player_entry.get('player_id'):
+            continue
+
+        clean_sheet = StatsExtractor.determine_clean_sheet(
+            StatsExtractor.map_position(player_entry.get('type_id')),
+            player_entry.get('participant_id'),
+            home_team.get('id'),
+            away_team.get('id'),
+            match.home_score,
+            match.away_score
+        )
+        stats = StatsExtractor.extract_player_stats(player_entry, clean_sheet)
+
+        match_stats[player_entry['player_id']] = {
+            column: getattr(stats, column) for column in TRACKED_COLUMNS if hasattr(stats, column)
+        }
+
+    return match_stats
+
+
+def corregir_partidos(match_ids: list, dry_run: bool = False):
+    """
+    Aplica las correcciones del proveedor a los partidos indicados
+
+    Args:
+        match_ids: IDs (BD) de los partidos a revisar
+        dry_run: Si es True muestra los cambios sin escribir en la BD
+    """
+    print("🩹 CORRECCIÓN INCREMENTAL DE ESTADÍSTICAS")
+    print("=" * 60)
+    if dry_run:
+        print("🧪 MODO DRY-RUN: no se guardará ningún cambio")
+
+    if not API_TOKEN:
+        print("❌ SPORTMONKS_API_KEY no está configurada")
+        return
+
+    if not test_connection():
+        print("❌ Error: No se pudo conectar a la base de datos")
+        return
+
+    db = SessionLocal()
+    service = IncrementalScoringService(db)
+
+    try:
+        matches = db.query(Match).filter(Match.id.in_(match_ids)).all()
+        matches_by_fixture = {match.sportmonks_id: match for match in matches}
+
+        # Sin caché en disco: los partidos finalizados no caducan en ella y el
+        # script volvería a leer el payload original, sin ver la corrección
+        api_client = SportmonksAPIClient(API_TOKEN, use_cache=False)
+
+        for fixture_id, fixture_data in api_client.fetch_fixtures(list(matches_by_fixture)):
+            match = matches_by_fixture[fixture_id]
+            print(f"\n🏟️  {match.home_team} {match.home_score} - {match.away_score} {match.away_team} (Match {match.id})")
+
+            if not fixture_data:
+                print(f"   ❌ No se pudo obtener el fixture {fixture_id}")
+                continue
+
+            stats_by_sportmonks_id = extract_match_stats(fixture_data, match)
+
+            # sportmonks_id -> player_id en una sola consulta
+            player_ids = dict(db.execute(
+                select(Player.sportmonks_id, Player.id)
+                .where(Player.sportmonks_id.in_(list(stats_by_sportmonks_id)))
+            ).all())
+
+            new_stats = {
+                player_ids[sportmonks_id]: values
+                for sportmonks_id, values in stats_by_sportmonks_id.items()
+                if sportmonks_id in player_ids
+            }
+
+            result = service.apply_match_corrections(match.id, new_stats, dry_run=dry_run)
+
+            print(f"   Filas comparadas: {result['rows_checked']} | "
+                  f"cambiadas: {result['rows_changed']} | nuevas: {result['rows_inserted']}")
+            for player_id, old_points, new_points in result["changes"]:
+                print(f"   - Jugador {player_id}: {old_points:.1f} → {new_points:.1f} pts")
+            print(f"   Diferencia: {result['points_delta']:+.1f} pts "
+                  f"({result['teams_updated']} equipos, {result['users_updated']} usuarios)")
+
+        print("\n✅ Corrección completada")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error en la corrección: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    match_ids = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+
+    if not match_ids:
+        print("Uso: python scripts/corregir_estadisticas.py <match_id> [<match_id> ...] [--dry-run]")
+        sys.exit(1)
+
+    with instrumented_job("corregir_estadisticas"):
+        corregir_partidos(match_ids, dry_run="--dry-run" in sys.argv)
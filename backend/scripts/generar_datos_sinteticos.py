@@ -0,0 +1,325 @@
+"""
+Generador de Datos Sintéticos (escala de temporada)
+Rellena una BD de pruebas (SQLite o MySQL local) con un volumen realista para
+medir los jobs del backend (ver benchmark_jobs.py)
+
+Genera:
+- N jugadores repartidos en los 12 clubes de la liga
+- G jornadas (una por semana) con un partido por pareja de clubes y
+  estadísticas de la convocatoria (titulares, suplentes y banquillo)
+- M usuarios, cada uno con su equipo y K cartas (11 en la alineación)
+
+Las jornadas 1..G-1 quedan finalizadas y puntuadas (acumulados de Player y
+player_form al día); la jornada G queda activa y sin puntuar, lista para
+update_weekend.py
+
+⚠️ Borra y recrea todas las tablas de la BD indicada
+
+Uso:
+    python scripts/generar_datos_sinteticos.py --url <database_url> [--players N]
+                                               [--users N] [--cards N] [--gameweeks N]
+"""
+
+import sys
+import os
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, select, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.models import (
+    Player, User, Team, UserCard, Gameweek, Match, PlayerMatchStats,
+    Position, MatchStatus
+)
+from app.services.batch_calculator import STAT_COLUMNS, batch_calculator, stats_to_columns, position_codes
+from app.services.player_form import PlayerFormService
+
+CLUBS = [
+    "Celtic", "Rangers", "Aberdeen", "Hearts", "Hibernian", "Motherwell",
+    "Dundee", "Dundee United", "Kilmarnock", "St Mirren", "St Johnstone", "Ross County"
+]
+
+# Reparto de posiciones en una plantilla
+POSITION_WEIGHTS = {Position.GK: 0.1, Position.DEF: 0.35, Position.MID: 0.35, Position.FWD: 0.2}
+
+# Convocatoria por partido: 11 titulares + 7 suplentes (3 entran al campo)
+STARTERS = 11
+BENCH = 7
+SUBSTITUTIONS = 3
+
+CHUNK_SIZE = 5000
+
+
+def _bulk_insert(db, model, rows: List[Dict]):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+
+def _player_rows(n_players: int) -> List[Dict]:
+    positions = list(POSITION_WEIGHTS)
+    rows = []
+    for i in range(n_players):
+        overall = max(55, min(92, int(random.gauss(70, 7))))
+        rows.append({
+            "name": f"Jugador Sintético {i + 1}",
+            "age": random.randint(17, 36),
+            "position": random.choices(positions, weights=list(POSITION_WEIGHTS.values()))[0],
+            "nationality": "Scotland",
+            "overall_rating": overall,
+            "potential": min(99, overall + random.randint(0, 10)),
+            "current_team": CLUBS[i % len(CLUBS)],
+            "current_price": 50000 + (overall - 50) * 120000 * random.uniform(0.8, 1.2),
+            "target_price": 50000 + (overall - 50) * 120000,
+        })
+    return rows
+
+
+def _matchday_squad(squad: List) -> List:
+    """Convocatoria: portero titular + 10 de campo, y el banquillo"""
+    goalkeepers = [p for p in squad if p.position == Position.GK]
+    outfield = [p for p in squad if p.position != Position.GK]
+    random.shuffle(goalkeepers)
+    random.shuffle(outfield)
+    starters = goalkeepers[:1] + outfield[:STARTERS - min(1, len(goalkeepers))]
+    rest = [p for p in squad if p not in starters]
+    random.shuffle(rest)
+    return starters + rest[:BENCH]
+
+
+def _stat_row(player, minutes: int, goals_against: int) -> Dict:
+    """Estadísticas de un jugador en un partido según su posición y minutos"""
+    if not minutes:
+        return {"player_id": player.id, "minutes_played": 0, "rating": None}
+
+    attack = {Position.GK: 0.0, Position.DEF: 0.05, Position.MID: 0.12, Position.FWD: 0.3}[player.position]
+    share = minutes / 90
+    return {
+        "player_id": player.id,
+        "minutes_played": minutes,
+        "rating": round(min(10.0, max(4.0, random.gauss(6.8, 0.7))), 1),
+        "goals": int(random.random() < attack * share),
+        "assists": int(random.random() < attack * 0.6 * share),
+        "chances_created": random.randint(0, int(4 * attack * 10 * share) + 1),
+        "clean_sheet": goals_against == 0 and minutes >= 60,
+        "goals_conceded": goals_against if player.position in (Position.GK, Position.DEF) else 0,
+        "goals_conceded_team": goals_against,
+        "saves": random.randint(0, 6) if player.position == Position.GK else 0,
+        "clearances": random.randint(0, 8) if player.position == Position.DEF else random.randint(0, 2),
+        "yellow_cards": int(random.random() < 0.12),
+        "red_cards": int(random.random() < 0.01),
+        "shots_total": random.randint(0, int(10 * attack * share) + 1),
+        "shots_on_target": random.randint(0, int(5 * attack * share) + 1),
+        "dribbles": random.randint(0, 4),
+        "crosses": random.randint(0, 5),
+        "ball_recoveries": random.randint(0, 10),
+        "possession_lost": random.randint(0, 15),
+        "accurate_passes": random.randint(10, 60),
+        "total_passes": random.randint(60, 80),
+        "tackles": random.randint(0, 5),
+        "interceptions": random.randint(0, 4),
+        "duels_won": random.randint(0, 10),
+        "fouls": random.randint(0, 3),
+    }
+
+
+def _gameweek_rows(squads: Dict[str, List], match_ids: List[int]) -> List[Dict]:
+    """Estadísticas de todos los partidos de una jornada"""
+    clubs = list(squads)
+    random.shuffle(clubs)
+
+    rows = []
+    for match_id, (home, away) in zip(match_ids, zip(clubs[::2], clubs[1::2])):
+        goals = {home: random.choice((0, 0, 1, 1, 2, 3)), away: random.choice((0, 0, 1, 1, 2))}
+
+        for club, rival in ((home, away), (away, home)):
+            squad = _matchday_squad(squads[club])
+            # Cambios: 3 titulares de campo salen y entran los 3 primeros del banquillo
+            minutes = [90] * STARTERS + [0] * (len(squad) - STARTERS)
+            for starter, substitute in zip(random.sample(range(1, STARTERS), SUBSTITUTIONS),
+                                           range(STARTERS, len(squad))):
+                minutes[starter] = random.randint(55, 85)
+                minutes[substitute] = 90 - minutes[starter]
+
+            for player, played in zip(squad, minutes):
+                rows.append({"match_id": match_id, **_stat_row(player, played, goals[rival])})
+
+    return rows
+
+
+def _score(rows: List[Dict], positions: Dict[int, Position]):
+    """Puntos Fantasy con la calculadora oficial (igual que update_weekend)"""
+    stats = [SimpleNamespace(**{column: row.get(column) for column in STAT_COLUMNS}) for row in rows]
+    points = batch_calculator.calculate_points(
+        stats_to_columns(stats),
+        position_codes(positions[row["player_id"]] for row in rows)
+    )
+    for row, value in zip(rows, points):
+        row["fantasy_points"] = float(value)
+
+
+def generate_dataset(
+    engine,
+    n_players: int = 600,
+    n_users: int = 1000,
+    cards_per_user: int = 25,
+    n_gameweeks: int = 38,
+    seed: int = 42
+) -> Dict[str, int]:
+    """
+    Recrea el esquema y genera una temporada sintética
+
+    Args:
+        engine: Motor de la BD de pruebas
+        n_players: Jugadores (reales) en la liga
+        n_users: Usuarios, cada uno con un equipo
+        cards_per_user: Cartas por usuario (las 11 primeras en la alineación)
+        n_gameweeks: Jornadas; todas finalizadas salvo la última (activa)
+        seed: Semilla para que dos ejecuciones generen los mismos datos
+
+    Returns:
+        dict: Filas generadas por tabla
+    """
+    random.seed(seed)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    counts = {}
+
+    try:
+        # 1. Jugadores
+        _bulk_insert(db, Player, _player_rows(n_players))
+        players = db.execute(
+            select(Player.id, Player.position, Player.current_team, Player.overall_rating).order_by(Player.id)
+        ).all()
+        positions = {p.id: p.position for p in players}
+        squads: Dict[str, List] = {club: [] for club in CLUBS}
+        for player in players:
+            squads[player.current_team].append(player)
+        counts["players"] = len(players)
+
+        # 2. Jornadas, partidos y estadísticas
+        start = datetime.utcnow() - timedelta(weeks=n_gameweeks)
+        totals: Dict[int, List[float]] = {}
+        counts["matches"] = counts["player_match_stats"] = 0
+
+        for number in range(1, n_gameweeks + 1):
+            is_last = number == n_gameweeks
+            gameweek = Gameweek(
+                number=number,
+                start_date=start + timedelta(weeks=number - 1),
+                end_date=start + timedelta(weeks=number - 1, days=2),
+                is_active=is_last,
+                is_finished=not is_last
+            )
+            db.add(gameweek)
+            db.flush()
+
+            _bulk_insert(db, Match, [
+                {
+                    "sportmonks_id": number * 100 + k,
+                    "gameweek_id": gameweek.id,
+                    "home_team": "Local", "away_team": "Visitante",
+                    "home_score": random.randint(0, 3), "away_score": random.randint(0, 2),
+                    "status": MatchStatus.FINISHED,
+                    "kickoff_time": gameweek.start_date
+                }
+                for k in range(len(CLUBS) // 2)
+            ])
+            match_ids = list(db.scalars(
+                select(Match.id).where(Match.gameweek_id == gameweek.id).order_by(Match.id)
+            ))
+
+            rows = _gameweek_rows(squads, match_ids)
+            if not is_last:
+                _score(rows, positions)
+                for row in rows:
+                    if row["minutes_played"]:
+                        total = totals.setdefault(row["player_id"], [0, 0.0, 0.0])
+                        total[0] += 1
+                        total[1] += row["rating"] or 0.0
+                        total[2] += row["fantasy_points"]
+
+            _bulk_insert(db, PlayerMatchStats, rows)
+            counts["matches"] += len(match_ids)
+            counts["player_match_stats"] += len(rows)
+
+        # Acumulados de las jornadas ya puntuadas
+        accumulators = [
+            {"id": player_id, "total_matches_played": t[0], "sum_match_ratings": t[1], "sum_fantasy_points": t[2]}
+            for player_id, t in totals.items()
+        ]
+        for start_row in range(0, len(accumulators), CHUNK_SIZE):
+            db.execute(update(Player), accumulators[start_row:start_row + CHUNK_SIZE])
+
+        # 3. Usuarios, equipos y cartas
+        _bulk_insert(db, User, [
+            {"username": f"sintetico{i}", "email": f"sintetico{i}@benchmark.local", "password_hash": "x"}
+            for i in range(n_users)
+        ])
+        user_ids = list(db.scalars(select(User.id).order_by(User.id)))
+        _bulk_insert(db, Team, [{"name": f"Equipo {user_id}", "user_id": user_id} for user_id in user_ids])
+        team_ids = dict(db.execute(select(Team.user_id, Team.id)).all())
+
+        cards = []
+        for user_id in user_ids:
+            for index, player in enumerate(random.sample(players, min(cards_per_user, len(players)))):
+                cards.append({
+                    "user_id": user_id,
+                    "player_id": player.id,
+                    "team_id": team_ids[user_id],
+                    "current_overall": player.overall_rating,
+                    "is_in_lineup": index < STARTERS
+                })
+        _bulk_insert(db, UserCard, cards)
+        counts["users"] = len(user_ids)
+        counts["user_cards"] = len(cards)
+
+        db.commit()
+
+        # 4. Forma reciente hasta la última jornada finalizada
+        if n_gameweeks > 1:
+            counts["player_form"] = PlayerFormService(db).rebuild(n_gameweeks - 1)["players"]
+
+        return counts
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_arg(name: str, default):
+    """Valor de un argumento --name valor (o el valor por defecto)"""
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+if __name__ == "__main__":
+    url = get_arg("--url", "")
+    if not url:
+        print("Uso: python scripts/generar_datos_sinteticos.py --url <database_url> [--players N] "
+              "[--users N] [--cards N] [--gameweeks N]")
+        sys.exit(1)
+
+    print("🌱 GENERANDO DATOS SINTÉTICOS")
+    print("=" * 60)
+    counts = generate_dataset(
+        create_engine(url),
+        n_players=get_arg("--players", 600),
+        n_users=get_arg("--users", 1000),
+        cards_per_user=get_arg("--cards", 25),
+        n_gameweeks=get_arg("--gameweeks", 38)
+    )
+    for table, rows in counts.items():
+        print(f"   {table}: {rows:,}")
+    print("\n✅ Datos generados")
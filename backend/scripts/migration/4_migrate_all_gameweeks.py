@@ -20,6 +20,8 @@ from scripts.sistema_puntos_oficial import (
     FantasyScoringEngine,
     SportmonksAPIClient,
     StatsExtractor,
+    CompiledStatsExtractor,
+    COMPACT_FIXTURE_INCLUDES,
     API_TOKEN,
     logger
 )
@@ -107,6 +109,8 @@ def migrate_gameweek(gameweek_number):
         return False
     
     api_client = SportmonksAPIClient(API_TOKEN)
+    # Catálogo de tipos una vez: los detalles llegan sin el objeto `type`
+    stats_extractor = CompiledStatsExtractor(api_client.get_stat_types())
     scoring_engine = FantasyScoringEngine(BalancedScoringConfig())
     db = next(get_db())
     
@@ -126,9 +130,8 @@ def migrate_gameweek(gameweek_number):
         players_saved = 0
         matches_saved = 0
         
-        for fixture_id in fixtures:
-            # Obtener datos
-            fixture_data = api_client.get_fixture(fixture_id)
+        # Descarga concurrente: cada partido se procesa en cuanto llega
+        for fixture_id, fixture_data in api_client.fetch_fixtures(fixtures, COMPACT_FIXTURE_INCLUDES):
             if not fixture_data:
                 print(f"  ❌ No se pudo obtener fixture {fixture_id}")
                 continue
@@ -185,7 +188,7 @@ def migrate_gameweek(gameweek_number):
                 )
                 
                 # Extraer stats
-                stats = StatsExtractor.extract_player_stats(player_entry, clean_sheet)
+                stats = stats_extractor.extract(player_entry, clean_sheet).to_player_stats()
                 
                 if stats.minutes_played == 0:
                     continue
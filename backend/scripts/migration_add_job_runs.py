@@ -0,0 +1,50 @@
+"""
+MIGRACIÓN MANUAL - Crear tabla job_runs
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea la tabla donde update_daily.py y update_weekend.py registran cada
+ejecución. Mientras no exista, /health/ready devuelve "degraded"
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+from app.core.database import engine
+from app.models.models import JobRun
+
+def upgrade():
+    """Crea job_runs (con su índice por job, estado y fecha de fin)"""
+    
+    print("\n🔄 Aplicando migración: Crear tabla job_runs\n")
+    
+    JobRun.__table__.create(engine, checkfirst=True)
+    print("✅ Tabla job_runs disponible")
+    print("ℹ️  Los jobs quedarán como desactualizados en /health/ready hasta su próxima ejecución")
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Elimina la tabla job_runs"""
+    
+    print("\n🔄 Revirtiendo migración: Eliminar tabla job_runs\n")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("DROP TABLE job_runs"))
+            print("✅ Eliminada tabla: job_runs")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar tabla: {e}")
+        
+        conn.commit()
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,74 @@
+"""
+MIGRACIÓN MANUAL - Crear tabla leaderboard_entries
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea la tabla de clasificaciones y calcula la general (User.total_points) y
+la de cada jornada finalizada. Si la tabla ya existe, crea los índices que
+le falten (p. ej. ix_leaderboard_entries_scope_points, que usan las
+correcciones para recolocar usuarios)
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text, select
+from app.core.database import engine, SessionLocal
+from app.models.models import LeaderboardEntry, Gameweek
+from app.services.leaderboard import LeaderboardService
+
+def upgrade():
+    """Crea leaderboard_entries y calcula las clasificaciones existentes"""
+    
+    print("\n🔄 Aplicando migración: Crear tabla leaderboard_entries\n")
+    
+    LeaderboardEntry.__table__.create(engine, checkfirst=True)
+    print("✅ Tabla leaderboard_entries disponible")
+    
+    for index in LeaderboardEntry.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    print("✅ Índices de leaderboard_entries disponibles")
+    
+    db = SessionLocal()
+    try:
+        leaderboard = LeaderboardService(db)
+        gameweeks = db.scalars(
+            select(Gameweek).where(Gameweek.is_finished.is_(True)).order_by(Gameweek.number)
+        ).all()
+        for gameweek in gameweeks:
+            result = leaderboard.set_points(
+                gameweek.number, leaderboard.gameweek_user_points(gameweek.id), replace=True
+            )
+            print(f"✅ Jornada {gameweek.number}: {result['users']} usuarios")
+        
+        result = leaderboard.refresh_season()
+        db.commit()
+        print(f"✅ Clasificación general: {result['users']} usuarios")
+    finally:
+        db.close()
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Elimina la tabla leaderboard_entries"""
+    
+    print("\n🔄 Revirtiendo migración: Eliminar tabla leaderboard_entries\n")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("DROP TABLE leaderboard_entries"))
+            print("✅ Eliminada tabla: leaderboard_entries")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar tabla: {e}")
+        
+        conn.commit()
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,50 @@
+"""
+MIGRACIÓN MANUAL - Crear tabla market_snapshots
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea la tabla de fotos diarias del mercado. La primera foto la genera la
+siguiente ejecución de update_daily.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+from app.core.database import engine
+from app.models.models import MarketSnapshot
+
+def upgrade():
+    """Crea market_snapshots"""
+    
+    print("\n🔄 Aplicando migración: Crear tabla market_snapshots\n")
+    
+    MarketSnapshot.__table__.create(engine, checkfirst=True)
+    print("✅ Tabla market_snapshots disponible")
+    print("ℹ️  /api/market/snapshot devolverá 404 hasta la próxima ejecución de update_daily.py")
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Elimina la tabla market_snapshots"""
+    
+    print("\n🔄 Revirtiendo migración: Eliminar tabla market_snapshots\n")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("DROP TABLE market_snapshots"))
+            print("✅ Eliminada tabla: market_snapshots")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar tabla: {e}")
+        
+        conn.commit()
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
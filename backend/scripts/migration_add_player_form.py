@@ -0,0 +1,63 @@
+"""
+MIGRACIÓN MANUAL - Crear tabla player_form
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea la tabla de forma reciente y la rellena con la ventana de las últimas
+PLAYER_FORM_GAMEWEEKS jornadas finalizadas
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text, select, func
+from app.core.database import engine, SessionLocal
+from app.models.models import PlayerForm, Gameweek
+from app.services.player_form import PlayerFormService
+
+def upgrade():
+    """Crea player_form y calcula la ventana inicial"""
+    
+    print("\n🔄 Aplicando migración: Crear tabla player_form\n")
+    
+    PlayerForm.__table__.create(engine, checkfirst=True)
+    print("✅ Tabla player_form disponible")
+    
+    db = SessionLocal()
+    try:
+        last_gameweek = db.scalar(
+            select(func.max(Gameweek.number)).where(Gameweek.is_finished.is_(True))
+        )
+        if last_gameweek is None:
+            print("ℹ️  No hay jornadas finalizadas: la tabla queda vacía")
+        else:
+            result = PlayerFormService(db).rebuild(last_gameweek)
+            print(f"✅ Forma calculada hasta la jornada {last_gameweek}: {result['players']} jugadores")
+    finally:
+        db.close()
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Elimina la tabla player_form"""
+    
+    print("\n🔄 Revirtiendo migración: Eliminar tabla player_form\n")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("DROP TABLE player_form"))
+            print("✅ Eliminada tabla: player_form")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar tabla: {e}")
+        
+        conn.commit()
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
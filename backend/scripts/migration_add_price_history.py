@@ -0,0 +1,60 @@
+"""
+MIGRACIÓN MANUAL - Crear tabla player_price_history
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea el histórico de precios y guarda como primer punto de la serie el
+precio actual de todos los jugadores (a partir de aquí lo rellena
+update_daily.py cada día)
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text, select
+from app.core.database import engine, SessionLocal
+from app.models.models import Player, PlayerPriceHistory
+from app.services.price_history import PriceHistoryService
+
+def upgrade():
+    """Crea player_price_history y guarda la foto de hoy"""
+    
+    print("\n🔄 Aplicando migración: Crear tabla player_price_history\n")
+    
+    PlayerPriceHistory.__table__.create(engine, checkfirst=True)
+    print("✅ Tabla player_price_history disponible")
+    
+    db = SessionLocal()
+    try:
+        prices = dict(db.execute(select(Player.id, Player.current_price)).all())
+        rows = PriceHistoryService(db).record_day(prices)
+        db.commit()
+        print(f"✅ Precio actual guardado para {rows} jugadores")
+    finally:
+        db.close()
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Elimina la tabla player_price_history"""
+    
+    print("\n🔄 Revirtiendo migración: Eliminar tabla player_price_history\n")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("DROP TABLE player_price_history"))
+            print("✅ Eliminada tabla: player_price_history")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar tabla: {e}")
+        
+        conn.commit()
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
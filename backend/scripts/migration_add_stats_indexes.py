@@ -0,0 +1,115 @@
+"""
+MIGRACIÓN MANUAL - Índices compuestos de player_match_stats
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea los índices declarados en los modelos para las consultas calientes:
+- ix_player_match_stats_match_minutes (match_id, minutes_played, player_id, rating, fantasy_points)
+  cubre la carga por partido/jornada y la agregación de player_form
+- ix_player_match_stats_player_match (player_id, match_id)
+- ix_matches_gameweek_id (solo si matches no tiene ya un índice sobre gameweek_id)
+
+En MySQL elimina después las claves simples `player_id` y `match_id`, que
+quedan redundantes (los índices compuestos empiezan por esas columnas y
+siguen sirviendo a las claves foráneas)
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text, inspect
+from app.core.database import engine
+from app.models.models import PlayerMatchStats, Match
+
+# Índices declarados en los modelos que añade esta migración
+NEW_INDEXES = (
+    "ix_player_match_stats_match_minutes",
+    "ix_player_match_stats_player_match",
+    "ix_matches_gameweek_id",
+)
+
+# Claves simples del esquema original (ultimate_fantasy_legends.sql)
+REDUNDANT_KEYS = {"player_id": "player_id", "match_id": "match_id"}
+
+def _new_indexes():
+    """Objetos Index de los modelos, en el orden de NEW_INDEXES"""
+    indexes = {
+        index.name: index
+        for index in (*PlayerMatchStats.__table__.indexes, *Match.__table__.indexes)
+    }
+    return [indexes[name] for name in NEW_INDEXES]
+
+def _existing_indexes(table: str) -> dict:
+    """{nombre: columnas} de los índices actuales de una tabla"""
+    return {
+        index["name"]: index["column_names"]
+        for index in inspect(engine).get_indexes(table)
+    }
+
+def upgrade():
+    """Crea los índices compuestos y elimina las claves simples redundantes"""
+    
+    print("\n🔄 Aplicando migración: Índices compuestos de player_match_stats\n")
+    
+    for index in _new_indexes():
+        existing = _existing_indexes(index.table.name)
+        columns = [column.name for column in index.columns]
+        
+        if index.name in existing:
+            print(f"✅ El índice {index.name} ya existe")
+            continue
+        if columns in existing.values():
+            print(f"✅ {index.table.name}({', '.join(columns)}) ya está indexada")
+            continue
+        
+        index.create(engine)
+        print(f"✅ Creado índice: {index.name} ({', '.join(columns)})")
+    
+    if engine.dialect.name == "mysql":
+        existing = _existing_indexes("player_match_stats")
+        with engine.connect() as conn:
+            for name, column in REDUNDANT_KEYS.items():
+                if existing.get(name) != [column]:
+                    continue
+                try:
+                    conn.execute(text(f"ALTER TABLE player_match_stats DROP INDEX `{name}`"))
+                    print(f"✅ Eliminada clave redundante: {name}")
+                except Exception as e:
+                    print(f"⚠️  Error al eliminar clave {name}: {e}")
+            conn.commit()
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Restaura las claves simples y elimina los índices compuestos"""
+    
+    print("\n🔄 Revirtiendo migración: Índices compuestos de player_match_stats\n")
+    
+    if engine.dialect.name == "mysql":
+        existing = _existing_indexes("player_match_stats")
+        with engine.connect() as conn:
+            for name, column in REDUNDANT_KEYS.items():
+                if name in existing:
+                    continue
+                conn.execute(text(f"ALTER TABLE player_match_stats ADD KEY `{name}` (`{column}`)"))
+                print(f"✅ Restaurada clave: {name}")
+            conn.commit()
+    
+    for index in _new_indexes():
+        if index.name not in _existing_indexes(index.table.name):
+            continue
+        try:
+            index.drop(engine)
+            print(f"✅ Eliminado índice: {index.name}")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar índice {index.name}: {e}")
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,72 @@
+"""
+MIGRACIÓN MANUAL - Crear tabla team_gameweek_points
+Ejecuta este script directamente si no tienes Alembic configurado
+
+Crea la tabla de puntos por equipo y jornada y liquida las jornadas ya
+finalizadas. Por defecto solo registra sus filas, sin tocar
+Team.total_fantasy_points ni User.total_points; con el argumento "totales"
+también suma esos puntos a los totales (si nunca se habían sumado)
+
+Uso:
+    python scripts/migration_add_team_gameweek_points.py [totales|downgrade]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text, select
+from app.core.database import engine, SessionLocal
+from app.models.models import TeamGameweekPoints, Gameweek
+from app.services.gameweek_settlement import GameweekSettlementService
+
+def upgrade(update_totals: bool = False):
+    """Crea team_gameweek_points y liquida las jornadas finalizadas"""
+    
+    print("\n🔄 Aplicando migración: Crear tabla team_gameweek_points\n")
+    
+    TeamGameweekPoints.__table__.create(engine, checkfirst=True)
+    print("✅ Tabla team_gameweek_points disponible")
+    
+    if not update_totals:
+        print("ℹ️  Las jornadas se registran sin modificar los totales de equipos y usuarios")
+    
+    db = SessionLocal()
+    try:
+        settlement = GameweekSettlementService(db)
+        gameweeks = db.scalars(
+            select(Gameweek).where(Gameweek.is_finished.is_(True)).order_by(Gameweek.number)
+        ).all()
+        for gameweek in gameweeks:
+            result = settlement.settle(gameweek, update_totals=update_totals)
+            print(f"✅ Jornada {gameweek.number}: {result['teams']} equipos, {result['total_points']} puntos")
+        
+        db.commit()
+    finally:
+        db.close()
+    
+    print("\n✅ Migración completada\n")
+
+def downgrade():
+    """Elimina la tabla team_gameweek_points"""
+    
+    print("\n🔄 Revirtiendo migración: Eliminar tabla team_gameweek_points\n")
+    
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("DROP TABLE team_gameweek_points"))
+            print("✅ Eliminada tabla: team_gameweek_points")
+        except Exception as e:
+            print(f"⚠️  Error al eliminar tabla: {e}")
+        
+        conn.commit()
+    
+    print("\n✅ Reversión completada\n")
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade(update_totals=len(sys.argv) > 1 and sys.argv[1] == "totales")
@@ -30,6 +30,8 @@ from scripts.sistema_puntos_oficial import (
     ScoringConfig,
     SportmonksAPIClient,
     StatsExtractor,
+    CompiledStatsExtractor,
+    COMPACT_FIXTURE_INCLUDES,
     API_TOKEN,
     logger
 )
@@ -126,13 +128,19 @@ def recargar_3_jornadas_completas():
         
         # PASO 3: Configurar sistema de puntos
         api_client = SportmonksAPIClient(API_TOKEN)
+        # Catálogo de tipos una vez: los detalles llegan sin el objeto `type`
+        stats_extractor = CompiledStatsExtractor(api_client.get_stat_types())
         config = BalancedScoringConfig()
         scoring_engine = FantasyScoringEngine(config)
         
         total_players_saved = 0
         
-        # PASO 4: Procesar cada partido
-        for idx, match in enumerate(matches, 1):
+        # PASO 4: Procesar cada partido (descarga concurrente, en orden de llegada)
+        matches_by_fixture = {match.sportmonks_id: match for match in matches}
+        fixtures = api_client.fetch_fixtures(list(matches_by_fixture), COMPACT_FIXTURE_INCLUDES)
+        
+        for idx, (fixture_id, fixture_data) in enumerate(fixtures, 1):
+            match = matches_by_fixture[fixture_id]
             gameweek_num = db.query(Gameweek).filter(Gameweek.id == match.gameweek_id).first().number
             
             print(f"\n{'='*130}")
@@ -141,8 +149,6 @@ def recargar_3_jornadas_completas():
             print(f"🏟️  {match.home_team} {match.home_score} - {match.away_score} {match.away_team}")
             print(f"📡 Sportmonks ID: {match.sportmonks_id}\n")
             
-            # Obtener datos del partido desde la API
-            fixture_data = api_client.get_fixture(match.sportmonks_id)
             if not fixture_data:
                 print(f"❌ No se pudo obtener datos del fixture {match.sportmonks_id}")
                 continue
@@ -177,7 +183,7 @@ def recargar_3_jornadas_completas():
                 )
                 
                 # Extraer stats
-                stats = StatsExtractor.extract_player_stats(player_entry, clean_sheet)
+                stats = stats_extractor.extract(player_entry, clean_sheet).to_player_stats()
                 
                 # Calcular puntos
                 stats = scoring_engine.calculate_points(stats)
@@ -24,6 +24,7 @@ from scripts.sistema_puntos_oficial import (
     ScoringConfig,
     SportmonksAPIClient,
     StatsExtractor,
+    StreamingStatsExtractor,
     API_TOKEN,
     logger
 )
@@ -103,22 +104,32 @@ def recargar_match_33():
         config = BalancedScoringConfig()
         scoring_engine = FantasyScoringEngine(config)
         
-        # Obtener datos del partido
-        print(f"📡 Obteniendo datos de la API...\n")
-        fixture_data = api_client.get_fixture(match.sportmonks_id)
+        # Obtener datos del partido: si ya está en la caché en disco se lee en
+        # streaming (gzip + ijson), sin cargar la respuesta completa
+        meta = {}
+        players_stats = StreamingStatsExtractor.extract_cached_fixture(api_client, match.sportmonks_id, meta)
         
-        if not fixture_data:
-            print(f"❌ No se pudieron obtener datos del fixture {match.sportmonks_id}")
-            return
-        
-        lineups = fixture_data.get('lineups', [])
-        participants = fixture_data.get('participants', [])
-        
-        # Info equipos
-        home_team = next((p for p in participants 
-                         if p.get('meta', {}).get('location') == 'home'), {})
-        away_team = next((p for p in participants 
-                         if p.get('meta', {}).get('location') == 'away'), {})
+        if players_stats is not None:
+            print(f"📦 Fixture leído de la caché en disco\n")
+            home_team_id = meta["participants"].get('home')
+            away_team_id = meta["participants"].get('away')
+        else:
+            print(f"📡 Obteniendo datos de la API...\n")
+            fixture_data = api_client.get_fixture(match.sportmonks_id)
+            
+            if not fixture_data:
+                print(f"❌ No se pudieron obtener datos del fixture {match.sportmonks_id}")
+                return
+            
+            participants = fixture_data.get('participants', [])
+            home_team_id = next((p.get('id') for p in participants
+                                 if p.get('meta', {}).get('location') == 'home'), None)
+            away_team_id = next((p.get('id') for p in participants
+                                 if p.get('meta', {}).get('location') == 'away'), None)
+            players_stats = [
+                StatsExtractor.extract_player_stats(player_entry)
+                for player_entry in fixture_data.get('lineups', [])
+            ]
         
         home_score = match.home_score
         away_score = match.away_score
@@ -127,33 +138,31 @@ def recargar_match_33():
         players_with_stats = 0
         played_player_ids = set()
         
-        for player_entry in lineups:
-            # Determinar clean sheet
-            clean_sheet = StatsExtractor.determine_clean_sheet(
-                StatsExtractor.map_position(player_entry.get('type_id')),
-                player_entry.get('participant_id'),
-                home_team.get('id'),
-                away_team.get('id'),
+        for stats in players_stats:
+            # Determinar clean sheet (con el marcador guardado en la BD)
+            stats.clean_sheet = StatsExtractor.determine_clean_sheet(
+                stats.position,
+                stats.participant_id,
+                home_team_id,
+                away_team_id,
                 home_score,
                 away_score
             )
             
-            # Extraer stats
-            stats = StatsExtractor.extract_player_stats(player_entry, clean_sheet)
             stats = scoring_engine.calculate_points(stats)
             
             if stats.minutes_played == 0:
                 continue
             
             player_name = stats.player_name
-            sportmonks_player_id = player_entry.get('player_id')
+            sportmonks_player_id = stats.player_id
             
             player = db.query(Player).filter(
                 Player.sportmonks_id == sportmonks_player_id
             ).first()
             
             if not player:
-                player_team = match.home_team if player_entry.get('participant_id') == home_team.get('id') else match.away_team
+                player_team = match.home_team if stats.participant_id == home_team_id else match.away_team
                 
                 if stats.position.name == 'GK':
                     db_position = DBPosition.GK
@@ -5,16 +5,23 @@ Mejoras: Modularidad, validaciones, logging, configuración flexible, testing
 VALORES REBALANCEADOS aplicados ✅
 """
 
+import gzip
+import io
 import os
-import requests
+import sys
+import ijson
 from dotenv import load_dotenv
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 import math
 import logging
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.sportmonks_client import SportmonksClient, FIXTURE_INCLUDES
+
 load_dotenv()
 
 # ============================================
@@ -122,14 +129,45 @@ class ScoringConfig:
     penalty_committed_penalty: int = -2  # Cometer penalti
 
 
-@dataclass
-class PlayerStats:
-    """Estadísticas de un jugador"""
+@dataclass(slots=True)
+class LazyPointsBreakdown:
+    """
+    Desglose de puntos perezoso, compartido por los PlayerStats de este
+    módulo y de fantasy_scoring_system_improved.py
+    
+    calculate_points guarda el motor que puntuó la fila y borra el desglose
+    anterior; el desglose se construye en el primer acceso a points_breakdown
+    """
+    
+    _breakdown: Optional[Dict[str, float]] = field(default=None, init=False, repr=False, compare=False)
+    _engine: Optional["FantasyScoringEngine"] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def points_breakdown(self) -> Dict[str, float]:
+        """Desglose por categoría (se calcula en el primer acceso con el motor que puntuó)"""
+        if self._breakdown is None:
+            self._breakdown = self._engine.get_breakdown(self) if self._engine else {}
+        return self._breakdown
+    
+    @points_breakdown.setter
+    def points_breakdown(self, breakdown: Dict[str, float]):
+        self._breakdown = breakdown
+
+
+@dataclass(slots=True)
+class PlayerStats(LazyPointsBreakdown):
+    """
+    Estadísticas de un jugador
+    
+    Usa __slots__ (sin __dict__ por instancia) y el desglose de puntos se
+    construye solo cuando se lee points_breakdown
+    """
     
     # Identificación
     player_name: str = ""
     position: Optional[Position] = None
     participant_id: int = 0
+    player_id: int = 0
     
     # Básicos
     minutes_played: int = 0
@@ -181,7 +219,6 @@ class PlayerStats:
     
     # Resultados
     fantasy_points: int = 0
-    points_breakdown: Dict[str, float] = field(default_factory=dict)
     
     @property
     def total_losses(self) -> int:
@@ -263,102 +300,59 @@ class FantasyScoringEngine:
     
     def __init__(self, config: Optional[ScoringConfig] = None):
         self.config = config or ScoringConfig()
+        
+        # Categorías en el orden del desglose: (nombre, método de cálculo)
+        self._categories = [
+            ('Participación', self._calculate_participation),
+            ('Goles', self._calculate_goals),
+            ('Asistencias', self._calculate_assists),
+            ('Portería a cero', self._calculate_clean_sheet),
+            ('Nota', self._calculate_rating),
+            ('Tarjetas', self._calculate_cards),
+            ('Paradas', self._calculate_saves),
+            ('Goles recibidos', self._calculate_goals_conceded),
+            ('Bonus ataque', self._calculate_attack_bonus),
+            ('Bonus defensa', self._calculate_defense_bonus),
+            ('Pérdidas', self._calculate_losses),
+            ('Bonus extras', self._calculate_extra_bonus),
+            ('Penaltis', self._calculate_penalties),
+        ]
+        
         logger.info("Motor de puntuación inicializado con valores REBALANCEADOS")
     
-    def calculate_points(self, stats: PlayerStats) -> PlayerStats:
+    def calculate_points(self, stats: PlayerStats, with_breakdown: bool = False) -> PlayerStats:
         """
         Calcula los puntos fantasy de un jugador
-        Devuelve el objeto PlayerStats actualizado con puntos y desglose
+        Devuelve el objeto PlayerStats actualizado con los puntos; el desglose
+        se genera al leer stats.points_breakdown (o aquí mismo si with_breakdown=True)
         """
-        breakdown = {}
-        total_points = 0.0
+        # Actualizar stats (re-puntuar invalida el desglose anterior)
+        stats._breakdown = None
+        stats._engine = self
+        stats.fantasy_points = self._total_points(stats)
+        if with_breakdown:
+            stats._breakdown = self.get_breakdown(stats)
         
-        # 1. Participación
-        participation_points = self._calculate_participation(stats)
-        if participation_points:
-            breakdown['Participación'] = participation_points
-            total_points += participation_points
-        
-        # 2. Goles
-        goals_points = self._calculate_goals(stats)
-        if goals_points:
-            breakdown['Goles'] = goals_points
-            total_points += goals_points
-        
-        # 3. Asistencias
-        assists_points = self._calculate_assists(stats)
-        if assists_points:
-            breakdown['Asistencias'] = assists_points
-            total_points += assists_points
-        
-        # 4. Clean Sheet
-        clean_sheet_points = self._calculate_clean_sheet(stats)
-        if clean_sheet_points:
-            breakdown['Portería a cero'] = clean_sheet_points
-            total_points += clean_sheet_points
-        
-        # 5. Rating
-        rating_points = self._calculate_rating(stats)
-        if rating_points:
-            breakdown['Nota'] = rating_points
-            total_points += rating_points
-        
-        # 6. Tarjetas
-        cards_points = self._calculate_cards(stats)
-        if cards_points:
-            breakdown['Tarjetas'] = cards_points
-            total_points += cards_points
-        
-        # 7. Paradas (solo GK)
-        saves_points = self._calculate_saves(stats)
-        if saves_points:
-            breakdown['Paradas'] = saves_points
-            total_points += saves_points
-        
-        # 8. Goles recibidos
-        conceded_points = self._calculate_goals_conceded(stats)
-        if conceded_points:
-            breakdown['Goles recibidos'] = conceded_points
-            total_points += conceded_points
-        
-        # 9. Bonus de ataque
-        attack_points = self._calculate_attack_bonus(stats)
-        if attack_points:
-            breakdown['Bonus ataque'] = attack_points
-            total_points += attack_points
-        
-        # 10. Bonus defensivos
-        defense_points = self._calculate_defense_bonus(stats)
-        if defense_points:
-            breakdown['Bonus defensa'] = defense_points
-            total_points += defense_points
-        
-        # 11. Pérdidas de balón
-        losses_points = self._calculate_losses(stats)
-        if losses_points:
-            breakdown['Pérdidas'] = losses_points
-            total_points += losses_points
-        
-        # 12. Bonus extras
-        extra_points = self._calculate_extra_bonus(stats)
-        if extra_points:
-            breakdown['Bonus extras'] = extra_points
-            total_points += extra_points
-        
-        # 13. Penaltis
-        penalty_points = self._calculate_penalties(stats)
-        if penalty_points:
-            breakdown['Penaltis'] = penalty_points
-            total_points += penalty_points
-        
-        # Actualizar stats
-        stats.fantasy_points = round(total_points)
-        stats.points_breakdown = breakdown
-        
-        logger.debug(f"{stats.player_name}: {stats.fantasy_points} puntos")
+        logger.debug("%s: %s puntos", stats.player_name, stats.fantasy_points)
         
         return stats
     
+    def _total_points(self, stats: PlayerStats) -> int:
+        """Suma de todas las categorías, redondeada"""
+        total_points = 0.0
+        for _, calculate in self._categories:
+            total_points += calculate(stats)
+        return round(total_points)
+    
+    def get_breakdown(self, stats: PlayerStats) -> Dict[str, float]:
+        """Desglose de puntos por categoría (solo las que suman o restan)"""
+        breakdown = {}
+        for category, calculate in self._categories:
+            points = calculate(stats)
+            if points:
+                breakdown[category] = points
+        return breakdown
+    
     # ========================================
     # MÉTODOS DE CÁLCULO INDIVIDUAL
     # ========================================
@@ -515,30 +509,46 @@ class FantasyScoringEngine:
 # ============================================
 
 class SportmonksAPIClient:
-    """Cliente para interactuar con Sportmonks API"""
+    """Cliente para interactuar con Sportmonks API (usa el cliente compartido con pool y rate limit)"""
     
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, **client_options):
         if not api_token:
             raise ValueError("API token is required")
         self.api_token = api_token
         self.base_url = API_BASE_URL
+        self.client = SportmonksClient(api_token, base_url=self.base_url, timeout=API_TIMEOUT, **client_options)
     
-    def get_fixture(self, fixture_id: int) -> Optional[Dict]:
+    def get_fixture(self, fixture_id: int, include: str = FIXTURE_INCLUDES) -> Optional[Dict]:
         """Obtiene datos de un partido"""
-        url = f"{self.base_url}/fixtures/{fixture_id}"
-        params = {
-            "api_token": self.api_token,
-            "include": "lineups.details.type;participants;scores"
-        }
+        return self.client.get_fixture(fixture_id, include)
+    
+    def fetch_fixtures(self, fixture_ids: List[int],
+                       include: str = FIXTURE_INCLUDES) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """Obtiene varios partidos en paralelo; devuelve (fixture_id, datos) según llegan"""
+        return self.client.fetch_fixtures(fixture_ids, include)
+    
+    def open_cached_fixture(self, fixture_id: int, include: str = FIXTURE_INCLUDES) -> Optional[BinaryIO]:
+        """Partido guardado en la caché en disco (gzip) como stream, o None"""
+        return self.client.open_cached_fixture(fixture_id, include)
+    
+    def get_stat_types(self) -> Dict[int, str]:
+        """
+        Catálogo de tipos de Sportmonks: {type_id: developer_name}
+        (endpoint core/types, paginado; pasa por la caché del cliente)
+        """
+        core_url = self.base_url.rsplit('/', 1)[0] + "/core"
+        types = {}
+        page = 1
         
-        try:
-            logger.info(f"Obteniendo fixture {fixture_id}...")
-            response = requests.get(url, params=params, timeout=API_TIMEOUT)
-            response.raise_for_status()
-            return response.json().get('data')
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error al obtener fixture {fixture_id}: {e}")
-            return None
+        with SportmonksClient(self.api_token, base_url=core_url, timeout=API_TIMEOUT) as core_client:
+            while True:
+                response = core_client.get("types", {"page": page})
+                for item in response.get('data', []):
+                    types[item['id']] = item.get('developer_name')
+                
+                if not response.get('pagination', {}).get('has_more'):
+                    return types
+                page += 1
 
 
 # ============================================
@@ -560,6 +570,7 @@ class StatsExtractor:
             player_name=player_entry.get('player_name', 'N/A'),
             position=StatsExtractor.map_position(player_entry.get('type_id')),
             participant_id=player_entry.get('participant_id', 0),
+            player_id=player_entry.get('player_id', 0),
             clean_sheet=clean_sheet
         )
         
@@ -600,6 +611,320 @@ class StatsExtractor:
         return (away_score == 0) if is_home else (home_score == 0)
 
 
+# ============================================
+# CLASE: EXTRACTOR COMPILADO (type_id -> hueco)
+# ============================================
+
+# Includes sin el objeto `type` anidado en cada detalle (el extractor compilado
+# solo necesita detail.type_id): respuestas mucho más pequeñas
+COMPACT_FIXTURE_INCLUDES = "lineups.details;participants;scores"
+
+# Orden fijo de los huecos de StatsRow.values
+STAT_FIELDS = tuple(dict.fromkeys(STAT_MAPPING.values()))
+STAT_SLOTS = {field_name: slot for slot, field_name in enumerate(STAT_FIELDS)}
+
+
+def _int_value(value) -> int:
+    try:
+        return int(value) if value else 0
+    except (ValueError, TypeError):
+        logger.warning(f"Error convirtiendo {value!r} a entero")
+        return 0
+
+
+def _float_value(value) -> float:
+    try:
+        return float(value) if value else 0.0
+    except (ValueError, TypeError):
+        logger.warning(f"Error convirtiendo {value!r} a decimal")
+        return 0.0
+
+
+class StatsRow:
+    """
+    Registro compacto de un jugador: identificación + lista fija de valores
+    en el orden de STAT_FIELDS (sin diccionarios por instancia)
+    """
+    
+    __slots__ = ('player_name', 'position', 'participant_id', 'player_id', 'clean_sheet', 'values')
+    
+    def __init__(self, player_name: str = "", position: Optional[Position] = None,
+                 participant_id: int = 0, player_id: int = 0, clean_sheet: bool = False):
+        self.player_name = player_name
+        self.position = position
+        self.participant_id = participant_id
+        self.player_id = player_id
+        self.clean_sheet = clean_sheet
+        self.values = [0] * len(STAT_FIELDS)
+        self.values[STAT_SLOTS['rating']] = 0.0
+    
+    def get(self, field_name: str):
+        """Valor de una estadística por nombre de campo"""
+        return self.values[STAT_SLOTS[field_name]]
+    
+    def to_player_stats(self) -> PlayerStats:
+        """Convierte a PlayerStats para el motor de puntuación"""
+        return PlayerStats(
+            player_name=self.player_name,
+            position=self.position,
+            participant_id=self.participant_id,
+            player_id=self.player_id,
+            clean_sheet=self.clean_sheet,
+            **dict(zip(STAT_FIELDS, self.values))
+        )
+
+
+class CompiledStatsExtractor:
+    """
+    Extractor con tabla de despacho precompilada: type_id -> (hueco, conversor)
+    
+    Cada detalle se resuelve con una sola búsqueda por su type_id entero, sin
+    leer el objeto `type` anidado, así que funciona con COMPACT_FIXTURE_INCLUDES.
+    
+    Uso:
+        extractor = CompiledStatsExtractor(api_client.get_stat_types())
+        data = api_client.get_fixture(fixture_id, COMPACT_FIXTURE_INCLUDES)
+        rows = [extractor.extract(entry) for entry in data['lineups']]
+    """
+    
+    def __init__(self, type_names: Dict[int, str]):
+        """
+        Args:
+            type_names: {type_id: developer_name} (ver SportmonksAPIClient.get_stat_types)
+        """
+        self.dispatch = {
+            type_id: (
+                STAT_SLOTS[STAT_MAPPING[developer_name]],
+                _float_value if STAT_MAPPING[developer_name] == 'rating' else _int_value
+            )
+            for type_id, developer_name in type_names.items()
+            if developer_name in STAT_MAPPING
+        }
+    
+    @classmethod
+    def from_lineups(cls, lineups: List[Dict]) -> "CompiledStatsExtractor":
+        """
+        Aprende la tabla type_id -> developer_name de una respuesta que sí
+        trae el include `lineups.details.type` (útil sin acceso a core/types)
+        """
+        type_names = {}
+        for player_entry in lineups:
+            for stat in player_entry.get('details', []):
+                developer_name = stat.get('type', {}).get('developer_name')
+                if developer_name:
+                    type_names[stat.get('type_id')] = developer_name
+        return cls(type_names)
+    
+    def extract(self, player_entry: Dict, clean_sheet: bool = False) -> StatsRow:
+        """Extrae un StatsRow de una entrada de lineup"""
+        row = StatsRow(
+            player_name=player_entry.get('player_name', 'N/A'),
+            position=StatsExtractor.map_position(player_entry.get('type_id')),
+            participant_id=player_entry.get('participant_id', 0),
+            player_id=player_entry.get('player_id', 0),
+            clean_sheet=clean_sheet
+        )
+        
+        values = row.values
+        dispatch = self.dispatch
+        
+        for stat in player_entry.get('details', ()):
+            target = dispatch.get(stat.get('type_id'))
+            if target is not None:
+                slot, convert = target
+                values[slot] = convert(stat.get('data', {}).get('value'))
+        
+        return row
+
+
+# ============================================
+# CLASE: EXTRACTOR EN STREAMING
+# ============================================
+
+class StreamingStatsExtractor:
+    """
+    Extrae estadísticas de un fixture leyendo el JSON de forma incremental (ijson)
+    
+    No construye el árbol completo de lineups -> details -> type: de cada detalle
+    solo guarda type.developer_name y data.value, y emite un PlayerStats por
+    jugador en cuanto termina su entrada. Pensado para ingerir temporadas
+    completas o reprocesar volcados de fixtures guardados en disco.
+    
+    Uso:
+        players = StreamingStatsExtractor.extract_fixture_file("fixture_19428039.json.gz")
+        players = StreamingStatsExtractor.extract_cached_fixture(api_client, 19428039)
+    """
+    
+    # Ruta del fixture dentro de un fichero de la caché de Sportmonks
+    CACHE_ROOT = "body.data"
+    
+    @staticmethod
+    def _convert(field_name: str, value):
+        """Misma conversión que StatsExtractor.extract_player_stats"""
+        try:
+            if field_name == 'rating':
+                return float(value) if value else 0.0
+            return int(value) if value else 0
+        except (ValueError, TypeError):
+            logger.warning(f"Error convirtiendo {field_name}={value}")
+            return 0
+    
+    @staticmethod
+    def iter_player_stats(source, root: str = "data", meta: Optional[Dict] = None,
+                          buf_size: int = 8192) -> Iterator[PlayerStats]:
+        """
+        Recorre el JSON y va emitiendo un PlayerStats por jugador (sin clean sheet)
+        
+        Args:
+            source: Fichero binario o bytes con la respuesta de /fixtures/{id}
+            root: Ruta hasta el objeto del fixture ("data" en la respuesta de la API,
+                  "body.data" en un fichero de la caché de Sportmonks)
+            meta: Si se pasa un dict, se rellena con los datos de equipos y marcador
+                  ({"participants": {...}, "scores": {...}}) que aparezcan en el stream
+            buf_size: Bytes leídos por bloque; la memoria de pico depende de este
+                      valor y no del tamaño del fichero
+        """
+        if isinstance(source, (bytes, str)):
+            source = io.BytesIO(source.encode() if isinstance(source, str) else source)
+        
+        lineup = f"{root}.lineups.item"
+        detail = f"{lineup}.details.item"
+        developer_name_key = f"{detail}.type.developer_name"
+        value_key = f"{detail}.data.value"
+        participant = f"{root}.participants.item"
+        score = f"{root}.scores.item"
+        
+        if meta is not None:
+            meta.setdefault("participants", {})  # location -> id
+            meta.setdefault("scores", {})        # participant_id -> goles (CURRENT)
+        
+        lineup_fields = {
+            f"{lineup}.player_name": 'player_name',
+            f"{lineup}.participant_id": 'participant_id',
+            f"{lineup}.player_id": 'player_id',
+        }
+        meta_fields = {
+            f"{participant}.id": 'id',
+            f"{participant}.meta.location": 'location',
+            f"{score}.participant_id": 'participant_id',
+            f"{score}.description": 'description',
+            f"{score}.score.goals": 'goals',
+        }
+        
+        # La mayoría de eventos (id, name, code... del objeto type) no interesan:
+        # se descartan con una sola búsqueda en un set
+        relevant = {developer_name_key, value_key, detail, lineup, f"{lineup}.type_id", *lineup_fields}
+        if meta is not None:
+            relevant.update({participant, score, *meta_fields})
+        
+        stats = None
+        developer_name = value = None
+        current = {}
+        
+        for prefix, event, data in ijson.parse(source, buf_size=buf_size, use_float=True):
+            if prefix not in relevant:
+                continue
+            
+            # --- Detalles de estadística de un jugador ---
+            if prefix == value_key:
+                value = data
+            elif prefix == developer_name_key:
+                developer_name = data
+            elif prefix == detail:
+                if event == 'start_map':
+                    developer_name = value = None
+                elif event == 'end_map':
+                    field_name = STAT_MAPPING.get(developer_name)
+                    if field_name:
+                        setattr(stats, field_name, StreamingStatsExtractor._convert(field_name, value))
+            
+            # --- Entrada de alineación ---
+            elif prefix == lineup:
+                if event == 'start_map':
+                    # Sin type_id: misma posición por defecto que StatsExtractor (FWD)
+                    stats = PlayerStats(player_name='N/A', position=StatsExtractor.map_position(None))
+                elif event == 'end_map':
+                    yield stats
+                    stats = None
+            elif prefix in lineup_fields:
+                setattr(stats, lineup_fields[prefix], data)
+            elif prefix == f"{lineup}.type_id":
+                stats.position = StatsExtractor.map_position(data)
+            
+            # --- Equipos y marcador (pocos datos) ---
+            elif prefix in meta_fields:
+                current[meta_fields[prefix]] = data
+            elif event == 'start_map':
+                current = {}
+            elif event == 'end_map' and prefix == participant:
+                meta["participants"][current.get('location')] = current.get('id')
+            elif event == 'end_map' and current.get('description') == 'CURRENT':
+                meta["scores"][current.get('participant_id')] = current.get('goals')
+    
+    @staticmethod
+    def extract_fixture_stats(source, root: str = "data", buf_size: int = 8192,
+                              meta: Optional[Dict] = None) -> List[PlayerStats]:
+        """
+        Extrae todos los jugadores de un fixture y calcula su clean sheet
+        
+        El marcador puede venir después de las alineaciones en el JSON, así que
+        el clean sheet se resuelve al final sobre los registros ya compactados.
+        Si se pasa `meta`, se rellena con los equipos y el marcador (ver
+        iter_player_stats)
+        """
+        meta = {} if meta is None else meta
+        players = list(StreamingStatsExtractor.iter_player_stats(source, root, meta, buf_size))
+        
+        home_id = meta["participants"].get('home')
+        away_id = meta["participants"].get('away')
+        home_score = meta["scores"].get(home_id, 0)
+        away_score = meta["scores"].get(away_id, 0)
+        
+        for stats in players:
+            stats.clean_sheet = StatsExtractor.determine_clean_sheet(
+                stats.position,
+                stats.participant_id,
+                home_id,
+                away_id,
+                home_score,
+                away_score
+            )
+        
+        return players
+    
+    @staticmethod
+    def extract_fixture_file(path: str, root: str = "data", buf_size: int = 8192,
+                             meta: Optional[Dict] = None) -> List[PlayerStats]:
+        """
+        Extrae un fixture de un volcado en disco (.json o .json.gz)
+        
+        Los .gz se descomprimen en streaming: nunca se tiene el JSON completo
+        en memoria
+        """
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rb") as f:
+            return StreamingStatsExtractor.extract_fixture_stats(f, root, buf_size, meta)
+    
+    @staticmethod
+    def extract_cached_fixture(api_client: "SportmonksAPIClient", fixture_id: int,
+                               meta: Optional[Dict] = None, include: str = FIXTURE_INCLUDES,
+                               buf_size: int = 8192) -> Optional[List[PlayerStats]]:
+        """
+        Extrae un fixture de la caché en disco de Sportmonks (gzip) sin
+        cargar la respuesta completa ni pedirla a la API
+        
+        Returns:
+            list | None: Jugadores del fixture, o None si no está en la caché
+        """
+        stream = api_client.open_cached_fixture(fixture_id, include)
+        if stream is None:
+            return None
+        with stream:
+            return StreamingStatsExtractor.extract_fixture_stats(
+                stream, StreamingStatsExtractor.CACHE_ROOT, buf_size, meta
+            )
+
+
 # ============================================
 # CLASE: PRESENTADOR DE RESULTADOS
 # ============================================
@@ -0,0 +1,170 @@
+"""
+Test: StreamingStatsExtractor frente a StatsExtractor
+
+Comprueba que el extractor en streaming devuelve exactamente los mismos
+PlayerStats (incluido el clean sheet) que StatsExtractor para el mismo
+fixture, leyéndolo:
+- de la caché en disco de Sportmonks (gzip, extract_cached_fixture)
+- de un volcado .json.gz (extract_fixture_file)
+- de la respuesta en memoria (extract_fixture_stats)
+
+Uso:
+    python scripts/test_streaming_extractor.py                  # fixture sintético
+    python scripts/test_streaming_extractor.py fixture.json     # volcado de /fixtures/{id}
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.sportmonks_cache import SportmonksCache
+from scripts.sistema_puntos_oficial import (
+    SportmonksAPIClient,
+    StatsExtractor,
+    StreamingStatsExtractor,
+    STAT_MAPPING,
+    POSITION_TYPE_MAPPING,
+    FIXTURE_INCLUDES
+)
+
+FIXTURE_ID = 19428039
+
+
+def build_fixture() -> dict:
+    """Respuesta sintética de /fixtures/{id} con FIXTURE_INCLUDES"""
+    developer_names = list(STAT_MAPPING)
+    position_types = list(POSITION_TYPE_MAPPING) + [None]
+    lineups = []
+
+    for index in range(22):
+        participant_id = 10 if index < 11 else 20
+        details = [
+            {
+                "id": index * 100 + slot,
+                "type_id": 1000 + slot,
+                "data": {"value": "7.4" if STAT_MAPPING[name] == 'rating' else (index + slot) % 4},
+                "type": {"id": 1000 + slot, "name": name.title(), "code": name.lower(), "developer_name": name}
+            }
+            for slot, name in enumerate(developer_names)
+            if (index + slot) % 3
+        ]
+        # Un tipo que no puntúa y un valor no convertible
+        details.append({"id": index * 100 + 99, "type_id": 9999, "data": {"value": 1},
+                        "type": {"id": 9999, "developer_name": "UNKNOWN_STAT"}})
+        if index == 5:
+            details[0]["data"]["value"] = "n/a"
+
+        entry = {
+            "id": index,
+            "player_id": 5000 + index,
+            "participant_id": participant_id,
+            "player_name": f"Jugador {index}",
+            "details": details
+        }
+        position_type = position_types[index % len(position_types)]
+        if position_type is not None:
+            entry["type_id"] = position_type
+        lineups.append(entry)
+
+    return {
+        "data": {
+            "id": FIXTURE_ID,
+            "state_id": 5,
+            "lineups": lineups,
+            # El marcador va detrás de las alineaciones, como en la API
+            "participants": [
+                {"id": 10, "name": "Local", "meta": {"location": "home"}},
+                {"id": 20, "name": "Visitante", "meta": {"location": "away"}}
+            ],
+            "scores": [
+                {"participant_id": 10, "description": "1ST_HALF", "score": {"goals": 0}},
+                {"participant_id": 10, "description": "CURRENT", "score": {"goals": 2}},
+                {"participant_id": 20, "description": "CURRENT", "score": {"goals": 0}}
+            ]
+        }
+    }
+
+
+def expected_stats(fixture: dict) -> list:
+    """Resultado de referencia con StatsExtractor (mismo clean sheet que extract_fixture_stats)"""
+    participants = fixture.get('participants', [])
+    home_id = next((p['id'] for p in participants if p.get('meta', {}).get('location') == 'home'), None)
+    away_id = next((p['id'] for p in participants if p.get('meta', {}).get('location') == 'away'), None)
+    scores = {
+        s['participant_id']: s['score']['goals']
+        for s in fixture.get('scores', []) if s.get('description') == 'CURRENT'
+    }
+
+    result = []
+    for player_entry in fixture.get('lineups', []):
+        clean_sheet = StatsExtractor.determine_clean_sheet(
+            StatsExtractor.map_position(player_entry.get('type_id')),
+            player_entry.get('participant_id'),
+            home_id,
+            away_id,
+            scores.get(home_id, 0),
+            scores.get(away_id, 0)
+        )
+        result.append(StatsExtractor.extract_player_stats(player_entry, clean_sheet))
+    return result
+
+
+def check(name: str, expected: list, actual) -> bool:
+    if actual == expected:
+        print(f"✅ {name}: {len(actual)} jugadores idénticos")
+        return True
+
+    print(f"❌ {name}: distinto de StatsExtractor")
+    for exp, act in zip(expected, actual or []):
+        if exp != act:
+            print(f"   esperado: {exp}\n   obtenido: {act}")
+            break
+    return False
+
+
+def main() -> bool:
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            response = json.load(f)
+        print(f"\n🧪 Fixture de {sys.argv[1]}\n")
+    else:
+        response = build_fixture()
+        print(f"\n🧪 Fixture sintético\n")
+
+    fixture_id = response["data"].get("id", FIXTURE_ID)
+    expected = expected_stats(response["data"])
+    ok = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 1. Caché en disco: la misma clave que usaría get_fixture
+        cache = SportmonksCache(os.path.join(directory, "cache"))
+        api_client = SportmonksAPIClient("offline", cache=cache)
+        url = f"{api_client.client.base_url}/fixtures/{fixture_id}"
+        cache.put(cache.make_key(url, {"include": FIXTURE_INCLUDES}), response)
+
+        ok &= check("Caché gzip", expected, StreamingStatsExtractor.extract_cached_fixture(api_client, fixture_id))
+        missing = StreamingStatsExtractor.extract_cached_fixture(api_client, fixture_id + 1)
+        print(f"{'✅' if missing is None else '❌'} Sin entrada en caché: None")
+        ok &= missing is None
+
+        # 2. Volcado comprimido en disco
+        dump_path = os.path.join(directory, f"fixture_{fixture_id}.json.gz")
+        with gzip.open(dump_path, "wt", encoding="utf-8") as f:
+            json.dump(response, f)
+        ok &= check("Volcado .json.gz", expected, StreamingStatsExtractor.extract_fixture_file(dump_path))
+
+        # 3. Respuesta en memoria, con un buffer pequeño (muchos bloques)
+        ok &= check("Bytes en memoria", expected, StreamingStatsExtractor.extract_fixture_stats(
+            json.dumps(response).encode("utf-8"), buf_size=64
+        ))
+
+    print(f"\n{'✅ TEST OK' if ok else '❌ TEST FALLIDO'}\n")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
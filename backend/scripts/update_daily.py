@@ -7,8 +7,13 @@ Aplica INERCIA a los precios, moviéndolos gradualmente hacia el precio objetivo
 establecido el fin de semana.
 
 Esto evita volatilidad extrema y crea un mercado más realista.
+
+Guarda además el histórico de precios del día y la foto del mercado
+(mayores subidas/bajadas por posición, precio medio por rareza y
+capitalización total) que sirve /api/market/snapshot.
 """
 
+import heapq
 import sys
 from pathlib import Path
 
@@ -16,19 +21,26 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from app.core.database import SessionLocal, test_connection
-from app.models.models import Player
+from app.core.query_stats import instrumented_job
 from app.services.economy import PriceInertiaSystem
+from app.services.market_snapshot import MarketSnapshotBuilder
+from app.services.job_runs import JobRunService, DAILY_PRICES_JOB
 from datetime import datetime
 
 
-def update_daily_prices():
+def update_daily_prices(dry_run: bool = False):
     """
     Actualización diaria de precios con inercia
+    
+    Args:
+        dry_run: Si es True muestra la tabla de movimientos sin escribir en la BD
     """
     
     print("📊 ACTUALIZACIÓN DIARIA DE PRECIOS")
     print("=" * 60)
     print(f"Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if dry_run:
+        print("🧪 MODO DRY-RUN: no se guardará ningún cambio")
     print("Aplicando inercia de precios...\n")
     
     # Verificar conexión
@@ -39,35 +51,33 @@ def update_daily_prices():
     db = SessionLocal()
     economy_system = PriceInertiaSystem(db)
     
+    # El dry-run no cuenta como actualización de precios (/health/ready)
+    job_runs = JobRunService(db)
+    run = None if dry_run else job_runs.start(DAILY_PRICES_JOB)
+    
     try:
-        # Obtener todos los jugadores activos (no leyendas)
-        active_players = (
-            db.query(Player)
-            .filter(Player.is_legend == False)
-            .all()
-        )
-        
-        print(f"🔧 Procesando {len(active_players)} jugadores...\n")
+        # Todos los jugadores activos (no leyendas) en una pasada por conjuntos;
+        # la foto del mercado (subidas/bajadas por posición, medias por rareza)
+        # se construye en esa misma pasada
+        snapshot = MarketSnapshotBuilder()
+        results = economy_system.apply_daily_inertia_all(dry_run=dry_run, snapshot=snapshot)
         
-        movements = []
+        print(f"🔧 Procesados {len(results)} jugadores\n")
         
-        for player in active_players:
-            result = economy_system.apply_daily_inertia(player.id)
-            
-            # Solo registrar movimientos significativos (> €1000)
-            if abs(result["movement"]) > 1000:
-                movements.append({
-                    "name": player.name,
-                    "position": player.position.value,
-                    "old": result["old_price"],
-                    "new": result["new_price"],
-                    "target": result["target_price"],
-                    "movement": result["movement"],
-                    "movement_pct": result["movement_percentage"]
-                })
-        
-        # Ordenar por mayor movimiento absoluto
-        movements.sort(key=lambda x: abs(x["movement"]), reverse=True)
+        # Solo registrar movimientos significativos (> €1000)
+        movements = [
+            {
+                "name": result["name"],
+                "position": result["position"],
+                "old": result["old_price"],
+                "new": result["new_price"],
+                "target": result["target_price"],
+                "movement": result["movement"],
+                "movement_pct": result["movement_percentage"]
+            }
+            for result in results
+            if abs(result["movement"]) > 1000
+        ]
         
         print("📊 RESUMEN DE MOVIMIENTOS SIGNIFICATIVOS:")
         print(f"   Total jugadores con cambios > €1000: {len(movements)}\n")
@@ -75,7 +85,8 @@ def update_daily_prices():
         if movements:
             print("🔝 TOP 10 MOVIMIENTOS MÁS GRANDES:\n")
             
-            for i, m in enumerate(movements[:10], 1):
+            # Top 10 por movimiento absoluto sin ordenar toda la lista
+            for i, m in enumerate(heapq.nlargest(10, movements, key=lambda x: abs(x["movement"])), 1):
                 direction = "↗️" if m["movement"] > 0 else "↘️"
                 print(f"{i:2d}. {direction} {m['name']} ({m['position']})")
                 print(f"     €{m['old']:,.0f} → €{m['new']:,.0f} ({m['movement_pct']:+.2f}%)")
@@ -85,6 +96,12 @@ def update_daily_prices():
             print("   ✅ No hay movimientos significativos hoy")
             print("   📍 Los precios están estables cerca de sus objetivos")
         
+        # Foto del mercado
+        market = snapshot.to_dict()
+        print(f"💼 Capitalización total: €{market['total_market_cap']:,.0f} ({market['players']} jugadores)")
+        for rarity, average in market["average_price_by_rarity"].items():
+            print(f"   Precio medio {rarity}: €{average:,.0f}")
+        
         # Estadísticas generales
         total_increases = sum(1 for m in movements if m["movement"] > 0)
         total_decreases = sum(1 for m in movements if m["movement"] < 0)
@@ -93,17 +110,28 @@ def update_daily_prices():
         print("📈 ESTADÍSTICAS:")
         print(f"   Subidas: {total_increases}")
         print(f"   Bajadas: {total_decreases}")
-        print(f"   Sin cambios significativos: {len(active_players) - len(movements)}")
+        print(f"   Sin cambios significativos: {len(results) - len(movements)}")
         
-        print("\n✅ ACTUALIZACIÓN DIARIA COMPLETADA")
+        if dry_run:
+            print("\n🧪 DRY-RUN COMPLETADO (sin cambios en la BD)")
+        else:
+            job_runs.finish(run, details={
+                "players": len(results),
+                "increases": total_increases,
+                "decreases": total_decreases
+            })
+            print("\n✅ ACTUALIZACIÓN DIARIA COMPLETADA")
         print("=" * 60)
         
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         db.rollback()
+        if run is not None:
+            job_runs.finish(run, error=e)
     finally:
         db.close()
 
 
 if __name__ == "__main__":
-    update_daily_prices()
+    with instrumented_job("update_daily"):
+        update_daily_prices(dry_run="--dry-run" in sys.argv)
@@ -4,8 +4,11 @@ Se ejecuta TRAS LOS PARTIDOS (Domingos por la noche)
 
 Función:
 1. Recoge estadísticas de los partidos del fin de semana desde Sportmonks
-2. Calcula los puntos Fantasy de cada jugador
-3. Establece los PRECIOS OBJETIVO basados en rendimiento
+2. Calcula los puntos Fantasy de toda la jornada por lotes
+3. Actualiza la forma reciente de los jugadores (player_form)
+4. Liquida la jornada: puntos de cada alineación y totales de equipos y usuarios
+5. Actualiza las clasificaciones (jornada y temporada)
+6. Establece los PRECIOS OBJETIVO basados en rendimiento
 """
 
 import sys
@@ -14,10 +17,17 @@ from pathlib import Path
 # Añadir el directorio raíz al path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from sqlalchemy import select
 from app.core.database import SessionLocal, test_connection
-from app.models.models import Player, PlayerMatchStats, Gameweek, Match, Position
-from app.services.calculator import calculator
+from app.core.cache import publish_players_changed
+from app.core.query_stats import instrumented_job
+from app.models.models import PlayerMatchStats, Gameweek, Match, Position
+from app.services.gameweek_scoring import GameweekScorer
+from app.services.player_form import PlayerFormService
+from app.services.gameweek_settlement import GameweekSettlementService
+from app.services.leaderboard import LeaderboardService
 from app.services.economy import PriceInertiaSystem
+from app.services.job_runs import JobRunService, WEEKEND_SCORING_JOB
 from datetime import datetime
 
 
@@ -37,6 +47,8 @@ def update_weekend_stats():
     
     db = SessionLocal()
     economy_system = PriceInertiaSystem(db)
+    job_runs = JobRunService(db)
+    run = job_runs.start(WEEKEND_SCORING_JOB)
     
     try:
         # 1. Obtener la jornada activa
@@ -44,6 +56,7 @@ def update_weekend_stats():
         
         if not active_gameweek:
             print("⚠️ No hay jornada activa")
+            job_runs.finish(run, details={"gameweek": None})
             return
         
         print(f"📅 Jornada {active_gameweek.number} - Procesando...\n")
@@ -57,70 +70,55 @@ def update_weekend_stats():
         
         print(f"⚽ {len(matches)} partidos encontrados\n")
         
-        # 3. Procesar estadísticas de cada partido
-        total_players_updated = 0
-        total_points_calculated = 0
-        
         for match in matches:
             print(f"  {match.home_team} {match.home_score} - {match.away_score} {match.away_team}")
-            
-            # Obtener estadísticas de jugadores en este partido
-            player_stats = (
-                db.query(PlayerMatchStats)
-                .filter(PlayerMatchStats.match_id == match.id)
-                .all()
-            )
-            
-            for stats in player_stats:
-                # Obtener el jugador para saber su posición
-                player = db.query(Player).filter(Player.id == stats.player_id).first()
-                
-                if not player:
-                    continue
-                
-                # Calcular puntos Fantasy
-                fantasy_points = calculator.calculate_total_points(stats, player.position)
-                
-                # Actualizar en la BD
-                stats.fantasy_points = fantasy_points
-                
-                total_points_calculated += fantasy_points
-                total_players_updated += 1
-                
-                print(f"    ✅ {player.name} ({player.position.value}): {fantasy_points:.1f} puntos")
         
-        db.commit()
+        # 3. Recalcular los puntos de toda la jornada (1 SELECT + UPDATEs masivos)
+        result = GameweekScorer(db).recompute_gameweek(active_gameweek.id)
+        
+        print(f"\n🏆 TOP {len(result['top'])} DE LA JORNADA:")
+        for name, position, points in result["top"]:
+            print(f"    ✅ {name} ({position}): {points:.1f} puntos")
         
         print(f"\n📊 RESUMEN:")
-        print(f"   - Jugadores procesados: {total_players_updated}")
-        print(f"   - Puntos totales generados: {total_points_calculated:.1f}")
+        result_rows = result["rows"]
+        print(f"   - Jugadores procesados: {result_rows}")
+        print(f"   - Puntos totales generados: {result['total_points']:.1f}")
+        
+        # 4. Incorporar la jornada a la forma reciente (ventana móvil)
+        form = PlayerFormService(db).commit_gameweek(active_gameweek.number)
+        print(f"   - Forma reciente actualizada ({form['mode']}): {form['players']} jugadores")
+        
+        # 5. Liquidar la jornada: puntos de todas las alineaciones (1 SELECT) y totales en bloque
+        settlement = GameweekSettlementService(db).settle(active_gameweek)
+        print(f"   - Jornada liquidada: {settlement['teams']} equipos "
+              f"({settlement['teams_changed']} con cambios, {settlement['total_points']} puntos)")
+        
+        # 6. Clasificaciones de la jornada y de la temporada
+        standings = LeaderboardService(db).commit_gameweek(active_gameweek, settlement["user_points"])
+        print(f"   - Clasificación de la jornada: {standings['gameweek']['users']} usuarios "
+              f"({standings['season']['updated'] + standings['season']['inserted']} cambios en la general)")
         
-        # 4. Establecer PRECIOS OBJETIVO basados en rendimiento
+        # 7. Establecer PRECIOS OBJETIVO basados en rendimiento
         print(f"\n💰 ACTUALIZANDO PRECIOS OBJETIVO...\n")
         
-        # Obtener todos los jugadores que participaron
-        active_players = (
-            db.query(Player)
-            .join(PlayerMatchStats)
-            .filter(PlayerMatchStats.match_id.in_([m.id for m in matches]))
+        # Jugadores que participaron: sus datos y su forma se leen en bloque
+        player_ids = db.scalars(
+            select(PlayerMatchStats.player_id)
+            .where(PlayerMatchStats.match_id.in_([m.id for m in matches]))
             .distinct()
-            .all()
-        )
-        
-        price_changes = []
-        
-        for player in active_players:
-            if player.is_legend:
-                continue  # Las leyendas no fluctúan
-            
-            result = economy_system.set_target_price(player.id)
-            
-            price_changes.append({
-                "name": player.name,
-                "old": result["old_target"],
-                "new": result["new_target"],
-                "change_pct": result["change_percentage"]
-            })
+        ).all()
+        
+        price_changes = [
+            {
+                "name": target["name"],
+                "old": target["old_target"],
+                "new": target["new_target"],
+                "change_pct": target["change_percentage"]
+            }
+            # Las leyendas no fluctúan (set_target_prices las excluye)
+            for target in economy_system.set_target_prices(player_ids)
+        ]
         
         # Mostrar top 10 subidas y bajadas
         price_changes.sort(key=lambda x: x["change_pct"], reverse=True)
@@ -133,11 +131,21 @@ def update_weekend_stats():
         for pc in price_changes[-5:]:
             print(f"   ↘️  {pc['name']}: €{pc['old']:,.0f} → €{pc['new']:,.0f} ({pc['change_pct']:+.1f}%)")
         
-        # 5. Marcar la jornada como finalizada
+        # 8. Marcar la jornada como finalizada
         active_gameweek.is_active = False
         active_gameweek.is_finished = True
         db.commit()
         
+        # Precios objetivo y forma nuevos: invalidar la caché de la API
+        publish_players_changed()
+        
+        job_runs.finish(run, details={
+            "gameweek": active_gameweek.number,
+            "players_scored": result_rows,
+            "teams_settled": settlement["teams"],
+            "target_prices": len(price_changes)
+        })
+        
         print(f"\n✅ Jornada {active_gameweek.number} marcada como finalizada")
         print("\n" + "=" * 60)
         print("🎉 ACTUALIZACIÓN COMPLETADA CON ÉXITO")
@@ -145,9 +153,11 @@ def update_weekend_stats():
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         db.rollback()
+        job_runs.finish(run, error=e)
     finally:
         db.close()
 
 
 if __name__ == "__main__":
-    update_weekend_stats()
+    with instrumented_job("update_weekend"):
+        update_weekend_stats()
@@ -3,23 +3,23 @@ DEBUG SIMPLIFICADO: Ver stats crudos de jugadores problemáticos
 """
 
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.sportmonks_client import SportmonksClient
+
 load_dotenv()
 
 API_TOKEN = os.getenv('SPORTMONKS_API_KEY')
 
+# Cliente compartido: los partidos terminados se sirven desde la caché en disco
+client = SportmonksClient(API_TOKEN)
+
 # Función para ver stats raw
 def ver_stats_raw(fixture_id, nombre):
-    url = f"https://api.sportmonks.com/v3/football/fixtures/{fixture_id}"
-    params = {
-        "api_token": API_TOKEN,
-        "include": "lineups.details.type"
-    }
-    
-    response = requests.get(url, params=params, timeout=30)
-    data = response.json().get('data', {})
+    data = client.get_fixture(fixture_id, include="lineups.details.type") or {}
     lineups = data.get('lineups', [])
     
     for player in lineups:
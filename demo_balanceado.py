@@ -333,20 +333,18 @@ def ejemplo_rapido():
         rating=7.5
     )
     
-    # Calcular con ambas configs
-    engine_orig = FantasyScoringEngine(ScoringConfig())
-    engine_bal = FantasyScoringEngine(BalancedScoringConfig())
+    # Calcular con ambas configs en una sola pasada (matriz configs x jugadores)
+    from simulador_configuraciones import ScoringSimulator, SimulationData
     
-    del_orig = engine_orig.calculate_points(delantero)
-    del_bal = engine_bal.calculate_points(delantero)
-    
-    mid_orig = engine_orig.calculate_points(mediocentro)
-    mid_bal = engine_bal.calculate_points(mediocentro)
+    simulator = ScoringSimulator({'original': ScoringConfig(), 'balanced': BalancedScoringConfig()})
+    (del_orig, mid_orig), (del_bal, mid_bal) = simulator.evaluate(
+        SimulationData.from_stats([delantero, mediocentro])
+    ).astype(int)
     
     print(f"{'JUGADOR':<20} | {'ORIGINAL':<10} | {'BALANCEADA':<10} | {'CAMBIO':<10}")
     print("-" * 65)
-    print(f"{delantero.player_name:<20} | {del_orig.fantasy_points:<10} | {del_bal.fantasy_points:<10} | {del_bal.fantasy_points - del_orig.fantasy_points:>+4} pts")
-    print(f"{mediocentro.player_name:<20} | {mid_orig.fantasy_points:<10} | {mid_bal.fantasy_points:<10} | {mid_bal.fantasy_points - mid_orig.fantasy_points:>+4} pts")
+    print(f"{delantero.player_name:<20} | {del_orig:<10} | {del_bal:<10} | {del_bal - del_orig:>+4} pts")
+    print(f"{mediocentro.player_name:<20} | {mid_orig:<10} | {mid_bal:<10} | {mid_bal - mid_orig:>+4} pts")
     
     print(f"\n✅ Con config balanceada: El goleador ahora es TOP")
 
@@ -356,5 +354,7 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == "--quick":
         ejemplo_rapido()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--temporada":
+        comparar_configuraciones_temporada([int(arg) for arg in sys.argv[2:]] or None)
     else:
         demo_completa()
@@ -222,6 +222,30 @@ def comparar_configuraciones_ejemplo():
     """)
 
 
+def comparar_configuraciones_temporada(gameweeks=None):
+    """
+    Compara las tres configs sobre todas las estadísticas guardadas en BD
+    (una sola evaluación vectorizada, sin llamadas a la API)
+    
+    Args:
+        gameweeks: Números de jornada a incluir (None = toda la temporada)
+    """
+    from simulador_configuraciones import ScoringSimulator, SimulationData, print_simulation_report
+    
+    print("\n" + "="*100)
+    print("COMPARACIÓN DE CONFIGURACIONES - TEMPORADA COMPLETA")
+    print("="*100)
+    
+    data = SimulationData.from_database(gameweeks)
+    simulator = ScoringSimulator({
+        "Original": ScoringConfig(),
+        "Balanceada": BalancedScoringConfig(),
+        "Ultra Ofensiva": OffensiveScoringConfig()
+    })
+    
+    print_simulation_report(simulator, simulator.evaluate(data), data)
+
+
 # ============================================
 # ANÁLISIS DETALLADO
 # ============================================
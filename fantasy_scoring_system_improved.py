@@ -5,15 +5,21 @@ Mejoras: Modularidad, validaciones, logging, configuración flexible, testing
 """
 
 import os
+import sys
 import requests
 from dotenv import load_dotenv
+from array import array
 from enum import Enum
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import math
 import logging
 from datetime import datetime
 
+# Desglose perezoso compartido con el sistema oficial (backend/scripts)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from scripts.sistema_puntos_oficial import LazyPointsBreakdown
+
 load_dotenv()
 
 # ============================================
@@ -111,9 +117,14 @@ class ScoringConfig:
     fouls_per_penalty: int = 3
 
 
-@dataclass
-class PlayerStats:
-    """Estadísticas de un jugador"""
+@dataclass(slots=True)
+class PlayerStats(LazyPointsBreakdown):
+    """
+    Estadísticas de un jugador
+    
+    Usa __slots__ (sin __dict__ por instancia) y el desglose de puntos se
+    construye solo cuando se lee points_breakdown
+    """
     
     # Identificación
     player_name: str = ""
@@ -170,7 +181,6 @@ class PlayerStats:
     
     # Resultados
     fantasy_points: int = 0
-    points_breakdown: Dict[str, float] = field(default_factory=dict)
     
     @property
     def total_losses(self) -> int:
@@ -178,6 +188,84 @@ class PlayerStats:
         return self.dispossessed + self.possession_lost + self.turnovers
 
 
+# Campos numéricos de PlayerStats y su typecode en PlayerStatsBatch
+BATCH_FIELDS = {
+    f.name: ('d' if f.name == 'rating' else 'b' if f.name == 'clean_sheet' else 'i')
+    for f in fields(PlayerStats)
+    if f.name not in ('player_name', 'position', 'participant_id') and f.init
+}
+
+
+class PlayerStatsBatch:
+    """
+    Lote de estadísticas en formato columnar (struct-of-arrays)
+    
+    Cada campo numérico es un array.array contiguo (4 bytes por entero, 8 por
+    la nota) en lugar de un objeto PlayerStats por jugador, así que simular
+    temporadas enteras no crea millones de objetos. Las columnas se pueden
+    envolver sin copia con memoryview o numpy.frombuffer.
+    
+    Uso:
+        batch = PlayerStatsBatch.from_stats(lista_de_player_stats)
+        goles = batch.column('goals')
+        jugador = batch[0]  # PlayerStats materializado bajo demanda
+    """
+    
+    __slots__ = ('player_names', 'positions', 'participant_ids', 'columns')
+    
+    def __init__(self):
+        self.player_names: List[str] = []
+        self.positions: List[Optional[Position]] = []
+        self.participant_ids = array('i')
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode in BATCH_FIELDS.items()
+        }
+    
+    @classmethod
+    def from_stats(cls, stats_list: Iterable[PlayerStats]) -> "PlayerStatsBatch":
+        """Construye un lote a partir de objetos PlayerStats"""
+        batch = cls()
+        for stats in stats_list:
+            batch.append(stats)
+        return batch
+    
+    def append(self, stats: PlayerStats):
+        """Añade un jugador al final del lote"""
+        self.player_names.append(stats.player_name)
+        self.positions.append(stats.position)
+        self.participant_ids.append(stats.participant_id)
+        for name, column in self.columns.items():
+            column.append(getattr(stats, name))
+    
+    def column(self, name: str) -> array:
+        """Columna de un campo (array.array con un valor por jugador)"""
+        return self.columns[name]
+    
+    def __len__(self) -> int:
+        return len(self.player_names)
+    
+    def __getitem__(self, index: int) -> PlayerStats:
+        """Materializa el jugador `index` como PlayerStats"""
+        stats = PlayerStats(
+            player_name=self.player_names[index],
+            position=self.positions[index],
+            participant_id=self.participant_ids[index],
+            **{name: column[index] for name, column in self.columns.items()}
+        )
+        stats.clean_sheet = bool(stats.clean_sheet)
+        return stats
+    
+    def __iter__(self) -> Iterator[PlayerStats]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por las columnas numéricas"""
+        arrays = [self.participant_ids, *self.columns.values()]
+        return sum(column.itemsize * len(column) for column in arrays)
+
+
 # ============================================
 # MAPEO API
 # ============================================
@@ -252,101 +340,78 @@ class FantasyScoringEngine:
     
     def __init__(self, config: Optional[ScoringConfig] = None):
         self.config = config or ScoringConfig()
+        
+        # Categorías en el orden del desglose: (nombre, método de cálculo)
+        self._categories = [
+            ('Participación', self._calculate_participation),
+            ('Goles', self._calculate_goals),
+            ('Asistencias', self._calculate_assists),
+            ('Portería a cero', self._calculate_clean_sheet),
+            ('Nota del partido', self._calculate_rating),
+            ('Tarjetas', self._calculate_cards),
+            ('Paradas', self._calculate_saves),
+            ('Goles recibidos', self._calculate_goals_conceded),
+            ('Bonus ataque', self._calculate_attack_bonus),
+            ('Bonus defensa', self._calculate_defense_bonus),
+            ('Pérdidas', self._calculate_losses),
+            ('Bonus extras', self._calculate_extra_bonus),
+            ('Penaltis', self._calculate_penalties),
+        ]
+        
         logger.info("Motor de puntuación inicializado")
     
-    def calculate_points(self, stats: PlayerStats) -> PlayerStats:
+    def calculate_points(self, stats: PlayerStats, with_breakdown: bool = False) -> PlayerStats:
         """
         Calcula los puntos fantasy de un jugador
-        Devuelve el objeto PlayerStats actualizado con puntos y desglose
+        Devuelve el objeto PlayerStats actualizado con los puntos; el desglose
+        se genera al leer stats.points_breakdown (o aquí mismo si with_breakdown=True)
         """
-        breakdown = {}
-        total_points = 0.0
-        
-        # 1. Participación
-        participation_points = self._calculate_participation(stats)
-        if participation_points:
-            breakdown['Participación'] = participation_points
-            total_points += participation_points
-        
-        # 2. Goles
-        goals_points = self._calculate_goals(stats)
-        if goals_points:
-            breakdown['Goles'] = goals_points
-            total_points += goals_points
-        
-        # 3. Asistencias
-        assists_points = self._calculate_assists(stats)
-        if assists_points:
-            breakdown['Asistencias'] = assists_points
-            total_points += assists_points
-        
-        # 4. Clean Sheet
-        clean_sheet_points = self._calculate_clean_sheet(stats)
-        if clean_sheet_points:
-            breakdown['Portería a cero'] = clean_sheet_points
-            total_points += clean_sheet_points
-        
-        # 5. Rating
-        rating_points = self._calculate_rating(stats)
-        if rating_points:
-            breakdown['Nota del partido'] = rating_points
-            total_points += rating_points
-        
-        # 6. Tarjetas
-        cards_points = self._calculate_cards(stats)
-        if cards_points:
-            breakdown['Tarjetas'] = cards_points
-            total_points += cards_points
-        
-        # 7. Paradas (solo GK)
-        saves_points = self._calculate_saves(stats)
-        if saves_points:
-            breakdown['Paradas'] = saves_points
-            total_points += saves_points
-        
-        # 8. Goles recibidos
-        conceded_points = self._calculate_goals_conceded(stats)
-        if conceded_points:
-            breakdown['Goles recibidos'] = conceded_points
-            total_points += conceded_points
-        
-        # 9. Bonus de ataque
-        attack_points = self._calculate_attack_bonus(stats)
-        if attack_points:
-            breakdown['Bonus ataque'] = attack_points
-            total_points += attack_points
+        # Actualizar stats (re-puntuar invalida el desglose anterior)
+        stats._breakdown = None
+        stats._engine = self
+        stats.fantasy_points = self._total_points(stats)
+        if with_breakdown:
+            stats._breakdown = self.get_breakdown(stats)
         
-        # 10. Bonus defensivos
-        defense_points = self._calculate_defense_bonus(stats)
-        if defense_points:
-            breakdown['Bonus defensa'] = defense_points
-            total_points += defense_points
+        logger.debug("%s: %s puntos", stats.player_name, stats.fantasy_points)
         
-        # 11. Pérdidas de balón
-        losses_points = self._calculate_losses(stats)
-        if losses_points:
-            breakdown['Pérdidas'] = losses_points
-            total_points += losses_points
-        
-        # 12. Bonus extras
-        extra_points = self._calculate_extra_bonus(stats)
-        if extra_points:
-            breakdown['Bonus extras'] = extra_points
-            total_points += extra_points
-        
-        # 13. Penaltis (si disponibles)
-        penalty_points = self._calculate_penalties(stats)
-        if penalty_points:
-            breakdown['Penaltis'] = penalty_points
-            total_points += penalty_points
+        return stats
+    
+    def calculate_batch(self, batch: PlayerStatsBatch) -> array:
+        """
+        Calcula los puntos fantasy de todo un lote (sin desglose)
         
-        # Actualizar stats
-        stats.fantasy_points = round(total_points)
-        stats.points_breakdown = breakdown
+        Reutiliza un único PlayerStats como vista de cada fila, sin crear un
+        objeto por jugador. Guarda el resultado en la columna fantasy_points
+        del lote y la devuelve.
+        """
+        row = PlayerStats()
+        columns = [(name, column) for name, column in batch.columns.items() if name != 'fantasy_points']
+        points = batch.columns['fantasy_points']
         
-        logger.debug(f"{stats.player_name}: {stats.fantasy_points} puntos")
+        for index in range(len(batch)):
+            row.position = batch.positions[index]
+            for name, column in columns:
+                setattr(row, name, column[index])
+            points[index] = self._total_points(row)
         
-        return stats
+        return points
+    
+    def _total_points(self, stats: PlayerStats) -> int:
+        """Suma de todas las categorías, redondeada"""
+        total_points = 0.0
+        for _, calculate in self._categories:
+            total_points += calculate(stats)
+        return round(total_points)
+    
+    def get_breakdown(self, stats: PlayerStats) -> Dict[str, float]:
+        """Desglose de puntos por categoría (solo las que suman o restan)"""
+        breakdown = {}
+        for category, calculate in self._categories:
+            points = calculate(stats)
+            if points:
+                breakdown[category] = points
+        return breakdown
     
     # ========================================
     # MÉTODOS DE CÁLCULO INDIVIDUAL
@@ -0,0 +1,380 @@
+"""
+SIMULADOR DE CONFIGURACIONES DE PUNTUACIÓN
+Evalúa K variantes de ScoringConfig sobre N registros de estadísticas en una
+sola pasada vectorizada (matriz K x N de puntos), sin llamadas a la API.
+
+Replica exactamente FantasyScoringEngine (fantasy_scoring_system_improved.py):
+cada regla se convierte en un vector de K parámetros y se aplica con NumPy a
+todas las filas a la vez.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from fantasy_scoring_system_improved import (
+    Position,
+    PlayerStats,
+    PlayerStatsBatch,
+    ScoringConfig,
+    BATCH_FIELDS
+)
+
+# Código de cada posición (sin posición = delantero, como hace el motor)
+POSITION_CODES = {
+    Position.GK: 0,
+    Position.DEF: 1,
+    Position.MID: 2,
+    Position.FWD: 3,
+}
+
+# Campos numéricos que usa el motor
+SIMULATION_FIELDS = tuple(name for name in BATCH_FIELDS if name != 'fantasy_points')
+
+
+# ============================================
+# DATOS DE LA SIMULACIÓN
+# ============================================
+
+@dataclass
+class SimulationData:
+    """
+    Estadísticas en formato columnar listas para simular
+
+    - columns: campo -> array (float64) con un valor por registro
+    - positions: código de posición de cada registro (POSITION_CODES)
+    - player_ids / player_names: identificación opcional (para agregar por jugador)
+    """
+
+    columns: Dict[str, np.ndarray]
+    positions: np.ndarray
+    player_ids: Optional[np.ndarray] = None
+    player_names: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @classmethod
+    def from_batch(cls, batch: PlayerStatsBatch) -> "SimulationData":
+        """Desde un PlayerStatsBatch (las columnas se leen directamente de sus buffers)"""
+        columns = {
+            name: np.frombuffer(batch.column(name), dtype=batch.column(name).typecode).astype(np.float64)
+            for name in SIMULATION_FIELDS
+        }
+        positions = np.array(
+            [POSITION_CODES.get(position, POSITION_CODES[Position.FWD]) for position in batch.positions],
+            dtype=np.intp
+        )
+        return cls(columns=columns, positions=positions, player_names=list(batch.player_names))
+
+    @classmethod
+    def from_stats(cls, stats_list: List[PlayerStats]) -> "SimulationData":
+        """Desde una lista de PlayerStats"""
+        return cls.from_batch(PlayerStatsBatch.from_stats(stats_list))
+
+    @classmethod
+    def from_database(cls, gameweeks: Optional[List[int]] = None) -> "SimulationData":
+        """
+        Carga las filas de player_match_stats guardadas (sin red)
+
+        Args:
+            gameweeks: Números de jornada a incluir; None = toda la temporada
+        """
+        sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+        from sqlalchemy import select
+        from app.core.database import SessionLocal
+        from app.models.models import Player, PlayerMatchStats, Match, Gameweek
+
+        query = (
+            select(
+                PlayerMatchStats.player_id,
+                Player.name,
+                Player.position,
+                *[getattr(PlayerMatchStats, name) for name in SIMULATION_FIELDS]
+            )
+            .join(Player, Player.id == PlayerMatchStats.player_id)
+            # Solo quien jugó: las filas de suplentes sin minutos no puntúan
+            .where(PlayerMatchStats.minutes_played > 0)
+        )
+        if gameweeks:
+            query = (
+                query.join(Match, Match.id == PlayerMatchStats.match_id)
+                .join(Gameweek, Gameweek.id == Match.gameweek_id)
+                .where(Gameweek.number.in_(gameweeks))
+            )
+
+        db = SessionLocal()
+        try:
+            rows = db.execute(query).all()
+        finally:
+            db.close()
+
+        columns = {
+            name: np.array([getattr(row, name) or 0 for row in rows], dtype=np.float64)
+            for name in SIMULATION_FIELDS
+        }
+        positions = np.array(
+            [POSITION_CODES[Position[row.position.name]] for row in rows], dtype=np.intp
+        )
+        return cls(
+            columns=columns,
+            positions=positions,
+            player_ids=np.array([row.player_id for row in rows], dtype=np.int64),
+            player_names=[row.name for row in rows]
+        )
+
+
+# ============================================
+# SIMULADOR
+# ============================================
+
+class ScoringSimulator:
+    """
+    Evalúa varias configuraciones de puntuación a la vez
+
+    Uso:
+        simulator = ScoringSimulator({
+            'original': ScoringConfig(),
+            'balanced': BalancedScoringConfig(),
+        })
+        points = simulator.evaluate(SimulationData.from_database())  # K x N
+        summary = simulator.position_summary(points, data)
+        correlation = simulator.rank_correlation(points)
+    """
+
+    def __init__(self, configs: Dict[str, ScoringConfig]):
+        self.names = list(configs)
+        self.configs = list(configs.values())
+
+    def _param(self, attribute: str) -> np.ndarray:
+        """Vector columna (K x 1) con el valor de un parámetro en cada config"""
+        return np.array(
+            [getattr(config, attribute) for config in self.configs], dtype=np.float64
+        )[:, np.newaxis]
+
+    def _by_position(self, positions: np.ndarray, gk: str, defense: str, mid: str, fwd: str) -> np.ndarray:
+        """Parámetro que depende de la posición (K x N)"""
+        table = np.hstack([self._param(gk), self._param(defense), self._param(mid), self._param(fwd)])
+        return table[:, positions]
+
+    def evaluate(self, data: SimulationData) -> np.ndarray:
+        """
+        Puntos fantasy de cada registro con cada configuración
+
+        Returns:
+            np.ndarray: Matriz K x N (mismo resultado que FantasyScoringEngine)
+        """
+        c = data.columns
+        positions = data.positions
+        is_gk = positions == POSITION_CODES[Position.GK]
+        minutes = c['minutes_played']
+
+        # Las categorías se suman en el mismo orden que el motor (mismo redondeo)
+        total = np.zeros((len(self.configs), len(data)))
+
+        # 1. Participación
+        full_game = self._param('minutes_full_game')
+        total += np.where(
+            minutes >= full_game, self._param('points_full_game'),
+            np.where(minutes > 0, self._param('points_partial_game'), 0.0)
+        )
+
+        # 2. Goles
+        total += c['goals'] * self._by_position(positions, 'goals_gk_def', 'goals_gk_def', 'goals_mid', 'goals_fwd')
+
+        # 3. Asistencias
+        total += c['assists'] * self._param('assist_goal') + c['chances_created'] * self._param('assist_chance')
+
+        # 4. Portería a cero
+        clean_sheet = self._by_position(positions, 'clean_sheet_gk', 'clean_sheet_def', 'clean_sheet_mid', 'clean_sheet_fwd')
+        total += np.where((c['clean_sheet'] != 0) & (minutes >= full_game), clean_sheet, 0.0)
+
+        # 5. Nota (escala lineal entre umbrales)
+        rating = c['rating']
+        rating_min = self._param('rating_min_threshold')
+        rating_max = self._param('rating_max_threshold')
+        rating_points = self._param('rating_max_points')
+        total += np.where(
+            rating >= rating_max, rating_points,
+            np.where(
+                (rating >= rating_min) & (rating != 0),
+                (rating - rating_min) * (rating_points / (rating_max - rating_min)),
+                0.0
+            )
+        )
+
+        # 6. Tarjetas
+        total += c['yellow_cards'] * self._param('yellow_card_penalty') + c['red_cards'] * self._param('red_card_penalty')
+
+        # 7. Paradas (solo GK)
+        total += np.where(is_gk, np.floor(c['saves'] / self._param('saves_per_point')), 0.0)
+
+        # 8. Goles recibidos
+        conceded = np.where(is_gk, c['goals_conceded'], c['goals_conceded_team'])
+        total += np.floor(conceded / self._param('goals_conceded_per_penalty')) * self._by_position(
+            positions,
+            'goals_conceded_penalty_gk_def', 'goals_conceded_penalty_gk_def',
+            'goals_conceded_penalty_mid_fwd', 'goals_conceded_penalty_mid_fwd'
+        )
+
+        # 9. Bonus de ataque
+        total += (
+            np.floor(c['shots_on_target'] / self._param('shots_on_target_per_point'))
+            + np.floor(c['dribbles'] / self._param('dribbles_per_point'))
+            + np.floor(c['crosses'] / self._param('crosses_per_point'))
+        )
+
+        # 10. Bonus defensivos
+        total += (
+            np.floor(c['ball_recoveries'] / self._param('ball_recoveries_per_point'))
+            + np.floor(c['clearances'] / self._param('clearances_per_point'))
+            + np.floor(c['tackles'] / self._param('tackles_per_point'))
+            + np.floor(c['interceptions'] / self._param('interceptions_per_point'))
+        )
+
+        # 11. Pérdidas de balón
+        losses = c['dispossessed'] + c['possession_lost'] + c['turnovers']
+        total += -np.floor(losses / self._by_position(
+            positions,
+            'losses_gk_def_threshold', 'losses_gk_def_threshold',
+            'losses_mid_threshold', 'losses_fwd_threshold'
+        ))
+
+        # 12. Bonus extras
+        total += (
+            np.floor(c['duels_won'] / self._param('duels_won_per_point'))
+            + np.floor(c['accurate_passes'] / self._param('accurate_passes_per_point'))
+            - np.floor(c['fouls'] / self._param('fouls_per_penalty'))
+        )
+
+        # 13. Penaltis (mismos valores fijos que el motor)
+        total += c['penalty_save'] * 5 - c['penalty_miss'] * 2
+
+        # round() de Python también redondea al par
+        return np.round(total)
+
+    def position_summary(self, points: np.ndarray, data: SimulationData) -> Dict[str, Dict[Position, Dict[str, float]]]:
+        """
+        Distribución de puntos por posición para cada configuración
+
+        Returns:
+            dict: {config: {Position: {registros, media, desviación, p10, mediana, p90, máximo, % del total}}}
+        """
+        summary = {}
+        for name, row in zip(self.names, points):
+            grand_total = row.sum() or 1.0
+            summary[name] = {}
+            for position, code in POSITION_CODES.items():
+                values = row[data.positions == code]
+                if not len(values):
+                    continue
+                p10, median, p90 = np.percentile(values, [10, 50, 90])
+                summary[name][position] = {
+                    'registros': int(len(values)),
+                    'media': _plain(values.mean()),
+                    'desviación': _plain(values.std()),
+                    'p10': _plain(p10),
+                    'mediana': _plain(median),
+                    'p90': _plain(p90),
+                    'máximo': _plain(values.max()),
+                    '% del total': _plain(100 * values.sum() / grand_total),
+                }
+        return summary
+
+    @staticmethod
+    def aggregate_by_player(points: np.ndarray, data: SimulationData):
+        """
+        Suma los puntos de cada jugador (toda la temporada)
+
+        Returns:
+            tuple: (player_ids únicos, matriz K x jugadores)
+        """
+        if data.player_ids is None:
+            raise ValueError("SimulationData sin player_ids")
+        player_ids, index = np.unique(data.player_ids, return_inverse=True)
+        totals = np.vstack([np.bincount(index, weights=row, minlength=len(player_ids)) for row in points])
+        return player_ids, totals
+
+    def rank_correlation(self, points: np.ndarray) -> np.ndarray:
+        """
+        Correlación de Spearman entre configuraciones (K x K)
+        Cuánto cambia el orden de los jugadores al cambiar de config
+        """
+        ranks = np.vstack([_average_ranks(row) for row in points])
+        return np.corrcoef(ranks)
+
+
+def _plain(value) -> float:
+    """float sin signo en el cero (-0.0 -> 0.0) para el informe"""
+    return float(value) + 0.0
+
+
+def _average_ranks(values: np.ndarray) -> np.ndarray:
+    """Rangos con empates promediados"""
+    order = np.argsort(values, kind='mergesort')
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(len(values))
+    _, index, counts = np.unique(values, return_inverse=True, return_counts=True)
+    return (np.bincount(index, weights=ranks) / counts)[index]
+
+
+# ============================================
+# PRESENTACIÓN
+# ============================================
+
+def print_simulation_report(simulator: ScoringSimulator, points: np.ndarray, data: SimulationData):
+    """Imprime resumen por posición y correlaciones entre configuraciones"""
+    summary = simulator.position_summary(points, data)
+
+    for name, positions in summary.items():
+        print(f"\n📊 {name.upper()}")
+        print(f"{'POSICIÓN':<12} | {'N':>6} | {'MEDIA':>6} | {'DESV':>6} | {'P10':>5} | "
+              f"{'MED':>5} | {'P90':>5} | {'MAX':>5} | {'% TOTAL':>7}")
+        print("-" * 85)
+        for position, s in positions.items():
+            print(f"{str(position):<12} | {s['registros']:>6} | {s['media']:>6.2f} | {s['desviación']:>6.2f} | "
+                  f"{s['p10']:>5.1f} | {s['mediana']:>5.1f} | {s['p90']:>5.1f} | {s['máximo']:>5.0f} | "
+                  f"{s['% del total']:>6.1f}%")
+
+    ranked = points
+    label = "registros"
+    if data.player_ids is not None:
+        _, ranked = simulator.aggregate_by_player(points, data)
+        label = "jugadores (total temporada)"
+
+    correlation = simulator.rank_correlation(ranked)
+    print(f"\n🔗 CORRELACIÓN DE RANGOS (Spearman, {label})")
+    print(" " * 12 + "".join(f"{name[:10]:>12}" for name in simulator.names))
+    for name, row in zip(simulator.names, correlation):
+        print(f"{name[:10]:<12}" + "".join(f"{value:>12.3f}" for value in row))
+
+
+# ============================================
+# EJECUCIÓN
+# ============================================
+
+if __name__ == "__main__":
+    from fantasy_scoring_balanced import BalancedScoringConfig, OffensiveScoringConfig
+
+    # Uso: python simulador_configuraciones.py [jornada ...]
+    gameweeks = [int(arg) for arg in sys.argv[1:]] or None
+
+    t0 = time.perf_counter()
+    data = SimulationData.from_database(gameweeks)
+    t1 = time.perf_counter()
+
+    simulator = ScoringSimulator({
+        'original': ScoringConfig(),
+        'balanced': BalancedScoringConfig(),
+        'offensive': OffensiveScoringConfig(),
+    })
+    points = simulator.evaluate(data)
+    t2 = time.perf_counter()
+
+    print(f"\n✅ {len(data)} registros cargados en {t1 - t0:.2f}s, "
+          f"{len(simulator.names)} configs evaluadas en {t2 - t1:.3f}s")
+    print_simulation_report(simulator, points, data)
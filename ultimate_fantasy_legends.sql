@@ -3371,8 +3371,8 @@ ALTER TABLE `players`
 --
 ALTER TABLE `player_match_stats`
   ADD PRIMARY KEY (`id`),
-  ADD KEY `player_id` (`player_id`),
-  ADD KEY `match_id` (`match_id`),
+  ADD KEY `ix_player_match_stats_match_minutes` (`match_id`,`minutes_played`,`player_id`,`rating`,`fantasy_points`),
+  ADD KEY `ix_player_match_stats_player_match` (`player_id`,`match_id`),
   ADD KEY `ix_player_match_stats_id` (`id`);
 
 --